@@ -0,0 +1,104 @@
+"""Chunked pre-analysis of decoded audio.
+
+`process_audio_file` walks the decoded PCM (usually a read-only memmap from
+the PCM cache) in fixed-size chunks. Each chunk is a NumPy view, so nothing
+is copied and only the pages being analysed are resident. Chunks are handed
+to a bounded thread pool (NumPy reductions release the GIL) and each returns:
+
+- min/max pairs at `PEAKS_BASE_SAMPLES` (the base level of the peaks mipmap),
+- its sum of squares and absolute peak, for RMS loudness,
+- one silence flag per `SILENCE_FRAME_SAMPLES` frame.
+
+Chunk sizes are multiples of both frame sizes, so concatenating per-chunk
+results gives exactly what a whole-file pass would. The aggregate goes to
+`AudioFile.meta["analysis"]`:
+
+    {"rms_dbfs": -23.1, "peak_dbfs": -1.2, "silence_ratio": 0.31,
+     "silences": [[12.4, 15.02], ...], "chunks": 61}
+"""
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from app.ai.peaks import PEAKS_BASE_SAMPLES, Peaks, base_level, peaks_from_base
+
+SILENCE_FRAME_SAMPLES = 320  # 20 ms at 16 kHz
+_CHUNK_ALIGN = PEAKS_BASE_SAMPLES * SILENCE_FRAME_SAMPLES // math.gcd(PEAKS_BASE_SAMPLES, SILENCE_FRAME_SAMPLES)
+
+
+class ChunkStats(NamedTuple):
+    peaks: np.ndarray  # (n, 2) float32 min/max at PEAKS_BASE_SAMPLES
+    sum_squares: float
+    peak: float
+    silent: np.ndarray  # bool per SILENCE_FRAME_SAMPLES frame
+
+
+class Analysis(NamedTuple):
+    peaks: Peaks
+    meta: Dict[str, Any]
+
+
+def _dbfs(value: float) -> Optional[float]:
+    return round(20 * math.log10(value), 1) if value > 0 else None
+
+
+def chunk_bounds(total: int, chunk_samples: int) -> List[Tuple[int, int]]:
+    chunk = max(_CHUNK_ALIGN, chunk_samples - chunk_samples % _CHUNK_ALIGN)
+    return [(i, min(i + chunk, total)) for i in range(0, total, chunk)]
+
+
+def analyse_chunk(chunk: np.ndarray, silence_threshold: float) -> ChunkStats:
+    chunk = np.asarray(chunk, dtype=np.float32)
+    n = len(chunk) // SILENCE_FRAME_SAMPLES
+    frames = chunk[: n * SILENCE_FRAME_SAMPLES].reshape(n, SILENCE_FRAME_SAMPLES)
+    frame_rms = np.sqrt(np.einsum("ij,ij->i", frames, frames) / SILENCE_FRAME_SAMPLES)
+    silent = frame_rms < silence_threshold
+    tail = chunk[n * SILENCE_FRAME_SAMPLES:]
+    if len(tail):
+        silent = np.append(silent, np.sqrt(np.mean(tail * tail)) < silence_threshold)
+    return ChunkStats(
+        peaks=base_level(chunk, PEAKS_BASE_SAMPLES),
+        sum_squares=float(np.dot(chunk, chunk)),
+        peak=float(np.abs(chunk).max()) if len(chunk) else 0.0,
+        silent=silent,
+    )
+
+
+def silent_spans(silent: np.ndarray, min_frames: int) -> List[Tuple[int, int]]:
+    """`[start, end)` frame ranges of at least `min_frames` consecutive silent frames."""
+    edges = np.diff(np.concatenate(([0], silent.astype(np.int8), [0])))
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    keep = ends - starts >= min_frames
+    return list(zip(starts[keep].tolist(), ends[keep].tolist()))
+
+
+def analyse_audio(audio: np.ndarray, sample_rate: int, chunk_seconds: float = 30.0, workers: int = 4,
+                  silence_dbfs: float = -50.0, min_silence_seconds: float = 1.0, peaks_bits: int = 8) -> Analysis:
+    silence_threshold = 10 ** (silence_dbfs / 20)
+    bounds = chunk_bounds(len(audio), int(chunk_seconds * sample_rate))
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        # map() yields in submission order, so results line up with `bounds`
+        results = list(pool.map(lambda b: analyse_chunk(audio[b[0]:b[1]], silence_threshold), bounds))
+
+    if results:
+        base = np.concatenate([r.peaks for r in results])
+        silent = np.concatenate([r.silent for r in results])
+    else:
+        base, silent = np.zeros((0, 2), dtype=np.float32), np.zeros(0, dtype=bool)
+    total = len(audio)
+    rms = math.sqrt(sum(r.sum_squares for r in results) / total) if total else 0.0
+    frame_seconds = SILENCE_FRAME_SAMPLES / sample_rate
+    min_frames = max(1, int(round(min_silence_seconds / frame_seconds)))
+    spans = [[round(s * frame_seconds, 2), round(min(e * frame_seconds, total / sample_rate), 2)]
+             for s, e in silent_spans(silent, min_frames)]
+
+    meta = {
+        "rms_dbfs": _dbfs(rms),
+        "peak_dbfs": _dbfs(max((r.peak for r in results), default=0.0)),
+        "silence_ratio": round(float(silent.mean()), 3) if len(silent) else 0.0,
+        "silences": spans,
+        "chunks": len(results),
+    }
+    return Analysis(peaks_from_base(base, sample_rate, total, bits=peaks_bits), meta)
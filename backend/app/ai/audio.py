@@ -0,0 +1,245 @@
+"""In-memory audio decoding and transcoding.
+
+ffmpeg reads the encoded audio from stdin and writes 16 kHz mono s16le PCM to
+stdout, which is turned straight into the float32 array WhisperX expects.
+No temp file is written and the container is probed from the bytes rather
+than trusted from a file suffix.
+
+`transcode_master` uses the same plumbing to produce the canonical 16 kHz
+mono master stored at ingest, and reports what ffmpeg saw in the original.
+"""
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+READ_SIZE = 1024 * 1024
+
+# Containers ffmpeg can demux from a non-seekable pipe. MP4/M4A/MOV are left
+# out: their index is often written at the end of the file.
+STREAMABLE_CONTENT_TYPES = {
+    "audio/webm", "video/webm", "audio/ogg", "audio/opus", "audio/wav", "audio/x-wav",
+    "audio/wave", "audio/mpeg", "audio/mp3", "audio/flac", "audio/x-flac",
+}
+
+
+def is_streamable(content_type) -> bool:
+    if not content_type:
+        return False
+    return content_type.split(";")[0].strip().lower() in STREAMABLE_CONTENT_TYPES
+
+
+def _ffmpeg_cmd(src: str, sr: int):
+    return [
+        "ffmpeg", "-hide_banner", "-loglevel", "error", "-threads", "0",
+        "-i", src,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(sr),
+        "pipe:1",
+    ]
+
+
+def _pcm_to_float(pcm: bytes) -> np.ndarray:
+    return np.frombuffer(pcm, np.int16).astype(np.float32) / 32768.0
+
+
+def _run_file(data: bytes, cmd: List[str]) -> subprocess.CompletedProcess:
+    # Containers with their index at the end (e.g. some mp4/m4a) can't be
+    # demuxed from a pipe; give ffmpeg a seekable file without a fake suffix.
+    with tempfile.NamedTemporaryFile(delete=False) as tmp:
+        tmp.write(data)
+        tmp_path = tmp.name
+    try:
+        return subprocess.run([tmp_path if arg == "pipe:0" else arg for arg in cmd], capture_output=True)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _decode_file(data: bytes, sr: int) -> np.ndarray:
+    proc = _run_file(data, _ffmpeg_cmd("pipe:0", sr))
+    if proc.returncode != 0:
+        raise RuntimeError(f"Failed to decode audio: {proc.stderr.decode(errors='ignore').strip()}")
+    return _pcm_to_float(proc.stdout)
+
+
+def _pump(source: BinaryIO, sink) -> None:
+    try:
+        while True:
+            chunk = source.read(READ_SIZE)
+            if not chunk:
+                break
+            sink.write(chunk)
+    except (BrokenPipeError, ValueError):
+        pass  # ffmpeg stopped reading; its exit status reports why
+    finally:
+        try:
+            sink.close()
+        except BrokenPipeError:
+            pass
+
+
+def decode_audio(source: Union[bytes, bytearray, memoryview, BinaryIO], sr: int = SAMPLE_RATE) -> np.ndarray:
+    """Decode encoded audio (bytes or a readable stream) to mono float32 at `sr`.
+
+    Streams (e.g. an S3 `StreamingBody`) are copied into ffmpeg's stdin chunk
+    by chunk, so the encoded file never has to be held in memory.
+    """
+    if shutil.which("ffmpeg") is None:
+        raise RuntimeError("ffmpeg is required for audio decoding but was not found on PATH")
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        proc = subprocess.run(_ffmpeg_cmd("pipe:0", sr), input=bytes(source), capture_output=True)
+        if proc.returncode == 0:
+            return _pcm_to_float(proc.stdout)
+        print(f"DEBUG: Pipe decode failed ({proc.stderr.decode(errors='ignore').strip()}), retrying from a seekable file")
+        return _decode_file(bytes(source), sr)
+
+    proc = _run_stream(source, _ffmpeg_cmd("pipe:0", sr))
+    if proc.returncode != 0:
+        raise RuntimeError(f"Failed to decode audio stream: {proc.stderr.decode(errors='ignore').strip()}")
+    return _pcm_to_float(proc.stdout)
+
+
+def _run_stream(source: BinaryIO, cmd: List[str]) -> subprocess.CompletedProcess:
+    """Run ffmpeg with `source` copied into its stdin chunk by chunk."""
+    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    writer = threading.Thread(target=_pump, args=(source, proc.stdin), daemon=True)
+    writer.start()
+    err_chunks = []
+    err_reader = threading.Thread(target=lambda: err_chunks.append(proc.stderr.read()), daemon=True)
+    err_reader.start()
+    out = proc.stdout.read()
+    proc.wait()
+    writer.join()
+    err_reader.join()
+    return subprocess.CompletedProcess(cmd, proc.returncode, out, b"".join(err_chunks))
+
+
+# --- Ingest master ---
+
+# format -> (ffmpeg muxer, content type, key suffix, encoder args)
+MASTER_FORMATS: Dict[str, Tuple[str, str, str, Callable[[str], List[str]]]] = {
+    "flac": ("flac", "audio/flac", ".flac", lambda bitrate: ["-sample_fmt", "s16", "-c:a", "flac", "-compression_level", "8"]),
+    "opus": ("ogg", "audio/ogg", ".opus", lambda bitrate: ["-c:a", "libopus", "-b:a", bitrate, "-application", "voip"]),
+}
+
+_DURATION_RE = re.compile(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)")
+_TIME_RE = re.compile(r"time=(\d+):(\d+):(\d+(?:\.\d+)?)")
+_AUDIO_STREAM_RE = re.compile(r"Stream #0:\d+[^:]*: Audio: (\w+)[^,\n]*, (\d+) Hz, ([^,\n]+)")
+
+
+def _hms(match) -> float:
+    h, m, s = match.groups()
+    return int(h) * 3600 + int(m) * 60 + float(s)
+
+
+def _channel_count(layout: str) -> Optional[int]:
+    layout = layout.strip()
+    if layout == "mono":
+        return 1
+    if layout == "stereo":
+        return 2
+    m = re.match(r"(\d+) channels", layout)
+    if m:
+        return int(m.group(1))
+    m = re.match(r"(\d+)\.(\d+)", layout)  # e.g. 5.1
+    return int(m.group(1)) + int(m.group(2)) if m else None
+
+
+def parse_ffmpeg_info(stderr: str) -> Dict[str, Any]:
+    """Input codec/sample rate/channels and output duration from an ffmpeg `-loglevel info` log."""
+    info: Dict[str, Any] = {}
+    log = stderr.replace("\r", "\n")
+    stream = _AUDIO_STREAM_RE.search(log)  # first match is the input stream
+    if stream:
+        info["codec"] = stream.group(1)
+        info["sample_rate"] = int(stream.group(2))
+        info["channels"] = _channel_count(stream.group(3))
+    times = _TIME_RE.findall(log)
+    if times:
+        h, m, s = times[-1]
+        info["duration_seconds"] = round(int(h) * 3600 + int(m) * 60 + float(s), 3)
+    else:
+        duration = _DURATION_RE.search(log)
+        if duration:
+            info["duration_seconds"] = round(_hms(duration), 3)
+    return info
+
+
+def transcode_master(source: Union[bytes, bytearray, memoryview, BinaryIO], fmt: str = "opus", bitrate: str = "32k",
+                     sr: int = SAMPLE_RATE) -> Tuple[bytes, Dict[str, Any]]:
+    """Transcode to a mono `sr` master in `fmt`; returns `(encoded, original_info)`."""
+    if shutil.which("ffmpeg") is None:
+        raise RuntimeError("ffmpeg is required for audio transcoding but was not found on PATH")
+    muxer, _, _, encoder_args = MASTER_FORMATS[fmt]
+    cmd = [
+        "ffmpeg", "-hide_banner", "-loglevel", "info", "-threads", "0",
+        "-i", "pipe:0",
+        "-vn", "-map_metadata", "-1", "-ac", "1", "-ar", str(sr),
+        *encoder_args(bitrate),
+        "-f", muxer, "pipe:1",
+    ]
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        proc = subprocess.run(cmd, input=bytes(source), capture_output=True)
+        if proc.returncode != 0:
+            print("DEBUG: Pipe transcode failed, retrying from a seekable file")
+            proc = _run_file(bytes(source), cmd)
+    else:
+        proc = _run_stream(source, cmd)
+    stderr = proc.stderr.decode(errors="ignore")
+    if proc.returncode != 0 or not proc.stdout:
+        raise RuntimeError(f"Failed to transcode audio: {stderr.strip()[-2000:]}")
+    return proc.stdout, parse_ffmpeg_info(stderr)
+
+
+class StreamDecoder:
+    """Incremental decoder for encoded audio arriving in pieces (e.g. MediaRecorder webm/opus).
+
+    Encoded bytes are written to a long-lived ffmpeg process as they arrive;
+    decoded PCM is collected by a reader thread and handed out with `read()`.
+    """
+
+    def __init__(self, sr: int = SAMPLE_RATE):
+        if shutil.which("ffmpeg") is None:
+            raise RuntimeError("ffmpeg is required for audio decoding but was not found on PATH")
+        self.proc = subprocess.Popen(_ffmpeg_cmd("pipe:0", sr), stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        self._pending = bytearray()
+        self._lock = threading.Lock()
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+
+    def _read_loop(self) -> None:
+        while True:
+            chunk = self.proc.stdout.read1(READ_SIZE) if hasattr(self.proc.stdout, "read1") else self.proc.stdout.read(4096)
+            if not chunk:
+                break
+            with self._lock:
+                self._pending.extend(chunk)
+
+    def write(self, data: bytes) -> None:
+        self.proc.stdin.write(data)
+        self.proc.stdin.flush()
+
+    def read(self) -> np.ndarray:
+        """Return whatever PCM has been decoded since the last call."""
+        with self._lock:
+            usable = len(self._pending) - len(self._pending) % 2
+            pcm = bytes(self._pending[:usable])
+            del self._pending[:usable]
+        return _pcm_to_float(pcm)
+
+    def close(self) -> np.ndarray:
+        """Flush the decoder and return the remaining PCM."""
+        try:
+            self.proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        self.proc.wait()
+        self._reader.join()
+        return self.read()
@@ -0,0 +1,66 @@
+"""Token-budgeted batches of statements for LLM layers.
+
+Putting every statement of a meeting into one prompt overflows the context
+window on long meetings. `pack_batches` packs statements, in order, into
+windows of at most `budget` tokens. Each window also carries the `overlap`
+statements before it as read-only context, so a statement at the edge of a
+window is still classified knowing what was said just before it. Windows
+are independent, so they can be sent concurrently.
+
+`indices` restricts packing to some of the statements (those a cheaper
+classifier was not sure about); context is still whatever was said just
+before each window.
+
+Token counts use `tiktoken` when it is installed and a 4-characters-per-token
+estimate otherwise; the budget leaves headroom for the instructions.
+"""
+from typing import Iterable, List, NamedTuple, Optional, Sequence
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _ENCODING = None
+
+# per-statement framing in the prompt ({"id": "s12", "text": "..."} plus a newline)
+_ITEM_OVERHEAD_TOKENS = 8
+
+
+def count_tokens(text: str) -> int:
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    return (len(text) + 3) // 4
+
+
+class Batch(NamedTuple):
+    items: List[int]  # indices of the statements to classify
+    context: List[int]  # indices of preceding statements included for context only
+
+
+def pack_batches(texts: Sequence[str], budget: int, overlap: int = 0,
+                 indices: Optional[Iterable[int]] = None) -> List[Batch]:
+    """Split `texts` (or just `indices` of them) into consecutive windows of at most `budget` tokens.
+
+    A single oversized text gets its own window.
+    """
+    order = list(range(len(texts))) if indices is None else sorted(indices)
+    costs = {}
+
+    def cost(i: int) -> int:
+        if i not in costs:
+            costs[i] = count_tokens(texts[i]) + _ITEM_OVERHEAD_TOKENS
+        return costs[i]
+
+    batches: List[Batch] = []
+    start = 0
+    while start < len(order):
+        first = order[start]
+        context = list(range(max(0, first - overlap), first))
+        used = sum(cost(i) for i in context)
+        end = start
+        while end < len(order) and (end == start or used + cost(order[end]) <= budget):
+            used += cost(order[end])
+            end += 1
+        batches.append(Batch(order[start:end], context))
+        start = end
+    return batches
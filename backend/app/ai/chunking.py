@@ -0,0 +1,238 @@
+"""Chunked ASR for long recordings.
+
+Long meetings are split on low-energy (non-speech) points into chunks of
+roughly `TRANSCRIBE_CHUNK_SECONDS`, each extended by a small overlap so words
+on the cut are heard in full by at least one chunk. On CPU, chunks are
+transcribed across a process pool and stitched back together:
+
+- timestamps are re-based from chunk-relative to absolute,
+- each chunk owns the interval between its cut and the next one; segments
+  are kept by the chunk whose interval contains their midpoint,
+- words repeated across the seam are dropped from the later segment.
+
+Chunks report partial segments as they finish. With `PROGRESSIVE_ASR` on,
+the same machinery also runs sequentially with shorter chunks on
+medium-length audio so partials appear sooner, at the cost of batching.
+
+Each pool process loads its own ASR model, so the pool is CPU-only: on a GPU
+that would put one copy of the weights per worker on the same device, and
+the single batched model is the faster path there. Celery's prefork children
+are daemonic and may not start processes, so there the single batched model
+runs as well; chunk parallelism needs a worker started with `--pool solo` or
+`--pool threads`.
+
+Alignment and diarization then run once over the full audio as usual.
+"""
+import atexit
+import logging
+import multiprocessing
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+FRAME_SECONDS = 0.03
+
+
+def frame_energy(audio: np.ndarray, sr: int = SAMPLE_RATE, frame_seconds: float = FRAME_SECONDS) -> np.ndarray:
+    """RMS energy per fixed-size frame (the trailing partial frame is dropped)."""
+    frame = max(1, int(sr * frame_seconds))
+    n = len(audio) // frame
+    if n == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = audio[: n * frame].reshape(n, frame)
+    return np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+
+
+def plan_chunks(audio: np.ndarray, chunk_seconds: float, overlap_seconds: float, sr: int = SAMPLE_RATE,
+                search_seconds: float = 30.0) -> List[Tuple[int, int, int]]:
+    """Pick cut points near every `chunk_seconds` at the quietest nearby frame.
+
+    Returns `(start, end, owned_end)` sample indices per chunk: the chunk is
+    decoded over `[start, end)` and owns segments whose midpoint falls in
+    `[start, owned_end)`.
+    """
+    total = len(audio)
+    if total <= int((chunk_seconds + overlap_seconds) * sr):
+        return [(0, total, total)]
+
+    energy = frame_energy(audio, sr)
+    frame = max(1, int(sr * FRAME_SECONDS))
+    # smooth over ~300ms so a single quiet frame inside a word doesn't win
+    width = max(1, int(0.3 / FRAME_SECONDS))
+    smoothed = np.convolve(energy, np.ones(width, dtype=np.float32) / width, mode="same")
+
+    cuts = [0]
+    target = chunk_seconds
+    while target * sr < total - overlap_seconds * sr:
+        lo = int(max(cuts[-1] / frame + 1, (target - search_seconds) / FRAME_SECONDS))
+        hi = int(min(len(smoothed), (target + search_seconds) / FRAME_SECONDS))
+        if hi <= lo:
+            break
+        cut = (lo + int(np.argmin(smoothed[lo:hi]))) * frame
+        cuts.append(cut)
+        target = cut / sr + chunk_seconds
+    cuts.append(total)
+
+    overlap = int(overlap_seconds * sr)
+    chunks = []
+    for start, owned_end in zip(cuts[:-1], cuts[1:]):
+        chunks.append((start, min(total, owned_end + overlap), owned_end))
+    return chunks
+
+
+_WORD_RE = re.compile(r"[\w']+")
+
+
+def _norm_words(text: str) -> List[str]:
+    return [w.lower() for w in _WORD_RE.findall(text)]
+
+
+def _drop_repeated_prefix(prev_text: str, text: str, max_words: int = 12) -> str:
+    """Remove the longest prefix of `text` that repeats the tail of `prev_text`."""
+    prev = _norm_words(prev_text)[-max_words:]
+    words = text.split()
+    norm = [" ".join(_norm_words(w)) for w in words]
+    for n in range(min(len(prev), len(words)), 0, -1):
+        if prev[-n:] == norm[:n]:
+            return " ".join(words[n:])
+    return text
+
+
+class SegmentStitcher:
+    """Incrementally stitches per-chunk ASR segments into absolute time.
+
+    Chunks must be added in order; `add` returns only the segments that chunk
+    contributed, so callers can publish partial results as they arrive.
+    """
+
+    def __init__(self):
+        self.segments: List[Dict[str, Any]] = []
+
+    def add(self, offset: float, owned_end: float, segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        added = []
+        for seg in segments:
+            start = float(seg["start"]) + offset
+            end = float(seg["end"]) + offset
+            mid = (start + end) / 2
+            if mid < offset or mid >= owned_end:
+                continue
+            text = seg.get("text", "")
+            if self.segments and start < self.segments[-1]["end"]:
+                text = _drop_repeated_prefix(self.segments[-1]["text"], text)
+                start = self.segments[-1]["end"]
+                if not text.strip() or end <= start:
+                    continue
+            merged = {**seg, "start": start, "end": end, "text": text}
+            self.segments.append(merged)
+            added.append(merged)
+        return added
+
+
+def merge_chunk_segments(chunk_results: List[Tuple[float, float, List[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+    """Stitch per-chunk ASR segments into one absolute-time segment list.
+
+    `chunk_results` holds `(offset_seconds, owned_end_seconds, segments)` per
+    chunk in order, with segment times relative to the chunk start.
+    """
+    stitcher = SegmentStitcher()
+    for offset, owned_end, segments in chunk_results:
+        stitcher.add(offset, owned_end, segments)
+    return stitcher.segments
+
+
+# --- Process pool ---
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+
+
+def _can_spawn() -> bool:
+    # daemonic processes (Celery prefork children) may not have children of their own
+    return not multiprocessing.current_process().daemon
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """Resident pool so each child loads the ASR model once, not per job; rebuilt when `workers` changes."""
+    global _pool, _pool_workers
+    if _pool is not None and _pool_workers != workers:
+        _shutdown_pool()
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        _pool_workers = workers
+    return _pool
+
+
+@atexit.register
+def _shutdown_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _transcribe_chunk(audio: np.ndarray, model_name: str, device: str, compute_type: str, batch_size: int,
+                      language: Optional[str] = None) -> Dict[str, Any]:
+    from app.ai.registry import registry
+    model = registry.asr_model(model_name, device, compute_type)
+    return model.transcribe(audio, batch_size=batch_size, language=language)
+
+
+def transcribe_chunked(audio: np.ndarray, model_name: str, device: str, compute_type: str, batch_size: int,
+                       chunk_seconds: Optional[float] = None, workers: Optional[int] = None,
+                       on_segments: Optional[Callable[[List[Dict[str, Any]], float], None]] = None,
+                       language: Optional[str] = None) -> Dict[str, Any]:
+    """Transcribe long audio chunk by chunk; returns `{"segments", "language"}` like WhisperX.
+
+    A known `language` is passed to every chunk so none of them re-detects it.
+
+    With `workers > 1` on CPU chunks run on the process pool; elsewhere they run one
+    after another on the process's own model. `on_segments(new, progress)`
+    is called in chunk order as soon as each chunk's stitched segments are
+    known, with `progress` the fraction of the audio covered so far.
+    """
+    chunk_seconds = chunk_seconds or settings.TRANSCRIBE_CHUNK_SECONDS
+    workers = settings.TRANSCRIBE_CHUNK_WORKERS if workers is None else workers
+    if workers > 1 and (device != "cpu" or not _can_spawn()):
+        workers = 1
+    chunks = plan_chunks(audio, chunk_seconds, settings.TRANSCRIBE_CHUNK_OVERLAP_SECONDS,
+                         search_seconds=min(30.0, chunk_seconds / 4))
+    logger.debug("Chunked transcription: %d chunks across %d workers", len(chunks), max(workers, 1))
+
+    args = [(audio[start:end], model_name, device, compute_type, batch_size, language) for start, end, _ in chunks]
+    results: Iterable[Dict[str, Any]]
+    if workers > 1:
+        try:
+            results = _get_pool(workers).map(_transcribe_chunk, *zip(*args))
+        except (AssertionError, OSError) as e:
+            logger.warning("Chunk pool unavailable (%s); transcribing chunks sequentially", e)
+            _shutdown_pool()  # do not keep a broken pool around for the next job
+            results = (_transcribe_chunk(*a) for a in args)
+    else:
+        results = (_transcribe_chunk(*a) for a in args)
+
+    stitcher = SegmentStitcher()
+    languages: Counter = Counter()
+    for (start, _, owned_end), r in zip(chunks, results):
+        added = stitcher.add(start / SAMPLE_RATE, owned_end / SAMPLE_RATE, r["segments"])
+        languages[r["language"]] += 1
+        if on_segments:
+            on_segments(added, owned_end / len(audio))
+
+    return {"segments": stitcher.segments, "language": languages.most_common(1)[0][0]}
+
+
+def should_chunk(audio: np.ndarray, device: str) -> bool:
+    return (
+        device == "cpu"
+        and settings.TRANSCRIBE_CHUNK_WORKERS > 1
+        and _can_spawn()
+        and len(audio) / SAMPLE_RATE >= settings.TRANSCRIBE_CHUNKED_MIN_SECONDS
+    )
@@ -0,0 +1,99 @@
+"""Content-hash dedupe for re-uploaded audio.
+
+Every `AudioFile` records the SHA-256 of its bytes. Before transcribing, the
+workers look for an existing `Transcript` of identical audio and clone it
+(plus, when `DEDUPE_CLONE_DOWNSTREAM` is on, its latest summary and
+extraction) instead of spending GPU/CPU minutes on the same recording again.
+
+Reuse never crosses tenants: a transcript carries voiceprint-resolved speaker
+identities and its summary/extraction were built from its meeting's roster,
+so only transcripts of audio in the same organization qualify (or, for audio
+outside any organization, the same meeting).
+
+The queries are plain `select()` statements so they work with both the sync
+session used by Celery tasks and the async session used by `ai.pipeline`.
+"""
+import hashlib
+from typing import Optional, Union
+
+from sqlalchemy import false, select
+from sqlalchemy.orm import undefer
+
+from app.models.models import AudioFile, Extraction, Meeting, MeetingSummary, Transcript
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def sha256_bytes(data: Union[bytes, bytearray, memoryview]) -> str:
+    digest = hashlib.sha256()
+    view = memoryview(data)
+    for i in range(0, len(view), HASH_CHUNK_SIZE):
+        digest.update(view[i:i + HASH_CHUNK_SIZE])
+    return digest.hexdigest()
+
+
+def reusable_transcript_query(content_sha256: str, organization_id: Optional[int], meeting_id: Optional[int],
+                              exclude_audio_id: Optional[int] = None):
+    """Newest completed transcript of audio with the same content hash in the same organization.
+
+    Without an organization only audio of the same meeting qualifies; with neither, nothing does.
+    """
+    q = (
+        select(Transcript)
+        .options(undefer(Transcript.word_timings))
+        .join(AudioFile, Transcript.audio_file_id == AudioFile.id)
+        .filter(AudioFile.content_sha256 == content_sha256, Transcript.status == "completed")
+    )
+    if organization_id is not None:
+        q = q.join(Meeting, AudioFile.meeting_id == Meeting.id).filter(Meeting.organization_id == organization_id)
+    elif meeting_id is not None:
+        q = q.filter(AudioFile.meeting_id == meeting_id)
+    else:
+        q = q.filter(false())
+    if exclude_audio_id is not None:
+        q = q.filter(AudioFile.id != exclude_audio_id)
+    return q.order_by(Transcript.id.desc()).limit(1)
+
+
+def latest_summary_query(transcript_id: int):
+    return select(MeetingSummary).filter_by(transcript_id=transcript_id).order_by(MeetingSummary.id.desc()).limit(1)
+
+
+def latest_extraction_query(transcript_id: int):
+    return select(Extraction).filter_by(transcript_id=transcript_id).order_by(Extraction.id.desc()).limit(1)
+
+
+def clone_transcript(src: Transcript, audio_file_id: int, meeting_id: Optional[int]) -> Transcript:
+    return Transcript(
+        audio_file_id=audio_file_id,
+        meeting_id=meeting_id,
+        segments=src.segments,
+        encrypted=src.encrypted,
+        detected_language=src.detected_language,
+        model_tier=src.model_tier,
+        word_timings=src.word_timings,
+    )
+
+
+def clone_summary(src: MeetingSummary, transcript: Transcript) -> MeetingSummary:
+    return MeetingSummary(
+        transcript_id=transcript.id,
+        meeting_id=transcript.meeting_id,
+        executive_summary=src.executive_summary,
+        key_points=src.key_points,
+        decisions=src.decisions,
+        risks=src.risks,
+        encrypted=src.encrypted,
+        length=src.length,
+        tone=src.tone,
+    )
+
+
+def clone_extraction(src: Extraction, transcript: Transcript) -> Extraction:
+    return Extraction(
+        transcript_id=transcript.id,
+        meeting_id=transcript.meeting_id,
+        items=src.items,
+        encrypted=src.encrypted,
+        confidence=src.confidence,
+    )
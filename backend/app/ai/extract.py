@@ -1,20 +1,28 @@
 import json
-import re
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, NamedTuple, Optional
 from pydantic import BaseModel, Field
 from app.core.config import settings
+from app.ai import batching, intent_model, llm, owners, textnorm
+
+# Bump whenever a layer's output changes, so facts persisted by an older extractor are recomputed.
+EXTRACTOR_VERSION = "4"
 
 # --- Data Models ---
 
-class NormalizedStatement(BaseModel):
+# Intermediate layer records are NamedTuples rather than pydantic models: a transcript has one of
+# each per segment and this module builds them itself.
+
+class NormalizedStatement(NamedTuple):
     original_segment_id: str
     normalized_text: str
     confidence: float
+    speaker: Optional[str] = None  # diarized speaker label
 
-class IntentClassification(BaseModel):
+class IntentClassification(NamedTuple):
     segment_id: str
     intent: str  # INFORMATION, QUESTION, PROPOSAL, DECISION, ACTION_ASSIGNMENT, RISK, MITIGATION, CLARIFICATION, OFF_TOPIC
     confidence: float
+    source: str = "llm"  # llm | model (local intent model) | keyword
 
 class ActionItem(BaseModel):
     owner: str
@@ -42,90 +50,129 @@ class ExtractionResult(BaseModel):
 
 # --- Helper Functions (LLM-based layers) ---
 
-def _call_llm(prompt: str, system_prompt: str = "You are a helpful meeting assistant.") -> str:
+def _call_llm(prompt: str, system_prompt: str = llm.DEFAULT_SYSTEM_PROMPT) -> str:
     """
-    Helper to call OpenAI (or other LLM) for reasoning layers.
+    Helper to call OpenAI (or other LLM) for reasoning layers, through the pooled process-wide client.
     """
-    if not settings.OPENAI_API_KEY:
+    client = llm.get_client()
+    if client is None:
         print("WARNING: OPENAI_API_KEY is missing. Using mock LLM response.")
         return "{}" # Fallback for mocks if needed
     
     try:
-        from openai import OpenAI
-        client = OpenAI(api_key=settings.OPENAI_API_KEY)
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": prompt}
-            ],
-            response_format={"type": "json_object"}
-        )
-        return response.choices[0].message.content
+        return client.complete(prompt, system_prompt)
     except Exception as e:
         print(f"ERROR: LLM call failed: {str(e)}")
         return "{}"
 
+
+def _call_llm_many(prompts: List[str], system_prompt: str = llm.DEFAULT_SYSTEM_PROMPT) -> List[str]:
+    """
+    `_call_llm` for many prompts, run concurrently (bounded by LLM_MAX_CONCURRENCY).
+    """
+    client = llm.get_client()
+    if client is None:
+        print("WARNING: OPENAI_API_KEY is missing. Using mock LLM response.")
+        return ["{}"] * len(prompts)
+    return client.complete_many(prompts, system_prompt, default="{}")
+
 # --- Layer 2: Statement Normalization ---
 
 def normalize_statements(segments: List[Dict[str, Any]]) -> List[NormalizedStatement]:
     """
     Normalize speech into atomic statements (remove fillers, reduce ambiguity).
     """
-    normalized = []
-    for seg in segments:
-        text = seg.get("original_text", seg.get("text", ""))
-        # Simple cleanup as a baseline, but ideally uses LLM
-        clean_text = text.replace("um,", "").replace("uh,", "").replace("like,", "").strip()
-        normalized.append(NormalizedStatement(
-            original_segment_id=str(seg.get("start_time", 0)), # Using start_time as ID if missing
-            normalized_text=clean_text,
-            confidence=1.0
-        ))
-    return normalized
+    # Simple cleanup as a baseline, but ideally uses LLM; one pass over all segments
+    texts = textnorm.normalize_texts([seg.get("original_text", seg.get("text", "")) for seg in segments])
+    return [
+        NormalizedStatement(str(seg.get("start_time", 0)), text, 1.0, seg.get("speaker_id"))  # Using start_time as ID if missing
+        for seg, text in zip(segments, texts)
+    ]
 
 # --- Layer 3: Intent Classification ---
 
+INTENTS = ("INFORMATION", "QUESTION", "PROPOSAL", "DECISION", "ACTION_ASSIGNMENT", "RISK", "MITIGATION", "CLARIFICATION", "OFF_TOPIC")
+
+INTENT_SYSTEM_PROMPT = "You are a meeting analyst. Classify intents strictly. If unsure, mark as OFF_TOPIC."
+
+
+def _intent_prompt(statements: List[NormalizedStatement], batch: batching.Batch) -> str:
+    def lines(indices):
+        return "\n".join(json.dumps({"id": f"s{i}", "text": statements[i].normalized_text}) for i in indices)
+
+    context = f"Earlier statements, for context only (do not classify):\n{lines(batch.context)}\n\n" if batch.context else ""
+    return (
+        f"Classify each meeting statement into exactly one of these intents:\n{', '.join(INTENTS)}.\n\n"
+        f"{context}"
+        f"Statements to classify (one JSON object per line):\n{lines(batch.items)}\n\n"
+        "Return a JSON object with key 'classifications' containing a list of objects with 'id' and 'intent', "
+        "one per statement to classify."
+    )
+
+
+def _parse_intents(response: str) -> Dict[str, str]:
+    try:
+        items = json.loads(response).get("classifications", [])
+        return {str(c["id"]): str(c["intent"]).upper() for c in items if isinstance(c, dict) and "id" in c and "intent" in c}
+    except (ValueError, AttributeError, TypeError):
+        return {}
+
+
 def classify_intents(statements: List[NormalizedStatement]) -> List[IntentClassification]:
     """
     Classify each statement into a strict intent.
+
+    With a local intent model (`INTENT_MODEL_PATH`), all statements are first
+    labelled by it in one pass and only those below
+    `INTENT_MODEL_MIN_CONFIDENCE` are sent to the LLM. Statements are packed into token-budgeted windows (`INTENT_BATCH_TOKENS`,
+    with `INTENT_BATCH_OVERLAP` preceding statements as context) that are
+    classified concurrently and reassembled by statement id. Without an LLM,
+    or for statements a response leaves out, the model's label or else keyword
+    rules apply.
     """
-    # This requires LLM for accuracy as per requirements
-    prompt = f"""
-    Classify the following meeting statements into exactly one of these intents:
-    INFORMATION, QUESTION, PROPOSAL, DECISION, ACTION_ASSIGNMENT, RISK, MITIGATION, CLARIFICATION, OFF_TOPIC.
-    
-    Statements:
-    {[s.normalized_text for s in statements]}
-    
-    Return a JSON object with key 'classifications' containing a list of objects with 'text' and 'intent'.
-    """
-    system_prompt = "You are a meeting analyst. Classify intents strictly. If unsure, mark as OFF_TOPIC."
-    
-    # Mocking for now to avoid blocking if no key, but in production this uses _call_llm
-    classifications = []
-    for s in statements:
-        intent = "INFORMATION"
-        lower_text = s.normalized_text.lower()
-        if "will" in lower_text or "should" in lower_text:
-            intent = "ACTION_ASSIGNMENT"
-        if "decide" in lower_text or "agreed" in lower_text:
-            intent = "DECISION"
-        if "risk" in lower_text or "problem" in lower_text:
-            intent = "RISK"
-        
-        classifications.append(IntentClassification(
-            segment_id=s.original_segment_id,
-            intent=intent,
-            confidence=0.8
-        ))
-    return classifications
+    texts = [s.normalized_text for s in statements]
+    labels: Dict[int, str] = {}
+    guesses: Dict[int, tuple] = {}  # index -> (intent, probability) from the local model
+    model = intent_model.get_model()
+    if texts and model is not None:
+        predicted, probs = model.predict(texts)
+        guesses = {i: (intent, float(p)) for i, (intent, p) in enumerate(zip(predicted, probs)) if intent in INTENTS}
+
+    uncertain = [i for i in range(len(texts)) if i not in guesses or guesses[i][1] < settings.INTENT_MODEL_MIN_CONFIDENCE]
+    if uncertain and llm.get_client() is not None:
+        batches = batching.pack_batches(texts, settings.INTENT_BATCH_TOKENS, overlap=settings.INTENT_BATCH_OVERLAP,
+                                        indices=uncertain)
+        responses = _call_llm_many([_intent_prompt(statements, b) for b in batches], INTENT_SYSTEM_PROMPT)
+        for batch, response in zip(batches, responses):
+            parsed = _parse_intents(response)
+            for i in batch.items:
+                if parsed.get(f"s{i}") in INTENTS:
+                    labels[i] = parsed[f"s{i}"]
+
+    chosen: List[Optional[tuple]] = [None] * len(texts)  # (intent, confidence, source)
+    for i, (intent, p) in guesses.items():
+        chosen[i] = (intent, round(p, 4), "model")
+    for i, intent in labels.items():
+        chosen[i] = (intent, 0.9, "llm")
+    unlabelled = [i for i, c in enumerate(chosen) if c is None]
+    for i, intent in zip(unlabelled, textnorm.keyword_intents([texts[i] for i in unlabelled])):
+        chosen[i] = (intent, 0.8, "keyword")
+    return [IntentClassification(s.original_segment_id, *c) for s, c in zip(statements, chosen)]
 
 # --- Layer 4 & 5: Evidence-Based Extraction & Validation ---
 
-def extract_from_segments(segments: List[Dict[str, Any]]) -> Dict[str, Any]:
+def extract_from_segments(segments: List[Dict[str, Any]], roster: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
     """
     Main entry point for the 5-Layer Accuracy Architecture.
+    `roster` lists the meeting's people (`display_name`, `email`) that action items can be assigned to.
+    """
+    return extract_facts(segments, roster)["result"]
+
+
+def extract_facts(segments: List[Dict[str, Any]], roster: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """
+    All layer outputs (normalized statements, intents and the validated result) as JSON-ready dicts,
+    for persisting in `ExtractionFacts`.
     """
     # Layer 2: Normalization
     normalized = normalize_statements(segments)
@@ -133,6 +180,16 @@ def extract_from_segments(segments: List[Dict[str, Any]]) -> Dict[str, Any]:
     # Layer 3: Intent Classification
     intents = classify_intents(normalized)
     
+    return {
+        "version": EXTRACTOR_VERSION,
+        "statements": [s._asdict() for s in normalized],
+        "intents": [ic._asdict() for ic in intents],
+        "result": _extract_items(normalized, intents, owners.build_index(roster or [], segments)),
+    }
+
+
+def _extract_items(normalized: List[NormalizedStatement], intents: List[IntentClassification],
+                   owner_index: owners.OwnerIndex) -> Dict[str, Any]:
     # Layer 4: Extraction based on Intents
     actions = []
     decisions = []
@@ -144,9 +201,8 @@ def extract_from_segments(segments: List[Dict[str, Any]]) -> Dict[str, Any]:
         intent = intent_map.get(s.original_segment_id)
         
         if intent == "ACTION_ASSIGNMENT":
-            # Heuristic owner/task extraction or LLM
-            m = re.search(r"([A-Z][a-z]+)\s+will", s.normalized_text)
-            owner = m.group(1) if m else "Unknown"
+            # Owner from the meeting roster and speakers (app.ai.owners), else Unknown
+            owner = owner_index.resolve(s.normalized_text, s.speaker) or "Unknown"
             actions.append(ActionItem(
                 owner=owner,
                 task=s.normalized_text,
@@ -0,0 +1,106 @@
+"""Extraction facts shared by the summary and extraction tasks.
+
+`process_summarization` and `process_extraction` are enqueued together and
+both need the same layer 2-5 output of `ai.extract`, the expensive part being
+LLM intent classification. The first task to get here claims an
+`ExtractionFacts` row for (transcript, `EXTRACTOR_VERSION`), computes the
+facts and stores them; the other finds the claim, raises `FactsPending` and
+retries until the facts are there.
+
+A row is only reused while its `segments_sha256` matches the transcript's
+segments and meeting roster, so a refined transcript gets fresh facts. A
+claim older than `CLAIM_SECONDS` (its worker died) is taken over.
+"""
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.exc import IntegrityError
+
+from app.ai import extract
+from app.core import crypto
+from app.models.models import ExtractionFacts
+
+CLAIM_SECONDS = 600
+
+
+class FactsPending(Exception):
+    """Another worker is computing the facts for this transcript."""
+
+
+def segments_digest(segments: List[Dict[str, Any]], roster: Optional[List[Dict[str, Any]]] = None) -> str:
+    """Hash of the extractor's inputs; the roster only counts when there is one."""
+    inputs = [segments, roster] if roster else segments
+    payload = json.dumps(inputs, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _claim_is_live(row: ExtractionFacts, now: datetime) -> bool:
+    claimed_at = row.claimed_at
+    if claimed_at is None:
+        return False
+    if claimed_at.tzinfo is None:
+        claimed_at = claimed_at.replace(tzinfo=timezone.utc)
+    return now - claimed_at < timedelta(seconds=CLAIM_SECONDS)
+
+
+def _claim(db, transcript_id: int, digest: str, now: datetime) -> ExtractionFacts:
+    row = db.query(ExtractionFacts).filter_by(transcript_id=transcript_id,
+                                              extractor_version=extract.EXTRACTOR_VERSION).first()
+    if row is None:
+        row = ExtractionFacts(transcript_id=transcript_id, extractor_version=extract.EXTRACTOR_VERSION,
+                              segments_sha256=digest, claimed_at=now)
+        db.add(row)
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise FactsPending(f"Facts for transcript {transcript_id} are being computed")
+        return row
+
+    if row.segments_sha256 == digest and row.facts is None and _claim_is_live(row, now):
+        raise FactsPending(f"Facts for transcript {transcript_id} are being computed")
+    # stale or abandoned: take it over, unless another worker just did
+    unchanged = (ExtractionFacts.claimed_at.is_(None) if row.claimed_at is None
+                 else ExtractionFacts.claimed_at == row.claimed_at)
+    taken = (
+        db.query(ExtractionFacts)
+        .filter(ExtractionFacts.id == row.id, unchanged)
+        .update({"segments_sha256": digest, "facts": None, "claimed_at": now}, synchronize_session=False)
+    )
+    db.commit()
+    if not taken:
+        raise FactsPending(f"Facts for transcript {transcript_id} are being computed")
+    db.refresh(row)
+    return row
+
+
+def load_or_compute(db, transcript_id: int, segments: List[Dict[str, Any]],
+                    roster: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """Stored facts for the transcript's current segments (and meeting roster), computing (and storing) them if needed.
+
+    Raises `FactsPending` while another worker holds the claim.
+    """
+    digest = segments_digest(segments, roster)
+    row = db.query(ExtractionFacts).filter_by(transcript_id=transcript_id,
+                                              extractor_version=extract.EXTRACTOR_VERSION).first()
+    if row is not None and row.segments_sha256 == digest and row.facts is not None:
+        return json.loads(crypto.decrypt_text(row.facts))
+
+    row = _claim(db, transcript_id, digest, datetime.now(timezone.utc))
+    try:
+        facts = extract.extract_facts(segments, roster)
+    except Exception:
+        # release the claim so the retry (or the other task) does not wait it out
+        db.rollback()
+        row.claimed_at = None
+        db.commit()
+        raise
+    facts_json = json.dumps(facts)
+    enc_facts = crypto.encrypt_text(facts_json)
+    row.facts = enc_facts
+    row.encrypted = (enc_facts != facts_json)
+    row.claimed_at = None
+    db.commit()
+    return facts
@@ -0,0 +1,300 @@
+"""Node-local inference server shared by all Celery worker processes.
+
+With the prefork pool every child that transcribes would otherwise load its
+own WhisperX + pyannote stack. Running this server once per node keeps a
+single copy of the models resident; workers reach it through
+`transcribe_remote` whenever `INFERENCE_SERVER_URL` is set.
+
+Supported URLs:
+- `unix:///run/eden/inference.sock`
+- `http://127.0.0.1:8765`
+
+Requests are queued and drained by a single model thread with
+stage-serialized scheduling: whatever is queued within
+`INFERENCE_BATCH_WINDOW_MS` (up to `INFERENCE_BATCH_SIZE` jobs) forms a group
+that is run stage by stage - all decoding, then ASR ordered by model, then
+alignment ordered by language, then diarization - so each model is used
+back-to-back instead of interleaved with others. Every job still gets its
+own model call per stage; the models are not fed several jobs at once.
+
+Clients send encoded audio, or already-decoded 16 kHz float32 samples with
+`format=f32le`.
+
+Run with: `python -m app.ai.inference_server`
+"""
+import json
+import os
+import queue
+import socketserver
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from app.core.config import settings
+
+
+# --- Client ---
+
+def _client_target(url: str):
+    parsed = urlparse(url)
+    if parsed.scheme == "unix":
+        import httpx
+        return httpx.HTTPTransport(uds=parsed.path), "http://inference"
+    return None, url.rstrip("/")
+
+
+def _job_params(diarize: bool, quality: Optional[str], backlog: int, tier: Optional[str]) -> Dict[str, Any]:
+    params = {"diarize": int(diarize), "backlog": backlog}
+    if quality:
+        params["quality"] = quality
+    if tier:
+        params["tier"] = tier
+    return params
+
+
+def _request_body(data: Union[bytes, bytearray, memoryview, BinaryIO, np.ndarray]) -> Tuple[bytes, Optional[str]]:
+    """Request body and `format` for encoded bytes, a readable stream or decoded samples."""
+    if isinstance(data, np.ndarray):
+        return np.ascontiguousarray(data, dtype=np.float32).tobytes(), "f32le"
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return bytes(data), None
+    if hasattr(data, "read"):
+        return data.read(), None
+    raise TypeError(f"Cannot send {type(data).__name__} to the inference server")
+
+
+def transcribe_remote(data: Union[bytes, bytearray, memoryview, BinaryIO, np.ndarray], diarize: bool = True,
+                      quality: Optional[str] = None, backlog: int = 0, tier: Optional[str] = None) -> Dict[str, Any]:
+    """Send audio (bytes, a stream or a decoded array) to the inference server and return the pipeline result."""
+    import httpx
+
+    body, fmt = _request_body(data)
+    params = _job_params(diarize, quality, backlog, tier)
+    if fmt:
+        params["format"] = fmt
+    transport, base_url = _client_target(settings.INFERENCE_SERVER_URL)
+    with httpx.Client(transport=transport, timeout=settings.INFERENCE_SERVER_TIMEOUT) as client:
+        resp = client.post(f"{base_url}/transcribe", params=params, content=body, headers={"Content-Type": "application/octet-stream"})
+    if resp.status_code != 200:
+        raise RuntimeError(f"Inference server error {resp.status_code}: {resp.text}")
+    return resp.json()
+
+
+# --- Server ---
+
+class _Job:
+    __slots__ = ("data", "diarize", "quality", "backlog", "tier", "future", "audio", "choice", "asr", "aligned", "language")
+
+    def __init__(self, data: Union[bytes, np.ndarray], diarize: bool = True, quality: Optional[str] = None, backlog: int = 0,
+                 tier: Optional[str] = None):
+        self.data = data
+        self.diarize = diarize
+        self.quality = quality
+        self.backlog = backlog
+        self.tier = tier
+        self.choice = None
+        self.future: Future = Future()
+        self.audio = None
+        self.asr = None
+        self.aligned = None
+        self.language = None
+
+
+class InferenceWorker:
+    """Owns the models; drains the request queue group by group, one stage at a time.
+
+    `pipeline` provides the stage functions (`app.ai.transcribe` by default).
+    """
+
+    def __init__(self, max_queue: int, batch_size: int, batch_window_ms: int, pipeline=None):
+        self.jobs: "queue.Queue[_Job]" = queue.Queue(maxsize=max_queue)
+        self.batch_size = batch_size
+        self.batch_window = batch_window_ms / 1000.0
+        self.pipeline = pipeline
+        self.groups = 0
+        self.completed = 0
+        self._thread = threading.Thread(target=self._loop, name="inference-worker", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def submit(self, data: Union[bytes, np.ndarray], diarize: bool = True, quality: Optional[str] = None, backlog: int = 0,
+               tier: Optional[str] = None) -> Future:
+        job = _Job(data, diarize, quality, backlog, tier)
+        self.jobs.put_nowait(job)  # raises queue.Full when saturated
+        return job.future
+
+    def _next_group(self) -> List[_Job]:
+        group = [self.jobs.get()]
+        deadline = time.monotonic() + self.batch_window
+        while len(group) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                group.append(self.jobs.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return group
+
+    def _stage(self, jobs: List[_Job], fn) -> List[_Job]:
+        alive = []
+        for job in jobs:
+            try:
+                fn(job)
+                alive.append(job)
+            except Exception as exc:
+                job.future.set_exception(exc)
+        return alive
+
+    def _run_stages(self, group: List[_Job]) -> None:
+        """Run every stage for the whole group before the next stage; a failing job drops out with its error."""
+        transcribe = self.pipeline
+        if transcribe is None:
+            from app.ai import transcribe
+
+        device = transcribe.get_device()
+
+        def decode(job):
+            job.audio = transcribe.load_audio_bytes(job.data)
+            job.data = None
+            job.language = transcribe.detect_language(job.audio, device)
+            job.choice = transcribe.select_model(job.audio, device, quality=job.quality, backlog=job.backlog, tier=job.tier,
+                                                 language=job.language)
+
+        def asr(job):
+            job.asr = transcribe.run_asr(job.audio, device, model_name=job.choice.model_name, compute_type=job.choice.compute_type,
+                                         language=job.language)
+            job.language = job.asr["language"]
+
+        def align(job):
+            job.aligned = transcribe.run_alignment(job.asr["segments"], job.language, job.audio, device)
+
+        def diarize(job):
+            diarization = transcribe.run_diarization(job.audio, device) if job.diarize else None
+            result = transcribe.assign_speakers(diarization, job.aligned, job.language)
+            result["model_tier"] = job.choice.tier
+            job.future.set_result(result)
+
+        jobs = self._stage(group, decode)
+        # group by model so each tier's weights are used back-to-back
+        jobs = self._stage(sorted(jobs, key=lambda j: j.choice), asr)
+        jobs = self._stage(sorted(jobs, key=lambda j: j.language or ""), align)
+        self._stage(jobs, diarize)
+
+    def _loop(self) -> None:
+        while True:
+            group = self._next_group()
+            try:
+                self._run_stages(group)
+            except Exception as exc:
+                for job in group:
+                    if not job.future.done():
+                        job.future.set_exception(exc)
+            self.groups += 1
+            self.completed += len(group)
+
+    def stats(self) -> Dict[str, Any]:
+        from app.ai.registry import registry
+        return {
+            "queued": self.jobs.qsize(),
+            "groups": self.groups,
+            "completed": self.completed,
+            "registry": registry.stats(),
+        }
+
+
+def _make_handler(worker: InferenceWorker):
+    class Handler(BaseHTTPRequestHandler):
+        def _send_json(self, code: int, payload: Dict[str, Any]) -> None:
+            body = json.dumps(payload).encode()
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send_json(200, {"status": "healthy"})
+            elif self.path == "/stats":
+                self._send_json(200, worker.stats())
+            else:
+                self._send_json(404, {"detail": "Not found"})
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            if url.path != "/transcribe":
+                self._send_json(404, {"detail": "Not found"})
+                return
+            query = parse_qs(url.query)
+            diarize = query.get("diarize", ["1"])[0] != "0"
+            quality = query.get("quality", [None])[0]
+            backlog = int(query.get("backlog", ["0"])[0])
+            tier = query.get("tier", [None])[0]
+            length = int(self.headers.get("Content-Length") or 0)
+            data = self.rfile.read(length)
+            if not data:
+                self._send_json(422, {"detail": "Empty body"})
+                return
+            if query.get("format", [None])[0] == "f32le":
+                if len(data) % 4:
+                    self._send_json(422, {"detail": "f32le body is not a whole number of samples"})
+                    return
+                data = np.frombuffer(data, dtype=np.float32)
+            try:
+                future = worker.submit(data, diarize, quality, backlog, tier)
+            except queue.Full:
+                self._send_json(503, {"detail": "Inference queue full"})
+                return
+            try:
+                self._send_json(200, future.result())
+            except Exception as exc:
+                self._send_json(500, {"detail": str(exc)})
+
+        def address_string(self):
+            # AF_UNIX peers have no (host, port) tuple
+            return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+        def log_message(self, format, *args):
+            print(f"DEBUG: inference {self.address_string()} {format % args}")
+
+    return Handler
+
+
+class _ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(url: Optional[str] = None) -> None:
+    url = url or settings.INFERENCE_SERVER_URL or "http://127.0.0.1:8765"
+    worker = InferenceWorker(
+        max_queue=settings.INFERENCE_MAX_QUEUE,
+        batch_size=settings.INFERENCE_BATCH_SIZE,
+        batch_window_ms=settings.INFERENCE_BATCH_WINDOW_MS,
+    )
+    worker.start()
+    handler = _make_handler(worker)
+
+    parsed = urlparse(url)
+    if parsed.scheme == "unix":
+        if os.path.exists(parsed.path):
+            os.remove(parsed.path)
+        server = _ThreadingUnixHTTPServer(parsed.path, handler)
+    else:
+        server = ThreadingHTTPServer((parsed.hostname or "127.0.0.1", parsed.port or 8765), handler)
+
+    print(f"Inference server listening on {url}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    serve()
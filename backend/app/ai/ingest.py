@@ -0,0 +1,61 @@
+"""Canonical audio masters.
+
+Uploads are kept byte-for-byte as the *original*. `normalize_audio`
+transcodes each one once to a 16 kHz mono master (`AUDIO_MASTER_FORMAT`)
+stored next to it, and records what was found in `AudioFile.meta`:
+
+    {"duration_seconds": 1834.2, "codec": "opus", "sample_rate": 48000, "channels": 1,
+     "master": {"format": "opus", "content_type": "audio/ogg", "sample_rate": 16000,
+                "channels": 1, "size_bytes": 7340032},
+     "original_expired": false}
+
+Later stages read the master (smaller download, cheaper decode) and fall
+back to the original for files ingested before masters existed. When
+`AUDIO_EXPIRE_ORIGINAL_HOURS` is set the original is deleted after that
+delay and playback is served from the master.
+"""
+import json
+import posixpath
+from typing import Any, Dict, Optional, Tuple
+
+from app.ai.audio import MASTER_FORMATS, SAMPLE_RATE
+
+
+def load_meta(a) -> Dict[str, Any]:
+    """`AudioFile.meta` as a dict (client metadata that isn't a JSON object is kept under "client")."""
+    if not a.meta:
+        return {}
+    try:
+        meta = json.loads(a.meta)
+    except (TypeError, ValueError):
+        return {"client": a.meta}
+    return meta if isinstance(meta, dict) else {"client": meta}
+
+
+def update_meta(a, **fields) -> Dict[str, Any]:
+    meta = load_meta(a)
+    meta.update(fields)
+    a.meta = json.dumps(meta)
+    return meta
+
+
+def master_key_for(original_key: str, fmt: str) -> str:
+    return posixpath.join(posixpath.dirname(original_key), "master" + MASTER_FORMATS[fmt][2])
+
+
+def master_meta(fmt: str, size_bytes: int) -> Dict[str, Any]:
+    return {"format": fmt, "content_type": MASTER_FORMATS[fmt][1], "sample_rate": SAMPLE_RATE, "channels": 1, "size_bytes": size_bytes}
+
+
+def processing_source(a) -> Tuple[str, Optional[str]]:
+    """`(key, content_type)` downstream stages should decode: the master when there is one."""
+    if a.master_s3_key:
+        return a.master_s3_key, load_meta(a).get("master", {}).get("content_type")
+    return a.s3_key, a.content_type
+
+
+def playback_source(a) -> Tuple[str, Optional[str]]:
+    """`(key, content_type)` to serve for download: the original unless it has expired."""
+    if a.master_s3_key and load_meta(a).get("original_expired"):
+        return processing_source(a)
+    return a.s3_key, a.content_type
@@ -0,0 +1,158 @@
+"""Local intent classifier, the cheap first stage of intent classification.
+
+Most meeting chatter is plainly INFORMATION or OFF_TOPIC and does not need an
+LLM round trip. `IntentModel` is a multinomial logistic regression over
+hashed word unigrams and bigrams: a statement's scores are the sum of the
+weight rows of its features, so a whole meeting is scored with one gather
+and one `np.add.reduceat`. Statements it is not confident about
+(`INTENT_MODEL_MIN_CONFIDENCE`) are escalated to the LLM by
+`extract.classify_intents`.
+
+The model is trained from intents the LLM assigned earlier, as persisted in
+`extraction_facts` (`train_intent_model` task); only intents stored with
+`source == "llm"` count, so facts from extractors before version 4 are
+skipped. It is saved as an `.npz` at `INTENT_MODEL_PATH`. Workers reload it
+when the file changes, and retry on later calls if loading fails. Without a
+model file every statement goes to the LLM as before.
+"""
+import logging
+import os
+import re
+import threading
+import zlib
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+N_FEATURES = 1 << 18
+_TOKEN_RE = re.compile(r"[a-z0-9']+|\?")
+
+
+def _feature_ids(text: str, n_features: int) -> List[int]:
+    tokens = _TOKEN_RE.findall(text.lower())
+    grams = ["<bias>"] + tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    # crc32 rather than hash(): ids must not change between processes
+    return [zlib.crc32(g.encode("utf-8")) % n_features for g in grams]
+
+
+def featurize(texts: Sequence[str], n_features: int = N_FEATURES) -> Tuple[np.ndarray, np.ndarray]:
+    """Hashed features of all texts as `(ids, starts)`: the ids of text `i` are `ids[starts[i]:starts[i + 1]]`."""
+    per_text = [_feature_ids(t, n_features) for t in texts]
+    starts = np.zeros(len(per_text) + 1, dtype=np.int64)
+    np.cumsum([len(f) for f in per_text], out=starts[1:])
+    ids = np.fromiter((i for f in per_text for i in f), dtype=np.int64, count=int(starts[-1]))
+    return ids, starts
+
+
+def _softmax(scores: np.ndarray) -> np.ndarray:
+    scores = scores - scores.max(axis=1, keepdims=True)
+    np.exp(scores, out=scores)
+    scores /= scores.sum(axis=1, keepdims=True)
+    return scores
+
+
+class IntentModel:
+    def __init__(self, labels: Sequence[str], weights: np.ndarray):
+        self.labels = list(labels)
+        self.weights = weights  # (n_features, n_labels)
+
+    @property
+    def n_features(self) -> int:
+        return self.weights.shape[0]
+
+    def _probabilities(self, ids: np.ndarray, starts: np.ndarray) -> np.ndarray:
+        # every text has at least the bias feature, so no reduceat segment is empty
+        return _softmax(np.add.reduceat(self.weights[ids], starts[:-1], axis=0))
+
+    def predict(self, texts: Sequence[str]) -> Tuple[List[str], np.ndarray]:
+        """Most likely intent of each text and its probability."""
+        if not texts:
+            return [], np.zeros(0, dtype=np.float32)
+        probs = self._probabilities(*featurize(texts, self.n_features))
+        best = probs.argmax(axis=1)
+        return [self.labels[i] for i in best], probs[np.arange(len(best)), best]
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez_compressed(tmp, labels=np.array(self.labels), weights=self.weights)
+        os.replace(tmp, path)  # workers never see a half-written model
+
+    @classmethod
+    def load(cls, path: str) -> "IntentModel":
+        with np.load(path, allow_pickle=False) as data:
+            return cls([str(label) for label in data["labels"]], data["weights"])
+
+
+def train(texts: Sequence[str], labels: Sequence[str], classes: Sequence[str], epochs: int = 15,
+          learning_rate: float = 0.5, l2: float = 1e-6, batch_size: int = 256, n_features: int = N_FEATURES,
+          seed: int = 0) -> IntentModel:
+    """Fit by mini-batch gradient descent on the softmax cross-entropy."""
+    class_index = {c: i for i, c in enumerate(classes)}
+    keep = [i for i, label in enumerate(labels) if label in class_index]
+    ids, starts = featurize([texts[i] for i in keep], n_features)
+    y = np.array([class_index[labels[i]] for i in keep], dtype=np.int64)
+    model = IntentModel(classes, np.zeros((n_features, len(classes)), dtype=np.float32))
+
+    rng = np.random.default_rng(seed)
+    for _ in range(epochs):
+        order = rng.permutation(len(y))
+        for lo in range(0, len(order), batch_size):
+            rows = order[lo:lo + batch_size]
+            counts = starts[rows + 1] - starts[rows]
+            batch_starts = np.zeros(len(rows) + 1, dtype=np.int64)
+            np.cumsum(counts, out=batch_starts[1:])
+            batch_ids = ids[np.repeat(starts[rows] - batch_starts[:-1], counts) + np.arange(batch_starts[-1])]
+
+            grad = model._probabilities(batch_ids, batch_starts)
+            grad[np.arange(len(rows)), y[rows]] -= 1.0
+            grad /= len(rows)
+            touched = np.unique(batch_ids)
+            model.weights[touched] *= (1.0 - learning_rate * l2)
+            np.add.at(model.weights, batch_ids, -learning_rate * np.repeat(grad, counts, axis=0))
+    return model
+
+
+def training_examples(facts: Iterable[Dict]) -> Tuple[List[str], List[str]]:
+    """(text, intent) pairs the LLM labelled, from persisted extraction facts."""
+    texts, labels = [], []
+    for f in facts:
+        for statement, intent in zip(f.get("statements", []), f.get("intents", [])):
+            if intent.get("source") == "llm" and statement.get("normalized_text"):
+                texts.append(statement["normalized_text"])
+                labels.append(intent["intent"])
+    return texts, labels
+
+
+_model: Optional[IntentModel] = None
+_model_key: Optional[Tuple[str, float]] = None
+_model_lock = threading.Lock()
+
+
+def get_model() -> Optional[IntentModel]:
+    """The model at `INTENT_MODEL_PATH`, reloaded when the file changes; None without one.
+
+    A file that fails to load is logged and retried on the next call; the previously loaded
+    model (if any) stays in use meanwhile.
+    """
+    global _model, _model_key
+    path = settings.INTENT_MODEL_PATH
+    if not path:
+        return None
+    try:
+        key = (path, os.path.getmtime(path))
+    except OSError:
+        return None
+    with _model_lock:
+        if key != _model_key:
+            try:
+                _model = IntentModel.load(path)
+            except Exception:
+                logger.exception("Could not load intent model %s", path)
+                return _model
+            _model_key = key
+        return _model
@@ -0,0 +1,179 @@
+"""Process-wide LLM client for the extraction layers.
+
+Building an `OpenAI` client per call also builds a new HTTP connection pool,
+so every request paid a fresh TCP/TLS handshake. One `LLMClient` per process
+keeps the SDK's pooled keep-alive connections, applies `LLM_TIMEOUT_SECONDS`
+and `LLM_MAX_RETRIES` (the SDK retries connection errors, 408/409/429 and 5xx
+with exponential backoff), and caps in-flight requests at
+`LLM_MAX_CONCURRENCY` across threads and coroutines.
+
+`complete_many` fans a list of prompts out over a thread pool so one Celery
+worker can classify or extract many statement batches at once;
+`acomplete`/`acomplete_many` are the asyncio equivalents. `OPENAI_BASE_URL`
+points the client at any OpenAI-compatible endpoint (a proxy, a local
+server, or a stub in tests).
+
+Identical requests are answered from `app.ai.llm_cache` when it is enabled.
+
+Clients are created lazily and re-created after a fork (Celery prefork), since
+pooled connections must not be shared between processes.
+"""
+import asyncio
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.ai import llm_cache
+
+DEFAULT_SYSTEM_PROMPT = "You are a helpful meeting assistant."
+
+
+class LLMClient:
+    def __init__(self, api_key: str, base_url: Optional[str] = None, model: str = "gpt-4o", timeout: float = 60.0,
+                 max_retries: int = 3, max_concurrency: int = 8, cache=None):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.model = model
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.max_concurrency = max(1, max_concurrency)
+        self.cache = cache  # app.ai.llm_cache.LLMCache or None
+        self._lock = threading.Lock()
+        self._sync = None
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._async = weakref.WeakKeyDictionary()  # event loop -> (AsyncOpenAI, asyncio.Semaphore)
+
+    def _kwargs(self):
+        kwargs = {"api_key": self.api_key, "timeout": self.timeout, "max_retries": self.max_retries}
+        if self.base_url:
+            kwargs["base_url"] = self.base_url
+        return kwargs
+
+    def _request(self, prompt: str, system_prompt: str, model: Optional[str], json_mode: bool):
+        request = {
+            "model": model or self.model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt},
+            ],
+        }
+        if json_mode:
+            request["response_format"] = {"type": "json_object"}
+        return request
+
+    def sync_client(self):
+        with self._lock:
+            if self._sync is None:
+                from openai import OpenAI
+                self._sync = OpenAI(**self._kwargs())
+            return self._sync
+
+    def _async_client(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self._async.get(loop)
+            if entry is None:
+                from openai import AsyncOpenAI
+                # async clients and semaphores are bound to the loop that created them
+                entry = (AsyncOpenAI(**self._kwargs()), asyncio.Semaphore(self.max_concurrency))
+                self._async[loop] = entry
+            return entry
+
+    def _cache_key(self, prompt: str, system_prompt: str, model: Optional[str], json_mode: bool) -> Optional[str]:
+        if self.cache is None:
+            return None
+        return llm_cache.fingerprint(model or self.model, system_prompt, prompt, json_mode)
+
+    def complete(self, prompt: str, system_prompt: str = DEFAULT_SYSTEM_PROMPT, model: Optional[str] = None,
+                 json_mode: bool = True) -> str:
+        key = self._cache_key(prompt, system_prompt, model, json_mode)
+        cached = self.cache.get(key) if key else None
+        if cached is not None:
+            return cached
+        client = self.sync_client()
+        with self._slots:
+            response = client.chat.completions.create(**self._request(prompt, system_prompt, model, json_mode))
+        content = response.choices[0].message.content
+        if key and content is not None:
+            self.cache.put(key, content)
+        return content
+
+    def complete_many(self, prompts: List[str], system_prompt: str = DEFAULT_SYSTEM_PROMPT, model: Optional[str] = None,
+                      json_mode: bool = True, default: Optional[str] = None) -> List[str]:
+        """`complete` for each prompt, concurrently; results in input order.
+
+        With `default`, a prompt whose request fails (after retries) yields
+        `default` instead of failing the whole batch.
+        """
+        def one(prompt: str) -> str:
+            try:
+                return self.complete(prompt, system_prompt, model, json_mode)
+            except Exception as e:
+                if default is None:
+                    raise
+                print(f"ERROR: LLM call failed: {str(e)}")
+                return default
+
+        if len(prompts) <= 1:
+            return [one(p) for p in prompts]
+        with ThreadPoolExecutor(max_workers=min(len(prompts), self.max_concurrency), thread_name_prefix="llm") as pool:
+            return list(pool.map(one, prompts))
+
+    async def acomplete(self, prompt: str, system_prompt: str = DEFAULT_SYSTEM_PROMPT, model: Optional[str] = None,
+                        json_mode: bool = True) -> str:
+        key = self._cache_key(prompt, system_prompt, model, json_mode)
+        cached = self.cache.get(key) if key else None
+        if cached is not None:
+            return cached
+        client, slots = self._async_client()
+        async with slots:
+            response = await client.chat.completions.create(**self._request(prompt, system_prompt, model, json_mode))
+        content = response.choices[0].message.content
+        if key and content is not None:
+            self.cache.put(key, content)
+        return content
+
+    async def acomplete_many(self, prompts: List[str], system_prompt: str = DEFAULT_SYSTEM_PROMPT,
+                             model: Optional[str] = None, json_mode: bool = True) -> List[str]:
+        return list(await asyncio.gather(*(self.acomplete(p, system_prompt, model, json_mode) for p in prompts)))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._sync is not None:
+                self._sync.close()
+                self._sync = None
+            self._async.clear()
+
+
+_client: Optional[LLMClient] = None
+_client_pid: Optional[int] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> Optional[LLMClient]:
+    """The process-wide client, or None when no API key is configured."""
+    global _client, _client_pid
+    if not settings.OPENAI_API_KEY:
+        return None
+    with _client_lock:
+        if _client is None or _client_pid != os.getpid():
+            _client = LLMClient(
+                api_key=settings.OPENAI_API_KEY,
+                base_url=settings.OPENAI_BASE_URL,
+                model=settings.LLM_MODEL,
+                timeout=settings.LLM_TIMEOUT_SECONDS,
+                max_retries=settings.LLM_MAX_RETRIES,
+                max_concurrency=settings.LLM_MAX_CONCURRENCY,
+                cache=llm_cache.from_settings(),
+            )
+            _client_pid = os.getpid()
+        return _client
+
+
+def cache_stats() -> Optional[Dict[str, Any]]:
+    """Hit/miss counters of this process's LLM response cache, if one is in use."""
+    client = _client if _client_pid == os.getpid() else None
+    return client.cache.stats() if client is not None and client.cache is not None else None
@@ -0,0 +1,174 @@
+"""Content-addressed cache of LLM responses.
+
+Retries, summary tone/length variants and re-requested extractions send
+byte-identical prompts. Responses are cached under the SHA-256 of
+`(model, system prompt, prompt, json mode)`, so an identical request is
+answered without an API call no matter which task or process sends it.
+
+Responses are derived from meeting transcripts, so like transcript segments
+they are stored encrypted with `app.core.crypto` (when `ENCRYPTION_KEY` is
+set), and caching is off unless configured.
+
+Backends (`LLM_CACHE_BACKEND`):
+
+- "none" (default): disabled.
+- "sqlite": a local file at `LLM_CACHE_PATH` (required; created owner-only),
+  shared by the processes of one node. Least-recently-used entries are
+  evicted once it holds more than `LLM_CACHE_MAX_MB` of responses.
+- "redis": shared by every node via `LLM_CACHE_REDIS_URL` (required). Size is
+  bounded by that Redis instance's own `maxmemory` with an LRU
+  `maxmemory-policy`, so point it at a cache instance, not the Celery broker.
+
+Entries expire after `LLM_CACHE_TTL_SECONDS` in both. `stats()` reports
+hits, misses and hit rate for this process.
+"""
+import abc
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from app.core import crypto
+from app.core.config import settings
+
+
+def fingerprint(model: str, system_prompt: str, prompt: str, json_mode: bool = True) -> str:
+    payload = json.dumps([model, system_prompt, prompt, json_mode], ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache(abc.ABC):
+    """Encryption and hit/miss accounting shared by the backends."""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            stored = self._get(key)
+            value = crypto.decrypt_text(stored) if stored is not None else None
+            if value is not None and value == stored and crypto.encryption_enabled():
+                value = None  # written under another key (or before encryption): treat as a miss
+        except Exception as e:
+            print(f"WARNING: LLM cache read failed: {e}")
+            value = None
+        with self._stats_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def put(self, key: str, value: str) -> None:
+        try:
+            self._put(key, crypto.encrypt_text(value))
+        except Exception as e:
+            print(f"WARNING: LLM cache write failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            total = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses, "hit_rate": round(self.hits / total, 4) if total else 0.0}
+
+    @abc.abstractmethod
+    def _get(self, key: str) -> Optional[str]:
+        """Stored (encrypted) value, or None."""
+
+    @abc.abstractmethod
+    def _put(self, key: str, value: str) -> None:
+        """Store an (encrypted) value."""
+
+
+class SQLiteLLMCache(LLMCache):
+    def __init__(self, path: str, ttl_seconds: float, max_bytes: int):
+        super().__init__(ttl_seconds)
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # create owner-only before SQLite does (it would use the umask); WAL files inherit the mode
+        os.close(os.open(path, os.O_CREAT | os.O_RDWR, 0o600))
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL,"
+            " created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed)")
+
+    def _get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM llm_cache WHERE key = ? AND created > ?",
+                                     (key, now - self.ttl_seconds)).fetchone()
+            if row:
+                self._conn.execute("UPDATE llm_cache SET accessed = ? WHERE key = ?", (now, key))
+        return row[0] if row else None
+
+    def _put(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?, ?)",
+                               (key, value, len(value.encode("utf-8")), now, now))
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute("DELETE FROM llm_cache WHERE created <= ?", (now - self.ttl_seconds,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # drop least recently used entries until back under budget
+        excess = total - self.max_bytes
+        freed = 0
+        doomed = []
+        for key, size in self._conn.execute("SELECT key, size FROM llm_cache ORDER BY accessed"):
+            doomed.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._conn.executemany("DELETE FROM llm_cache WHERE key = ?", doomed)
+
+    def entries(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+
+class RedisLLMCache(LLMCache):
+    PREFIX = "llmcache:"
+
+    def __init__(self, url: str, ttl_seconds: float):
+        super().__init__(ttl_seconds)
+        import redis
+        self._redis = redis.Redis.from_url(url)
+
+    def _get(self, key: str) -> Optional[str]:
+        value = self._redis.get(self.PREFIX + key)
+        return value.decode("utf-8") if value is not None else None
+
+    def _put(self, key: str, value: str) -> None:
+        self._redis.set(self.PREFIX + key, value, ex=int(self.ttl_seconds))
+
+
+def from_settings() -> Optional[LLMCache]:
+    backend = (settings.LLM_CACHE_BACKEND or "none").lower()
+    ttl = settings.LLM_CACHE_TTL_SECONDS
+    try:
+        if backend == "sqlite":
+            if not settings.LLM_CACHE_PATH:
+                print("WARNING: LLM_CACHE_BACKEND=sqlite needs LLM_CACHE_PATH; continuing without a cache")
+                return None
+            return SQLiteLLMCache(settings.LLM_CACHE_PATH, ttl, settings.LLM_CACHE_MAX_MB * 1024 * 1024)
+        if backend == "redis":
+            if not settings.LLM_CACHE_REDIS_URL:
+                print("WARNING: LLM_CACHE_BACKEND=redis needs LLM_CACHE_REDIS_URL; continuing without a cache")
+                return None
+            return RedisLLMCache(settings.LLM_CACHE_REDIS_URL, ttl)
+    except Exception as e:
+        print(f"WARNING: LLM cache unavailable ({e}); continuing without it")
+    return None
@@ -0,0 +1,143 @@
+"""Owner resolution for action items.
+
+The heuristic `([A-Z][a-z]+) will` missed owners with two-word names, "I'll
+send it", "assign it to Priya" and lowercase ASR output, so those items were
+dropped by validation for having no owner. `OwnerIndex` is a per-meeting
+trie over token sequences of everyone who can own an item:
+
+- participant display names, in full and by first name;
+- email local parts ("priya.shah@..." -> "priya shah" and "priya");
+- diarized speaker labels and the names voiceprints gave them.
+
+Each statement is tokenized once and walked against the trie for the
+longest mention at every position. An alias shared by two people ("Alex"
+for Alex Kim and Alex Roy) resolves to nobody rather than to a guess.
+
+Resolution order for a statement:
+
+1. a mention followed by an assignment cue ("Priya will", "Alex Kim needs to");
+2. "I will" / "I'll" / "let me" → the statement's speaker;
+3. a mention after "to", "for" or "ask" ("assign this to Priya");
+4. the legacy capitalized-name-before-"will" rule, minus pronouns ("We will").
+"""
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.ai.refine import DRAFT_SPEAKER_ID
+
+_TOKEN_RE = re.compile(r"\w+")
+_LEGACY_OWNER_RE = re.compile(r"([A-Z][a-z]+)\s+will")
+
+_OWNER = object()  # trie key holding the owner of the alias ending at that node
+_AMBIGUOUS = object()
+
+AFTER_CUES = frozenset({"will", "ll", "shall", "should", "must", "can", "needs", "has", "is", "going", "to"})
+BEFORE_CUES = frozenset({"to", "for", "ask", "asked", "assign", "assigned"})
+FIRST_PERSON = frozenset({"i"})
+# capitalized at the start of a sentence, but nobody's name
+NOT_NAMES = frozenset({"we", "you", "they", "he", "she", "it", "this", "that", "there", "who", "what", "someone",
+                       "somebody", "everyone", "everybody", "nobody", "which", "then", "so", "and", "but"})
+
+
+def _tokens(text: str) -> List[str]:
+    return [t.lower() for t in _TOKEN_RE.findall(text)]
+
+
+class OwnerIndex:
+    def __init__(self):
+        self._root: Dict[Any, Any] = {}
+        self._speakers: Dict[str, str] = {}  # speaker label -> owner
+
+    def add(self, alias: Optional[str], owner: str) -> None:
+        tokens = _tokens(alias or "")
+        if not tokens:
+            return
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        existing = node.get(_OWNER)
+        node[_OWNER] = owner if existing in (None, owner) else _AMBIGUOUS
+
+    def add_person(self, display_name: Optional[str] = None, email: Optional[str] = None) -> Optional[str]:
+        """Index a person under their name, first name and email local part; returns the owner string used."""
+        local = (email or "").split("@")[0]
+        local_name = " ".join(p for p in re.split(r"[._\-+\d]+", local) if p)
+        owner = (display_name or "").strip() or local_name.title() or email
+        if not owner:
+            return None
+        for name in (display_name, local_name):
+            tokens = _tokens(name or "")
+            if tokens:
+                self.add(" ".join(tokens), owner)
+                self.add(tokens[0], owner)
+        return owner
+
+    def add_speaker(self, label: Optional[str], name: Optional[str] = None) -> None:
+        # draft transcripts label everyone "UNKNOWN", which would pass validation as an owner
+        if not label or label == DRAFT_SPEAKER_ID or label in self._speakers:
+            return
+        owner = self.add_person(name) if name else None
+        self._speakers[label] = owner or label
+        self.add(label, owner or label)
+
+    def speaker_owner(self, label: Optional[str]) -> Optional[str]:
+        return self._speakers.get(label) if label else None
+
+    def mentions(self, words: List[str], capitalized: List[bool]) -> List[Tuple[int, int, str]]:
+        """Longest unambiguous mention starting at each position, as `(start, end, owner)`, left to right.
+
+        A mention must start with a capitalized word unless the text has no capitals at all
+        (lowercase ASR output), so a participant called "Will" does not match every "will".
+        """
+        check_case = any(capitalized)
+        found = []
+        i = 0
+        while i < len(words):
+            node, best = self._root, None
+            j = i
+            if not check_case or capitalized[i]:
+                while j < len(words) and words[j] in node:
+                    node = node[words[j]]
+                    j += 1
+                    if _OWNER in node:
+                        best = (i, j, node[_OWNER])
+            if best is not None and best[2] is not _AMBIGUOUS:
+                found.append(best)
+            i = best[1] if best is not None else i + 1
+        return found
+
+    def resolve(self, text: str, speaker: Optional[str] = None) -> Optional[str]:
+        raw = _TOKEN_RE.findall(text)
+        words = [t.lower() for t in raw]
+        found = self.mentions(words, [t[:1].isupper() for t in raw])
+
+        def after(end: int) -> Optional[str]:
+            return words[end] if end < len(words) else None
+
+        for start, end, owner in found:
+            if after(end) in AFTER_CUES:
+                return owner
+        for i, word in enumerate(words):
+            if (word in FIRST_PERSON and after(i + 1) in AFTER_CUES) or (word == "let" and after(i + 1) == "me"):
+                owner = self.speaker_owner(speaker)
+                if owner:
+                    return owner
+                break
+        for start, end, owner in found:
+            if start > 0 and words[start - 1] in BEFORE_CUES:
+                return owner
+        m = _LEGACY_OWNER_RE.search(text)
+        if not m or m.group(1).lower() in NOT_NAMES:
+            return None
+        # a name the index knows but could not pin down (shared first name) stays unresolved
+        return m.group(1) if m.group(1).lower() not in self._root else None
+
+
+def build_index(roster: Iterable[Dict[str, Any]], segments: Iterable[Dict[str, Any]]) -> OwnerIndex:
+    """Index for a meeting: `roster` entries have `display_name` and/or `email`; segments add speakers."""
+    index = OwnerIndex()
+    for person in roster:
+        index.add_person(person.get("display_name"), person.get("email"))
+    for seg in segments:
+        index.add_speaker(seg.get("speaker_id"), seg.get("speaker_name"))
+    return index
@@ -0,0 +1,119 @@
+"""Node-local cache of decoded PCM.
+
+ASR, alignment, diarization and waveform analysis all work on the same
+16 kHz mono float32 array, and a retried `process_transcription` would
+otherwise run ffmpeg over the whole recording again. Decoded audio is stored
+as `<content hash>-<rate>.npy` under `PCM_CACHE_DIR` and opened with
+`mmap_mode="r"`, so a hit costs no decode and no copy: pages are shared with
+every other process on the node that maps the same file.
+
+Files are written to a temp name and renamed into place, so readers never
+see a partial array. Eviction is LRU by mtime (touched on every hit) once the
+directory exceeds `PCM_CACHE_MAX_MB`; unlinking a file another process still
+has mapped is safe on POSIX.
+"""
+import os
+import tempfile
+import threading
+from typing import Callable, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.ai.audio import SAMPLE_RATE
+
+
+class PCMCache:
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.npy")
+
+    @staticmethod
+    def key_for(content_sha256: Optional[str], sr: int = SAMPLE_RATE) -> Optional[str]:
+        return f"{content_sha256}-{sr}" if content_sha256 else None
+
+    def get(self, key: Optional[str]) -> Optional[np.ndarray]:
+        if not key or not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            audio = np.load(path, mmap_mode="r")
+            os.utime(path)
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+        with self._lock:
+            self.hits += 1
+        return audio
+
+    def put(self, key: Optional[str], audio: np.ndarray) -> np.ndarray:
+        """Store `audio` and return it memory-mapped from the cache file."""
+        if not key or not self.enabled:
+            return audio
+        os.makedirs(self.root, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.ascontiguousarray(audio, dtype=np.float32))
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            print(f"WARNING: PCM cache write failed for {key}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return audio
+        self.evict(keep=key)
+        return np.load(self._path(key), mmap_mode="r")
+
+    def get_or_decode(self, key: Optional[str], decode: Callable[[], np.ndarray]) -> np.ndarray:
+        audio = self.get(key)
+        if audio is not None:
+            print(f"DEBUG: PCM cache hit for {key}")
+            return audio
+        with self._lock:
+            self.misses += 1
+        return self.put(key, decode())
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """Drop least-recently-used files until the cache fits its budget; returns files removed."""
+        try:
+            entries = []
+            with os.scandir(self.root) as it:
+                for entry in it:
+                    if entry.name.endswith(".npy"):
+                        st = entry.stat()
+                        entries.append((st.st_mtime, st.st_size, entry.path, entry.name[:-4]))
+        except FileNotFoundError:
+            return 0
+        total = sum(size for _, size, _, _ in entries)
+        removed = 0
+        for _, size, path, key in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            try:
+                os.remove(path)
+                total -= size
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+cache = PCMCache(
+    root=settings.PCM_CACHE_DIR or os.path.join(tempfile.gettempdir(), "eden-pcm-cache"),
+    max_bytes=settings.PCM_CACHE_MAX_MB * 1024 * 1024,
+)
@@ -0,0 +1,119 @@
+"""Multi-resolution waveform peaks.
+
+The player needs min/max pairs per pixel column, not the audio itself. Peaks
+are computed once per `AudioFile` at `PEAKS_BASE_SAMPLES` samples per pair,
+then reduced by `PEAKS_LEVEL_FACTOR` per level (a mipmap) until a level has
+fewer than `PEAKS_MIN_COUNT` pairs, and quantized to int8 or int16.
+
+Blob layout (little-endian):
+
+    magic   4s   b"EPK1"
+    bits    u8   8 or 16
+    levels  u8
+    _       u16  reserved
+    rate    u32  sample rate of the analysed audio
+    samples u64  total samples
+    levels x (samples_per_peak u32, count u32)
+    levels x count x (min, max) as int8/int16, finest level first
+"""
+import struct
+from typing import Iterable, List, NamedTuple, Optional
+
+import numpy as np
+
+MAGIC = b"EPK1"
+_HEADER = struct.Struct("<4sBBHIQ")
+_LEVEL = struct.Struct("<II")
+
+PEAKS_BASE_SAMPLES = 256  # 16 ms at 16 kHz
+PEAKS_LEVEL_FACTOR = 4
+PEAKS_MIN_COUNT = 512
+
+
+class PeaksLevel(NamedTuple):
+    samples_per_peak: int
+    data: np.ndarray  # shape (count, 2): min, max
+
+
+class Peaks(NamedTuple):
+    bits: int
+    sample_rate: int
+    samples: int
+    levels: List[PeaksLevel]
+
+
+def base_level(audio: np.ndarray, samples_per_peak: int) -> np.ndarray:
+    n = len(audio) // samples_per_peak
+    out = np.empty((n + (1 if len(audio) % samples_per_peak else 0), 2), dtype=np.float32)
+    if n:
+        frames = np.asarray(audio[: n * samples_per_peak]).reshape(n, samples_per_peak)
+        out[:n, 0] = frames.min(axis=1)
+        out[:n, 1] = frames.max(axis=1)
+    if len(out) > n:
+        tail = np.asarray(audio[n * samples_per_peak:])
+        out[n] = (tail.min(), tail.max())
+    return out
+
+
+def _reduce(level: np.ndarray, factor: int) -> np.ndarray:
+    pad = (-len(level)) % factor
+    if pad:
+        level = np.concatenate([level, np.repeat(level[-1:], pad, axis=0)])
+    grouped = level.reshape(-1, factor, 2)
+    return np.stack([grouped[:, :, 0].min(axis=1), grouped[:, :, 1].max(axis=1)], axis=1)
+
+
+def compute_peaks(audio: np.ndarray, sample_rate: int, bits: int = 8, base_samples: int = PEAKS_BASE_SAMPLES,
+                  factor: int = PEAKS_LEVEL_FACTOR, min_count: int = PEAKS_MIN_COUNT) -> Peaks:
+    return peaks_from_base(base_level(audio, base_samples), sample_rate, len(audio), bits, base_samples, factor, min_count)
+
+
+def peaks_from_base(base: np.ndarray, sample_rate: int, samples: int, bits: int = 8, base_samples: int = PEAKS_BASE_SAMPLES,
+                    factor: int = PEAKS_LEVEL_FACTOR, min_count: int = PEAKS_MIN_COUNT) -> Peaks:
+    """Build the mipmap from float min/max pairs at `base_samples` per pair."""
+    scale = 127 if bits == 8 else 32767
+    dtype = np.int8 if bits == 8 else np.int16
+    levels = []
+    current, spp = base, base_samples
+    while True:
+        quantized = np.clip(np.round(current * scale), -scale, scale).astype(dtype)
+        levels.append(PeaksLevel(spp, quantized))
+        if len(current) <= min_count:
+            break
+        current, spp = _reduce(current, factor), spp * factor
+    return Peaks(bits, sample_rate, samples, levels)
+
+
+def pack_peaks(peaks: Peaks, levels: Optional[Iterable[int]] = None) -> bytes:
+    chosen = [peaks.levels[i] for i in levels] if levels is not None else peaks.levels
+    parts = [_HEADER.pack(MAGIC, peaks.bits, len(chosen), 0, peaks.sample_rate, peaks.samples)]
+    parts += [_LEVEL.pack(lvl.samples_per_peak, len(lvl.data)) for lvl in chosen]
+    parts += [np.ascontiguousarray(lvl.data).astype("<i1" if peaks.bits == 8 else "<i2").tobytes() for lvl in chosen]
+    return b"".join(parts)
+
+
+def unpack_peaks(blob: bytes) -> Peaks:
+    magic, bits, count, _, rate, samples = _HEADER.unpack_from(blob, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a peaks blob")
+    dtype = np.dtype("<i1" if bits == 8 else "<i2")
+    offset = _HEADER.size
+    dims = []
+    for _ in range(count):
+        dims.append(_LEVEL.unpack_from(blob, offset))
+        offset += _LEVEL.size
+    levels = []
+    for spp, n in dims:
+        data = np.frombuffer(blob, dtype=dtype, count=n * 2, offset=offset).reshape(n, 2)
+        offset += n * 2 * dtype.itemsize
+        levels.append(PeaksLevel(spp, data))
+    return Peaks(bits, rate, samples, levels)
+
+
+def level_for_width(peaks: Peaks, width: int) -> int:
+    """Coarsest level that still has at least `width` pairs (finest if none does)."""
+    best = 0
+    for i, lvl in enumerate(peaks.levels):
+        if len(lvl.data) >= width:
+            best = i
+    return best
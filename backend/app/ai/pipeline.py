@@ -11,17 +11,56 @@ import asyncio
 import json
 from app.storage import storage
 from app.ai import transcribe
+from app.ai import dedupe
+from app.ai import policy
+from app.ai import word_timings
 from celery_app import celery_app
 
 from app.db import AsyncSessionLocal
 from sqlalchemy import select
-from app.models.models import Recording, AudioFile, Transcript
+from app.models.models import Recording, AudioFile, Transcript, Meeting, Organization
 from datetime import datetime, timezone
 from app.core import crypto
 
 logger = get_task_logger(__name__)
 
 
+async def _reuse_transcript(db, rec: Recording, af: AudioFile, src: Transcript) -> Dict[str, Any]:
+    """Link `rec` to a transcript of byte-identical audio, cloning it onto `af` if needed."""
+    from app.core.config import settings
+
+    logger.info("Recording %s matches transcript %s by content hash; skipping transcription", rec.id, src.id)
+    if src.audio_file_id == af.id:
+        tr = src
+    else:
+        tr = dedupe.clone_transcript(src, af.id, rec.meeting_id)
+        db.add(tr)
+        await db.commit()
+        await db.refresh(tr)
+
+    summary = extraction = None
+    if settings.DEDUPE_CLONE_DOWNSTREAM:
+        summary = (await db.execute(dedupe.latest_summary_query(src.id))).scalars().first()
+        extraction = (await db.execute(dedupe.latest_extraction_query(src.id))).scalars().first()
+        if tr is not src:
+            if summary:
+                db.add(dedupe.clone_summary(summary, tr))
+            if extraction:
+                db.add(dedupe.clone_extraction(extraction, tr))
+
+    rec.transcript_id = tr.id
+    rec.processed = True
+    rec.processing_status = "processed"
+    db.add(rec)
+    await db.commit()
+
+    if not extraction:
+        celery_app.send_task("app.tasks.process_extraction", args=(tr.id,))
+    if not summary:
+        celery_app.send_task("app.tasks.process_summarization", args=(tr.id, "short", "formal"))
+    return {"transcript_id": tr.id, "reused": True}
+
+
 def process_recording(recording_id: int) -> Dict[str, Any]:
     """Idempotent orchestration for recording processing.
 
@@ -58,14 +97,42 @@ def process_recording(recording_id: int) -> Dict[str, Any]:
                 res_af = await db.execute(select(AudioFile).filter_by(s3_key=rec.s3_key))
                 af = res_af.scalars().first()
                 
+                content_sha256 = dedupe.sha256_bytes(data)
                 if not af:
                     # create an AudioFile record referencing the same s3_key
-                    af = AudioFile(meeting_id=rec.meeting_id, s3_key=rec.s3_key, content_type=None, size_bytes=len(data), meta=None)
+                    af = AudioFile(meeting_id=rec.meeting_id, s3_key=rec.s3_key, content_type=None, size_bytes=len(data), content_sha256=content_sha256, meta=None)
                     db.add(af)
                     await db.commit()
                     await db.refresh(af)
                 else:
                     logger.info("AudioFile %s already exists for key %s, reusing", af.id, rec.s3_key)
+                    if not af.content_sha256:
+                        af.content_sha256 = content_sha256
+                        db.add(af)
+                        await db.commit()
+
+                # identical audio already transcribed: reuse instead of re-running ASR
+                organization_id = None
+                if rec.meeting_id:
+                    res_org = await db.execute(select(Meeting.organization_id).filter_by(id=rec.meeting_id))
+                    organization_id = res_org.scalar()
+                res_src = await db.execute(dedupe.reusable_transcript_query(content_sha256, organization_id, rec.meeting_id))
+                src = res_src.scalars().first()
+                if src:
+                    return await _reuse_transcript(db, rec, af, src)
+
+                # single-speaker meetings skip diarization entirely
+                diarize = True
+                quality = None
+                if rec.meeting_id:
+                    res_m = await db.execute(select(Meeting).filter_by(id=rec.meeting_id))
+                    meeting = res_m.scalars().first()
+                    diarize = not (meeting and meeting.single_speaker)
+                    if meeting and meeting.organization_id:
+                        res_o = await db.execute(select(Organization).filter_by(id=meeting.organization_id))
+                        org = res_o.scalars().first()
+                        quality = org.transcription_quality if org else None
+                backlog = policy.queue_backlog()
 
                 # run transcription (mocked) synchronously here
                 from app.core.config import settings
@@ -73,15 +140,17 @@ def process_recording(recording_id: int) -> Dict[str, Any]:
                     logger.info("Using Modal.com for transcription of recording %s", recording_id)
                     import modal
                     f = modal.Function.lookup("eden-ai-worker", "transcribe_audio")
-                    result = f.remote(data)
+                    result = f.remote(data, diarize=diarize, quality=quality, backlog=backlog)
                 else:
                     logger.info("Using local worker for transcription of recording %s", recording_id)
-                    result = transcribe.transcribe_bytes_to_segments(data)
+                    result = transcribe.transcribe_bytes_to_segments(data, diarize=diarize, quality=quality, backlog=backlog)
                 segments_json = json.dumps(result.get("segments", []))
                 # encrypt segments at rest if configured
                 enc_segments = crypto.encrypt_text(segments_json)
                 detected = result.get("detected_language")
-                tr = Transcript(audio_file_id=af.id, meeting_id=rec.meeting_id, segments=enc_segments, detected_language=detected, encrypted=(enc_segments != segments_json))
+                words = word_timings.decode_result(result)
+                tr = Transcript(audio_file_id=af.id, meeting_id=rec.meeting_id, segments=enc_segments, detected_language=detected, encrypted=(enc_segments != segments_json), model_tier=result.get("model_tier"),
+                                word_timings=crypto.encrypt_bytes(words) if words else None)
                 db.add(tr)
                 await db.commit()
                 await db.refresh(tr)
@@ -0,0 +1,97 @@
+"""Per-job choice of the WhisperX model tier.
+
+A single global `WHISPER_MODEL` makes a 20-second voice note wait behind
+hour-long large-v3 jobs. The policy starts every job at the organization's
+preferred tier and steps down when:
+
+- the Celery queue is backed up (`TRANSCRIBE_BACKLOG_LOW` / `_HIGH` jobs),
+- the clip is short (`TRANSCRIBE_SHORT_SECONDS`) and anything is waiting,
+- the clip is long (`TRANSCRIBE_LONG_SECONDS`), there is no GPU and anything
+  is waiting,
+
+never going below the organization's floor. With an idle queue every job
+gets the organization's starting tier, on CPU too; with the default
+"balanced" quality that is `WHISPER_MODEL`.
+
+When the language is known up front, English jobs are routed to the
+English-only variant of their tier (`ENGLISH_WHISPER_MODEL` for large).
+"""
+import time
+from typing import NamedTuple, Optional
+
+from app.core.config import settings
+
+TIERS = ("tiny", "base", "small", "medium", "large")
+
+# quality setting -> (starting tier, lowest tier the policy may pick)
+QUALITY_LEVELS = {
+    "fast": ("small", "tiny"),
+    "balanced": ("large", "small"),
+    "accurate": ("large", "medium"),
+}
+DEFAULT_QUALITY = "balanced"
+
+QUEUE_NAME = "celery"
+_BACKLOG_TTL = 5.0
+_backlog_cache = (float("-inf"), 0)
+
+
+class ModelChoice(NamedTuple):
+    tier: str
+    model_name: str
+    compute_type: str
+
+
+def tier_model_name(tier: str, language: Optional[str] = None) -> str:
+    if language == "en" and settings.ENGLISH_WHISPER_MODEL:
+        return settings.ENGLISH_WHISPER_MODEL if tier == "large" else f"{tier}.en"
+    return settings.WHISPER_MODEL if tier == "large" else tier
+
+
+def queue_backlog() -> int:
+    """Messages waiting in the Celery queue (cached briefly; 0 if the broker is unreachable)."""
+    global _backlog_cache
+    checked_at, depth = _backlog_cache
+    if time.monotonic() - checked_at < _BACKLOG_TTL:
+        return depth
+    try:
+        from celery_app import celery_app
+        with celery_app.connection_for_read() as conn:
+            conn.ensure_connection(max_retries=1)
+            depth = conn.default_channel.queue_declare(queue=QUEUE_NAME, passive=True).message_count
+    except Exception as e:
+        print(f"DEBUG: Queue backlog unavailable ({e}); assuming idle")
+        depth = 0
+    _backlog_cache = (time.monotonic(), depth)
+    return depth
+
+
+def _compute_type(device: str, backlog: int = 0) -> str:
+    if device == "cuda":
+        # int8 weights halve GPU memory when the queue is deep and throughput matters most
+        return "int8_float16" if backlog >= settings.TRANSCRIBE_BACKLOG_HIGH else "float16"
+    return "int8"
+
+
+def fixed_model(tier: str, device: str, language: Optional[str] = None) -> ModelChoice:
+    """Bypass the policy, e.g. for the draft pass of two-pass transcription."""
+    return ModelChoice(tier, tier_model_name(tier, language), _compute_type(device))
+
+
+def choose_model(duration_seconds: float, device: str, backlog: int = 0, quality: Optional[str] = None,
+                 language: Optional[str] = None) -> ModelChoice:
+    start, floor = QUALITY_LEVELS.get(quality or DEFAULT_QUALITY, QUALITY_LEVELS[DEFAULT_QUALITY])
+
+    steps = 0
+    if backlog >= settings.TRANSCRIBE_BACKLOG_HIGH:
+        steps += 2
+    elif backlog >= settings.TRANSCRIBE_BACKLOG_LOW:
+        steps += 1
+    if backlog > 0 and duration_seconds <= settings.TRANSCRIBE_SHORT_SECONDS:
+        steps += 1
+    if backlog > 0 and device == "cpu" and duration_seconds >= settings.TRANSCRIBE_LONG_SECONDS:
+        steps += 1
+
+    index = max(TIERS.index(start) - steps, TIERS.index(floor))
+    tier = TIERS[index]
+    return ModelChoice(tier, tier_model_name(tier, language), _compute_type(device, backlog))
@@ -0,0 +1,45 @@
+"""Draft vs. refined transcript comparison for two-pass transcription.
+
+With `TRANSCRIBE_TWO_PASS` a small model produces a draft transcript (no
+diarization) that summaries and extractions are built from right away; a
+full pass later replaces it. Downstream work is only redone when the refined
+transcript differs materially: enough of the words changed, diarization
+became available (the draft labels every segment `DRAFT_SPEAKER_ID`, so
+first-person action items could not be given an owner), or a diarized
+draft's set of speakers changed.
+"""
+from difflib import SequenceMatcher
+from typing import Any, Dict, List
+
+DRAFT_SPEAKER_ID = "UNKNOWN"
+
+
+def _words(segments: List[Dict[str, Any]]) -> List[str]:
+    words = []
+    for seg in segments:
+        words.extend(w.strip(".,!?;:\"'").lower() for w in seg.get("original_text", "").split())
+    return [w for w in words if w]
+
+
+def text_change(draft: List[Dict[str, Any]], refined: List[Dict[str, Any]]) -> float:
+    """Fraction of the word sequence that differs (0.0 identical, 1.0 disjoint)."""
+    a, b = _words(draft), _words(refined)
+    if not a and not b:
+        return 0.0
+    return 1.0 - SequenceMatcher(None, a, b, autojunk=False).ratio()
+
+
+def speakers(segments: List[Dict[str, Any]]) -> set:
+    return {seg.get("speaker_id") for seg in segments}
+
+
+def diarized(segments: List[Dict[str, Any]]) -> bool:
+    return any(seg.get("speaker_id") not in (None, DRAFT_SPEAKER_ID) for seg in segments)
+
+
+def material_change(draft: List[Dict[str, Any]], refined: List[Dict[str, Any]], threshold: float) -> bool:
+    if diarized(draft) != diarized(refined):
+        return True
+    if diarized(draft) and speakers(draft) != speakers(refined):
+        return True
+    return text_change(draft, refined) > threshold
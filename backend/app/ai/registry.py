@@ -0,0 +1,164 @@
+"""Process-resident model registry for the speech pipeline.
+
+Loading WhisperX, the wav2vec2 alignment models and the pyannote pipeline
+costs seconds (and GBs of allocation) per call. The registry keeps them
+resident for the lifetime of the worker process so repeated tasks only pay
+the load once.
+
+ASR and diarization models are few and always reused, so they are kept
+indefinitely. Alignment models are one per language and can add up, so they
+are held in an LRU bounded by `settings.ALIGN_MODEL_CACHE_MB`.
+
+Loads are serialized per model, not registry-wide, so a background prefetch
+of one model (e.g. the alignment model for a freshly detected language) never
+blocks lookups of models that are already resident.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from app.core.config import settings
+
+
+def _module_size_bytes(model: Any) -> int:
+    """Best-effort parameter + buffer footprint of a torch module."""
+    size = 0
+    try:
+        for p in model.parameters():
+            size += p.numel() * p.element_size()
+        for b in model.buffers():
+            size += b.numel() * b.element_size()
+    except Exception:
+        return 0
+    return size
+
+
+class ModelRegistry:
+    """Thread-safe cache of loaded models with hit/miss/load-time counters."""
+
+    def __init__(self, align_budget_bytes: int):
+        self.align_budget_bytes = align_budget_bytes
+        self._lock = threading.RLock()
+        self._resident: Dict[Tuple[str, Hashable], Any] = {}
+        self._align: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._align_bytes = 0
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._load_locks: Dict[Tuple[str, Hashable], threading.Lock] = {}
+
+    def _counter(self, kind: str) -> Dict[str, float]:
+        return self._stats.setdefault(kind, {"hits": 0, "misses": 0, "load_seconds": 0.0, "evictions": 0})
+
+    def _load(self, kind: str, loader: Callable[[], Any]) -> Any:
+        started = time.perf_counter()
+        value = loader()
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            c = self._counter(kind)
+            c["misses"] += 1
+            c["load_seconds"] += elapsed
+        print(f"DEBUG: Loaded {kind} model in {elapsed:.2f}s")
+        return value
+
+    def _load_lock(self, kind: str, key: Hashable) -> threading.Lock:
+        with self._lock:
+            return self._load_locks.setdefault((kind, key), threading.Lock())
+
+    def _lookup(self, kind: str, key: Hashable) -> Tuple[bool, Any]:
+        with self._lock:
+            if kind == "align":
+                if key in self._align:
+                    self._align.move_to_end(key)
+                    self._counter(kind)["hits"] += 1
+                    return True, self._align[key][0]
+            elif (kind, key) in self._resident:
+                self._counter(kind)["hits"] += 1
+                return True, self._resident[(kind, key)]
+            return False, None
+
+    def get_or_load(self, kind: str, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the resident model for (kind, key), loading it on first use."""
+        found, value = self._lookup(kind, key)
+        if found:
+            return value
+        with self._load_lock(kind, key):
+            found, value = self._lookup(kind, key)
+            if found:
+                return value
+            value = self._load(kind, loader)
+            with self._lock:
+                self._resident[(kind, key)] = value
+            return value
+
+    def get_or_load_lru(self, key: Hashable, loader: Callable[[], Any], size_fn: Callable[[Any], int]) -> Any:
+        """Alignment models: LRU-evicted once their footprint exceeds the budget.
+
+        The most recently used entry is never evicted, so a single model larger
+        than the budget still stays resident.
+        """
+        kind = "align"
+        found, value = self._lookup(kind, key)
+        if found:
+            return value
+        with self._load_lock(kind, key):
+            found, value = self._lookup(kind, key)
+            if found:
+                return value
+            value = self._load(kind, loader)
+            size = size_fn(value)
+            return self._insert_align(key, value, size)
+
+    def _insert_align(self, key: Hashable, value: Any, size: int) -> Any:
+        kind = "align"
+        with self._lock:
+            self._align[key] = (value, size)
+            self._align_bytes += size
+            while self._align_bytes > self.align_budget_bytes and len(self._align) > 1:
+                old_key, (_, old_size) = self._align.popitem(last=False)
+                self._align_bytes -= old_size
+                self._counter(kind)["evictions"] += 1
+                print(f"DEBUG: Evicted alignment model {old_key} ({old_size / 1e6:.0f} MB)")
+            return value
+
+    def asr_model(self, name: str, device: str, compute_type: str, language: Optional[str] = None):
+        import whisperx
+        return self.get_or_load(
+            "asr",
+            (name, device, compute_type, language),
+            lambda: whisperx.load_model(name, device, compute_type=compute_type, language=language),
+        )
+
+    def align_model(self, language: str, device: str):
+        """Return `(model_a, metadata)` for `language`."""
+        import whisperx
+        return self.get_or_load_lru(
+            (language, device),
+            lambda: whisperx.load_align_model(language_code=language, device=device),
+            lambda loaded: _module_size_bytes(loaded[0]),
+        )
+
+    def diarize_model(self, device: str):
+        import whisperx
+        return self.get_or_load(
+            "diarize",
+            (device,),
+            lambda: whisperx.DiarizationPipeline(use_auth_token=settings.HF_TOKEN, device=device),
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "models": {kind: dict(c) for kind, c in self._stats.items()},
+                "resident": len(self._resident) + len(self._align),
+                "align_bytes": self._align_bytes,
+                "align_budget_bytes": self.align_budget_bytes,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._resident.clear()
+            self._align.clear()
+            self._align_bytes = 0
+
+
+registry = ModelRegistry(align_budget_bytes=settings.ALIGN_MODEL_CACHE_MB * 1024 * 1024)
@@ -0,0 +1,69 @@
+"""Merge fragmented ASR segments.
+
+WhisperX often emits many short segments in a row from the same speaker, and
+every later layer (normalization, intent classification, translation, email
+rendering) costs per segment. `merge_segments` joins adjacent segments of
+the same speaker when the pause between them is at most `max_gap` seconds,
+without letting a merged segment grow past `max_seconds` or `max_chars`.
+
+Break points are computed over NumPy arrays of start/end times, speaker codes
+and text lengths; Python only touches each output segment once to join its
+text. Every merged segment keeps the `[start_time, end_time]` of each segment
+it was built from in `source_spans`. Those times are stored with the merged
+segment, so evidence can be traced back to the original ASR segments (the
+extractor identifies a segment by its start time) and to the audio.
+`group_of` maps each input segment to its merged index, which is how word
+timings are re-pointed at the merged segments.
+"""
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+
+def merge_groups(starts: np.ndarray, ends: np.ndarray, speakers: np.ndarray, lengths: np.ndarray,
+                 max_gap: float, max_seconds: float, max_chars: int) -> np.ndarray:
+    """Group id per segment; segments sharing an id are merged."""
+    n = len(starts)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    breaks = np.ones(n, dtype=bool)
+    breaks[1:] = (speakers[1:] != speakers[:-1]) | (starts[1:] - ends[:-1] > max_gap)
+    run = np.cumsum(breaks) - 1
+    run_first = np.flatnonzero(breaks)[run]
+
+    # Within a run, split wherever elapsed time or accumulated text crosses another multiple
+    # of the limit. Merged segments stay within one source segment of the limits.
+    elapsed = ends - starts[run_first]
+    chars = np.cumsum(lengths + 1)
+    chars_in_run = chars - (chars[run_first] - lengths[run_first] - 1)
+    bucket = (np.floor_divide(elapsed, max_seconds).astype(np.int64) * (int(chars_in_run.max()) // max_chars + 1)
+              + chars_in_run // max_chars)
+    breaks[1:] |= bucket[1:] != bucket[:-1]
+    return np.cumsum(breaks) - 1
+
+
+def merge_segments(segments: List[Dict[str, Any]], max_gap: float = 1.0, max_seconds: float = 30.0,
+                   max_chars: int = 500) -> Tuple[List[Dict[str, Any]], np.ndarray]:
+    """`(merged_segments, group_of)` where `group_of[i]` is the merged index of input segment `i`."""
+    if not segments:
+        return [], np.zeros(0, dtype=np.int64)
+    starts = np.fromiter((s["start_time"] for s in segments), dtype=np.float64, count=len(segments))
+    ends = np.fromiter((s["end_time"] for s in segments), dtype=np.float64, count=len(segments))
+    texts = [s.get("original_text", "") for s in segments]
+    lengths = np.fromiter((len(t) for t in texts), dtype=np.int64, count=len(segments))
+    _, speakers = np.unique([str(s.get("speaker_id")) for s in segments], return_inverse=True)
+
+    group_of = merge_groups(starts, ends, speakers, lengths, max_gap, max_seconds, max_chars)
+    bounds = np.flatnonzero(np.diff(group_of)) + 1
+    firsts = np.concatenate(([0], bounds))
+    lasts = np.concatenate((bounds, [len(segments)])) - 1
+
+    spans = np.stack((starts, ends), axis=1).tolist()
+    merged = []
+    for first, last in zip(firsts.tolist(), lasts.tolist()):
+        seg = dict(segments[first])
+        seg["end_time"] = segments[last]["end_time"]
+        seg["original_text"] = " ".join(t for t in texts[first:last + 1] if t)
+        seg["source_spans"] = spans[first:last + 1]
+        merged.append(seg)
+    return merged, group_of
@@ -0,0 +1,153 @@
+"""Rolling-window ASR for live recordings.
+
+Audio arrives in small frames. Every `LIVE_STEP_SECONDS` of new audio the
+uncommitted tail (at most `LIVE_WINDOW_SECONDS`) is re-transcribed with a
+small model:
+
+- segments that end more than `LIVE_HOLDBACK_SECONDS` before the tail are
+  *final*: they are emitted once and the window start moves past them,
+- the rest are *interim* and will be revised by the next pass.
+
+If passes fall behind and the uncommitted audio outgrows the window, the
+overflow is transcribed once and emitted as final before the window moves on,
+so no speech is skipped. When the stream ends everything left is finalized.
+
+Only the uncommitted audio is kept: samples before the window start are
+dropped at the next pass and `_offset` keeps timestamps absolute, so a pass
+costs O(window) however long the session runs.
+
+WhisperX pipelines are not safe to call from several threads at once, so each
+pass borrows one of up to `LIVE_ASR_REPLICAS` model copies; sessions only wait
+for each other when all copies are busy.
+"""
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.ai.registry import registry
+from app.ai.audio import SAMPLE_RATE
+
+class _ReplicaPool:
+    """Live ASR model copies, each used by one thread at a time."""
+
+    def __init__(self):
+        self._free: "queue.Queue[int]" = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def model(self, device: str, compute_type: str) -> Iterator[Any]:
+        try:
+            replica = self._free.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                replica = self._created if self._created < max(1, settings.LIVE_ASR_REPLICAS) else None
+                if replica is not None:
+                    self._created += 1
+            if replica is None:
+                replica = self._free.get()
+        try:
+            yield registry.get_or_load(
+                "asr",
+                (settings.LIVE_WHISPER_MODEL, device, compute_type, None, "live", replica),
+                lambda: _load_live_model(device, compute_type),
+            )
+        finally:
+            self._free.put(replica)
+
+
+def _load_live_model(device: str, compute_type: str):
+    import whisperx
+    return whisperx.load_model(settings.LIVE_WHISPER_MODEL, device, compute_type=compute_type)
+
+
+_replicas = _ReplicaPool()
+
+
+class StreamingTranscriber:
+    def __init__(self, device: str, compute_type: str):
+        self.device = device
+        self.compute_type = compute_type
+        self.language = None
+        self._chunks: List[np.ndarray] = []
+        self._audio = np.zeros(0, dtype=np.float32)  # samples from `_offset` on
+        self._offset = 0         # absolute sample index of `_audio[0]`
+        self._committed = 0      # sample index everything before which is final
+        self._processed = 0      # total samples seen at the last pass
+        self.final_segments: List[Dict[str, Any]] = []
+
+    def _window(self) -> np.ndarray:
+        """Audio from `_committed` on, with new frames appended; earlier samples are dropped."""
+        drop = self._committed - self._offset
+        if drop or self._chunks:
+            self._audio = np.concatenate([self._audio[drop:], *self._chunks])
+            self._chunks = []
+            self._offset = self._committed
+        return self._audio
+
+    def feed(self, pcm: np.ndarray) -> None:
+        if len(pcm):
+            self._chunks.append(pcm)
+
+    def ready(self) -> bool:
+        total = self._offset + len(self._audio) + sum(len(c) for c in self._chunks)
+        return total - self._processed >= settings.LIVE_STEP_SECONDS * SAMPLE_RATE
+
+    def _transcribe(self, audio: np.ndarray) -> List[Dict[str, Any]]:
+        with _replicas.model(self.device, self.compute_type) as model:
+            result = model.transcribe(audio, batch_size=4, language=self.language)
+        if self.language is None:
+            self.language = result.get("language")
+        return result["segments"]
+
+    def process(self, final: bool = False) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Run one pass; returns `(newly_final, interim)` segments in absolute time."""
+        audio = self._window()
+        total = self._offset + len(audio)
+        self._processed = total
+        window = int(settings.LIVE_WINDOW_SECONDS * SAMPLE_RATE)
+        overflow = []
+        if not final and total - self._committed > window:
+            # never let the window grow unbounded, but finalize the oldest audio rather than skip it
+            cut = total - window
+            overflow = self._segments(audio, self._committed, cut)
+            self.final_segments.extend(overflow)
+            self._committed = cut
+        if total - self._committed < SAMPLE_RATE // 2:
+            return overflow, []
+
+        horizon = total / SAMPLE_RATE - (0 if final else settings.LIVE_HOLDBACK_SECONDS)
+        newly_final, interim = [], []
+        for item in self._segments(audio, self._committed, total):
+            if item["end_time"] <= horizon and not interim:
+                newly_final.append(item)
+            else:
+                interim.append(item)
+
+        if newly_final:
+            self.final_segments.extend(newly_final)
+            self._committed = min(total, int(newly_final[-1]["end_time"] * SAMPLE_RATE))
+        return overflow + newly_final, interim
+
+    def _segments(self, audio: np.ndarray, start: int, end: int) -> List[Dict[str, Any]]:
+        """Non-empty segments between absolute samples `start` and `end` of the window `audio`, in absolute time."""
+        offset = start / SAMPLE_RATE
+        items = []
+        for seg in self._transcribe(audio[start - self._offset:end - self._offset]):
+            text = seg["text"].strip()
+            if text:
+                items.append({
+                    "speaker_id": "UNKNOWN",
+                    "start_time": round(offset + seg["start"], 3),
+                    "end_time": round(offset + seg["end"], 3),
+                    "original_text": text,
+                })
+        return items
+
+    def finish(self) -> List[Dict[str, Any]]:
+        self.process(final=True)
+        return self.final_segments
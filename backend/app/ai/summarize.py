@@ -1,15 +1,17 @@
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from app.ai import extract
 from app.core.config import settings
 
-def summarize_from_segments(segments: List[Dict[str, Any]], length: str = "short", tone: str = "formal") -> Dict[str, Any]:
+def summarize_from_segments(segments: List[Dict[str, Any]], length: str = "short", tone: str = "formal",
+                            extraction: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Return structured summary dict by first extracting validated facts.
     Ensures 'Never generate summaries directly from raw transcripts'.
+    Pass `extraction` (an `extract_from_segments` result, e.g. from persisted facts) to skip re-extracting.
     """
     # 1. Run the 5-Layer Accuracy Extraction
-    extraction_res = extract.extract_from_segments(segments)
+    extraction_res = extraction if extraction is not None else extract.extract_from_segments(segments)
     
     # 2. Derive summary specifically from these facts
     actions = extraction_res.get("actions", [])
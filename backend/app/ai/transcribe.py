@@ -1,67 +1,231 @@
-import io
-import os
-import tempfile
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Callable, List, Dict, Any, Optional, Union
+import numpy as np
 import torch
 import whisperx
 from app.core.config import settings
+from app.ai.registry import registry
+from app.ai import audio as audio_io
+from app.ai import chunking
+from app.ai import policy
+from app.ai import word_timings
+from app.ai.segments import merge_segments
+from app.ai.pcm_cache import cache as pcm_cache
 
-def transcribe_bytes_to_segments(data: bytes) -> Dict[str, Any]:
+BATCH_SIZE = 16 # adjust as needed
+SINGLE_SPEAKER_ID = "SPEAKER_00"
+LANGUAGE_ID_SECONDS = 30  # one Whisper window
+
+ProgressCallback = Callable[[List[Dict[str, Any]], float], None]
+
+
+def get_device() -> str:
+    return "cuda" if settings.USE_GPU and torch.cuda.is_available() else "cpu"
+
+
+def get_compute_type(device: str) -> str:
+    return "float16" if device == "cuda" else "int8"
+
+
+def select_model(audio, device: str, quality: Optional[str] = None, backlog: int = 0, tier: Optional[str] = None,
+                 language: Optional[str] = None) -> policy.ModelChoice:
+    if tier:
+        return policy.fixed_model(tier, device, language=language)
+    return policy.choose_model(len(audio) / audio_io.SAMPLE_RATE, device, backlog=backlog, quality=quality, language=language)
+
+
+def load_audio_bytes(data: Union[bytes, BinaryIO, np.ndarray], cache_key: Optional[str] = None):
+    """Decode audio bytes (or a stream) to the 16 kHz mono float32 array WhisperX expects.
+
+    Already-decoded arrays (e.g. a PCM cache hit) pass straight through; with
+    a `cache_key` the decode result is memory-mapped from the PCM cache.
     """
-    Transcribe audio bytes using WhisperX and pyannote.audio for diarization.
+    if isinstance(data, np.ndarray):
+        return data
+    return pcm_cache.get_or_decode(cache_key, lambda: audio_io.decode_audio(data))
+
+
+# --- Pipeline stages (also driven individually by app.ai.inference_server) ---
+
+def _partial_segments(segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Raw ASR segments in transcript format (not yet aligned or diarized)."""
+    return [{
+        "speaker_id": "UNKNOWN",
+        "start_time": seg["start"],
+        "end_time": seg["end"],
+        "original_text": seg["text"].strip()
+    } for seg in segments]
+
+
+def detect_language(audio, device: str) -> str:
+    """Language ID over the first 30 seconds with the small multilingual `LANGUAGE_ID_MODEL`."""
+    model = registry.asr_model(settings.LANGUAGE_ID_MODEL, device, get_compute_type(device))
+    language = model.detect_language(audio[: LANGUAGE_ID_SECONDS * audio_io.SAMPLE_RATE])
+    print(f"DEBUG: Detected language '{language}' from the first {LANGUAGE_ID_SECONDS}s")
+    return language
+
+
+def prefetch_alignment(language: str, device: str) -> None:
+    try:
+        registry.align_model(language, device)
+    except Exception as e:
+        # run_alignment will surface the error (or succeed on retry)
+        print(f"WARNING: Alignment model prefetch for '{language}' failed: {e}")
+
+
+def run_asr(audio, device: str, on_segments: Optional[ProgressCallback] = None,
+            model_name: Optional[str] = None, compute_type: Optional[str] = None,
+            language: Optional[str] = None) -> Dict[str, Any]:
+    """WhisperX ASR. `on_segments(partial_segments, progress)` receives results as they are produced.
+
+    Passing the pre-detected `language` skips WhisperX's own detection.
     """
-    device = "cuda" if settings.USE_GPU and torch.cuda.is_available() else "cpu"
-    batch_size = 16 # adjust as needed
-    compute_type = "float16" if device == "cuda" else "int8"
+    model_name = model_name or settings.WHISPER_MODEL
+    compute_type = compute_type or get_compute_type(device)
+    print(f"DEBUG: Transcribing with WhisperX ({model_name}, {compute_type}) on {device}...")
+    emit = (lambda segs, progress: on_segments(_partial_segments(segs), progress)) if on_segments else None
+    if chunking.should_chunk(audio, device):
+        return chunking.transcribe_chunked(audio, model_name, device, compute_type, BATCH_SIZE, on_segments=emit, language=language)
+    if emit and settings.PROGRESSIVE_ASR and len(audio) / audio_io.SAMPLE_RATE > 1.5 * settings.PROGRESSIVE_CHUNK_SECONDS:
+        # opt-in: sequential short chunks so partial segments appear while the job runs, at the cost of batching
+        return chunking.transcribe_chunked(audio, model_name, device, compute_type, BATCH_SIZE,
+                                           chunk_seconds=settings.PROGRESSIVE_CHUNK_SECONDS, workers=1, on_segments=emit,
+                                           language=language)
+    model = registry.asr_model(model_name, device, compute_type)
+    result = model.transcribe(audio, batch_size=BATCH_SIZE, language=language)
+    if emit:
+        emit(result["segments"], 1.0)
+    return result
+
+
+def run_alignment(segments: List[Dict[str, Any]], language: str, audio, device: str) -> Dict[str, Any]:
+    print("DEBUG: Aligning transcription...")
+    model_a, metadata = registry.align_model(language, device)
+    return whisperx.align(segments, model_a, metadata, audio, device, return_char_alignments=False)
+
 
-    # Save bytes to a temporary file since whisperx/ffmpeg usually needs a file path
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-        tmp.write(data)
-        tmp_path = tmp.name
+def run_diarization(audio, device: str):
+    """`(diarize_segments, speaker_embeddings)`; embeddings feed `app.ai.voiceprints`."""
+    print("DEBUG: Running speaker diarization...")
+    if not settings.HF_TOKEN:
+        print("WARNING: HF_TOKEN is missing. Diarization might fail if using gated models.")
+    diarize_model = registry.diarize_model(device)
+    return diarize_model(audio, return_embeddings=True)
 
+
+def assign_speakers(diarization, aligned: Dict[str, Any], language: str) -> Dict[str, Any]:
+    """Join point of ASR and diarization. `diarization=None` means a single known speaker."""
+    speaker_embeddings = None
+    if diarization is not None:
+        print("DEBUG: Assigning speaker labels...")
+        diarize_segments, speaker_embeddings = diarization
+        result = whisperx.assign_word_speakers(diarize_segments, aligned)
+        default_speaker = "UNKNOWN"
+    else:
+        result = aligned
+        default_speaker = SINGLE_SPEAKER_ID
+
+    words = word_timings.from_segments(result["segments"], default_speaker)
+    segments = []
+    for seg in result["segments"]:
+        segments.append({
+            "speaker_id": seg.get("speaker", default_speaker),
+            "start_time": seg["start"],
+            "end_time": seg["end"],
+            "original_text": seg["text"].strip()
+        })
+
+    if settings.SEGMENT_MERGE_ENABLED:
+        merged, group_of = merge_segments(segments, max_gap=settings.SEGMENT_MERGE_MAX_GAP,
+                                          max_seconds=settings.SEGMENT_MERGE_MAX_SECONDS, max_chars=settings.SEGMENT_MERGE_MAX_CHARS)
+        print(f"DEBUG: Merged {len(segments)} segments into {len(merged)}")
+        if len(words.start):
+            words = words._replace(segment=group_of[words.segment].astype(np.uint32))
+        segments = merged
+
+    print(f"DEBUG: Pipeline completed. Found {len(segments)} segments. Model registry: {registry.stats()['models']}")
+    return {
+        "segments": segments,
+        "detected_language": language,
+        "word_timings": word_timings.encode(words) if len(words.start) else None,
+        "speaker_embeddings": speaker_embeddings,
+    }
+
+
+def transcribe_local(data: Union[bytes, BinaryIO], on_segments: Optional[ProgressCallback] = None, diarize: bool = True,
+                     quality: Optional[str] = None, backlog: int = 0, tier: Optional[str] = None,
+                     on_language: Optional[Callable[[str], None]] = None, cache_key: Optional[str] = None) -> Dict[str, Any]:
+    """Run the full WhisperX + pyannote pipeline in this process.
+
+    Diarization only needs the raw audio, so it runs on a side thread while
+    ASR and alignment proceed; `assign_speakers` is the join point.
+
+    The language is identified up front from the first 30 seconds: it picks
+    the (possibly English-only) ASR model, lets the alignment model load on a
+    side thread during ASR, and is reported through `on_language` early.
+    """
+    device = get_device()
     try:
-        # 1. Transcribe with WhisperX
-        print(f"DEBUG: Transcribing with WhisperX ({settings.WHISPER_MODEL}) on {device}...")
-        model = whisperx.load_model(settings.WHISPER_MODEL, device, compute_type=compute_type)
-        audio = whisperx.load_audio(tmp_path)
-        result = model.transcribe(audio, batch_size=batch_size)
-        
-        # 2. Align whisper output
-        print("DEBUG: Aligning transcription...")
-        model_a, metadata = whisperx.load_align_model(language_code=result["language"], device=device)
-        result = whisperx.align(result["segments"], model_a, metadata, audio, device, return_char_alignments=False)
-        
-        # 3. Diarization with pyannote.audio
-        print("DEBUG: Running speaker diarization...")
-        if not settings.HF_TOKEN:
-            print("WARNING: HF_TOKEN is missing. Diarization might fail if using gated models.")
-        
-        diarize_model = whisperx.DiarizationPipeline(use_auth_token=settings.HF_TOKEN, device=device)
-        diarize_segments = diarize_model(audio)
-        
+        audio = load_audio_bytes(data, cache_key=cache_key)
+
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="transcribe-side") as side:
+            # 3. Diarization with pyannote.audio (concurrently with 0-2)
+            diarize_future = side.submit(run_diarization, audio, device) if diarize else None
+
+            # 0. Language ID pre-pass; start loading the alignment model right away
+            detected = detect_language(audio, device)
+            side.submit(prefetch_alignment, detected, device)
+            if on_language:
+                on_language(detected)
+            choice = select_model(audio, device, quality=quality, backlog=backlog, tier=tier, language=detected)
+
+            # 1. Transcribe with WhisperX
+            result = run_asr(audio, device, on_segments=on_segments, model_name=choice.model_name,
+                             compute_type=choice.compute_type, language=detected)
+            language = result["language"]
+
+            # 2. Align whisper output
+            aligned = run_alignment(result["segments"], language, audio, device)
+
+            diarization = diarize_future.result() if diarize_future else None
+
         # 4. Assign speaker labels to transcription segments
-        print("DEBUG: Assigning speaker labels...")
-        result = whisperx.assign_word_speakers(diarize_segments, result)
-
-        segments = []
-        for seg in result["segments"]:
-            segments.append({
-                "speaker_id": seg.get("speaker", "UNKNOWN"),
-                "start_time": seg["start"],
-                "end_time": seg["end"],
-                "original_text": seg["text"].strip()
-            })
-
-        print(f"DEBUG: Pipeline completed. Found {len(segments)} segments.")
-        return {
-            "segments": segments,
-            "detected_language": result["language"]
-        }
+        output = assign_speakers(diarization, aligned, language)
+        output["model_tier"] = choice.tier
+        return output
 
     except Exception as e:
         print(f"ERROR: Transcription pipeline failed: {str(e)}")
         raise RuntimeError(f"Transcription failed: {str(e)}")
-    finally:
-        # Cleanup temp file
-        if os.path.exists(tmp_path):
-            os.remove(tmp_path)
+
+
+def transcribe_bytes_to_segments(data: Union[bytes, BinaryIO, np.ndarray], on_segments: Optional[ProgressCallback] = None, diarize: bool = True,
+                                 quality: Optional[str] = None, backlog: int = 0, tier: Optional[str] = None,
+                                 on_language: Optional[Callable[[str], None]] = None, cache_key: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Transcribe audio bytes using WhisperX and pyannote.audio for diarization.
+
+    `data` may also be a readable stream (see `storage.open_stream`), which is
+    piped into the decoder without buffering the whole file, or an already
+    decoded array. `cache_key` stores the decoded PCM in the node-local cache
+    (see `app.ai.pcm_cache`).
+
+    `on_segments(partial_segments, progress)` is called with unaligned,
+    undiarized segments as ASR progresses (local pipeline only).
+    `diarize=False` skips pyannote for meetings flagged single-speaker.
+    `quality` (the organization's setting) and `backlog` (queued jobs) feed
+    the model-tier policy in `app.ai.policy`; `tier` bypasses it. The tier
+    used is returned as `model_tier`; aligned word times come back packed under
+    `word_timings` (see `app.ai.word_timings`), and one embedding per
+    speaker label under `speaker_embeddings`. `on_language(code)` is called as soon
+    as the language-ID pre-pass has run (local pipeline only).
+
+    When `INFERENCE_SERVER_URL` is configured the work is sent to the node-local
+    inference server (see `app.ai.inference_server`) instead of loading models
+    in this process.
+    """
+    if settings.INFERENCE_SERVER_URL:
+        from app.ai import inference_server
+        return inference_server.transcribe_remote(data, diarize=diarize, quality=quality, backlog=backlog, tier=tier)
+    return transcribe_local(data, on_segments=on_segments, diarize=diarize, quality=quality, backlog=backlog, tier=tier,
+                            on_language=on_language, cache_key=cache_key)
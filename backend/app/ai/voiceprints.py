@@ -0,0 +1,153 @@
+"""Speaker voiceprints: map diarization labels to known people.
+
+Diarization labels (`SPEAKER_00`, ...) are only meaningful within one
+recording. pyannote also returns one embedding per label; each is kept as a
+`SpeakerVoiceprint` of the transcript it came from, for
+`VOICEPRINT_UNENROLLED_HOURS`. Once an organization member names a speaker
+on a transcript (`POST /transcripts/{id}/speakers/{speaker_id}`) that
+voiceprint is *enrolled* and kept; the others are deleted. Speakers in later
+meetings of the same organization are labelled with the nearest enrolled
+voiceprint when the cosine similarity clears `VOICEPRINT_MATCH_THRESHOLD`.
+
+Embeddings are L2-normalized float32, so similarity is a dot product. Each
+worker keeps one `VoiceprintIndex` per organization: a brute-force matrix
+product (a few ms at tens of thousands of 256-d voiceprints), or an HNSW
+graph when `hnswlib` is installed and the organization has at least
+`VOICEPRINT_ANN_MIN` voiceprints. Indexes are rebuilt when the enrolled set
+changes.
+"""
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+try:
+    import hnswlib
+    _HAS_HNSW = True
+except Exception:
+    hnswlib = None
+    _HAS_HNSW = False
+
+
+def normalize(vector: Sequence[float]) -> np.ndarray:
+    v = np.asarray(vector, dtype=np.float32).ravel()
+    norm = np.linalg.norm(v)
+    return v / norm if norm > 0 else v
+
+
+def to_blob(vector: Sequence[float]) -> bytes:
+    return normalize(vector).astype("<f4").tobytes()
+
+
+def from_blob(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype="<f4")
+
+
+class VoiceprintIndex:
+    """Nearest-neighbour lookup over one organization's enrolled voiceprints."""
+
+    def __init__(self, ids: Sequence[int], vectors: np.ndarray, ann_min: Optional[int] = None):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32).reshape(len(self.ids), -1) if len(self.ids) else np.zeros((0, 0), dtype=np.float32)
+        self._hnsw = None
+        ann_min = settings.VOICEPRINT_ANN_MIN if ann_min is None else ann_min
+        if _HAS_HNSW and len(self.ids) >= ann_min:
+            self._hnsw = hnswlib.Index(space="ip", dim=self.vectors.shape[1])
+            self._hnsw.init_index(max_elements=len(self.ids), ef_construction=200, M=16)
+            self._hnsw.add_items(self.vectors, np.arange(len(self.ids)))
+            self._hnsw.set_ef(64)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def search(self, queries: np.ndarray, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """`(ids, similarities)`, each of shape `(len(queries), k)`, best first."""
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        k = min(k, len(self.ids))
+        if not k:
+            return np.zeros((len(queries), 0), dtype=np.int64), np.zeros((len(queries), 0), dtype=np.float32)
+        if self._hnsw is not None:
+            rows, distances = self._hnsw.knn_query(queries, k=k)
+            return self.ids[rows], 1.0 - distances  # hnswlib "ip" distance is 1 - dot
+        scores = queries @ self.vectors.T
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k] if k < scores.shape[1] else np.tile(np.arange(k), (len(queries), 1))
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        return self.ids[np.take_along_axis(top, order, axis=1)], np.take_along_axis(top_scores, order, axis=1)
+
+
+def assign(index: VoiceprintIndex, embeddings: Dict[str, Sequence[float]], identity_of: Dict[int, Any],
+           threshold: float, k: int = 5) -> Dict[str, int]:
+    """Label -> voiceprint id for the speakers that match someone enrolled.
+
+    Candidates are taken greedily by similarity so two speakers of the same
+    meeting are never given the same identity.
+    """
+    labels = [label for label, vec in embeddings.items() if vec is not None]
+    if not labels or not len(index):
+        return {}
+    ids, sims = index.search(np.stack([normalize(embeddings[label]) for label in labels]), k=k)
+    candidates = sorted(
+        ((float(sims[i, j]), labels[i], int(ids[i, j])) for i in range(len(labels)) for j in range(ids.shape[1])),
+        reverse=True,
+    )
+    matched: Dict[str, int] = {}
+    taken = set()
+    for sim, label, vp_id in candidates:
+        if sim < threshold:
+            break
+        who = identity_of[vp_id]
+        if label in matched or who in taken:
+            continue
+        matched[label] = vp_id
+        taken.add(who)
+    return matched
+
+
+def identity(vp) -> Any:
+    """What makes two voiceprints the same person."""
+    return vp.user_id or vp.email or vp.display_name
+
+
+def label_segments(segments: List[Dict[str, Any]], names: Dict[str, Dict[str, Any]]) -> int:
+    """Set `speaker_name` / `speaker_user_id` on segments whose label is in `names`; returns segments touched."""
+    touched = 0
+    for seg in segments:
+        person = names.get(seg.get("speaker_id"))
+        if person:
+            seg["speaker_name"] = person.get("display_name")
+            seg["speaker_user_id"] = person.get("user_id")
+            touched += 1
+    return touched
+
+
+_indexes: Dict[int, Tuple[Tuple[Any, ...], VoiceprintIndex, Dict[int, Any]]] = {}
+_indexes_lock = threading.Lock()
+
+
+def org_index(db, organization_id: int) -> Tuple[VoiceprintIndex, Dict[int, Any]]:
+    """Cached index of an organization's enrolled voiceprints plus `id -> identity` (sync session)."""
+    from sqlalchemy import func
+    from app.models.models import SpeakerVoiceprint
+
+    enrolled = db.query(SpeakerVoiceprint).filter(
+        SpeakerVoiceprint.organization_id == organization_id,
+        SpeakerVoiceprint.enrolled_at.isnot(None),
+    )
+    # enrolling or renaming bumps enrolled_at, so this changes whenever the index would
+    version = tuple(enrolled.with_entities(func.count(SpeakerVoiceprint.id), func.max(SpeakerVoiceprint.enrolled_at)).one())
+    with _indexes_lock:
+        cached = _indexes.get(organization_id)
+    if cached and cached[0] == version:
+        return cached[1], cached[2]
+
+    rows = enrolled.with_entities(SpeakerVoiceprint.id, SpeakerVoiceprint.embedding, SpeakerVoiceprint.user_id,
+                                  SpeakerVoiceprint.email, SpeakerVoiceprint.display_name).all()
+    vectors = np.stack([from_blob(r.embedding) for r in rows]) if rows else np.zeros((0, 0), dtype=np.float32)
+    index = VoiceprintIndex([r.id for r in rows], vectors)
+    identity_of = {r.id: identity(r) for r in rows}
+    with _indexes_lock:
+        _indexes[organization_id] = (version, index, identity_of)
+    return index, identity_of
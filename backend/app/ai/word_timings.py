@@ -0,0 +1,154 @@
+"""Compact word-level timestamps.
+
+WhisperX alignment yields per-word start/end times that the segment JSON has
+no room for (repeating `{"word": ..., "start": ..., "end": ...}` per word
+would grow it several times over). Words are instead stored as parallel
+arrays plus an interned string table, in `Transcript.word_timings`.
+
+Blob layout (little-endian):
+
+    magic    4s   b"EWT1"
+    words    u32
+    strings  u32
+    text     u32  bytes of UTF-8 string data
+    start    f32 x words   seconds, ascending
+    end      f32 x words
+    word     u32 x words   index into the string table
+    speaker  u32 x words   index into the string table
+    segment  u32 x words   index of the segment the word belongs to
+    offsets  u32 x (strings + 1)
+    UTF-8 string data
+
+In pipeline results the blob travels base64-encoded under "word_timings", so
+results stay JSON (inference server, Modal).
+"""
+import base64
+import struct
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+
+MAGIC = b"EWT1"
+_HEADER = struct.Struct("<4sIII")
+
+
+class WordTimings(NamedTuple):
+    start: np.ndarray
+    end: np.ndarray
+    word: np.ndarray
+    speaker: np.ndarray
+    segment: np.ndarray
+    strings: List[str]
+
+
+def from_segments(segments: Iterable[Dict[str, Any]], default_speaker: str) -> WordTimings:
+    """Collect the `words` of aligned WhisperX segments.
+
+    Words alignment could not place (digits, symbols) have no times; they take
+    the previous word's end (or the segment start) so every word stays
+    addressable by time.
+    """
+    strings: List[str] = []
+    index: Dict[str, int] = {}
+
+    def intern(s: str) -> int:
+        if s not in index:
+            index[s] = len(strings)
+            strings.append(s)
+        return index[s]
+
+    start, end, word, speaker, segment = [], [], [], [], []
+    for seg_idx, seg in enumerate(segments):
+        seg_speaker = seg.get("speaker", default_speaker)
+        last = seg.get("start", 0.0)
+        for w in seg.get("words") or []:
+            text = (w.get("word") or "").strip()
+            if not text:
+                continue
+            ws = w.get("start", last)
+            we = w.get("end", ws)
+            start.append(ws)
+            end.append(we)
+            word.append(intern(text))
+            speaker.append(intern(w.get("speaker", seg_speaker)))
+            segment.append(seg_idx)
+            last = we
+
+    start_arr = np.asarray(start, dtype=np.float32)
+    order = np.argsort(start_arr, kind="stable")
+    return WordTimings(
+        start=start_arr[order],
+        end=np.asarray(end, dtype=np.float32)[order],
+        word=np.asarray(word, dtype=np.uint32)[order],
+        speaker=np.asarray(speaker, dtype=np.uint32)[order],
+        segment=np.asarray(segment, dtype=np.uint32)[order],
+        strings=strings,
+    )
+
+
+def pack(wt: WordTimings) -> bytes:
+    encoded = [s.encode("utf-8") for s in wt.strings]
+    offsets = np.zeros(len(encoded) + 1, dtype="<u4")
+    if encoded:
+        offsets[1:] = np.cumsum([len(b) for b in encoded])
+    text = b"".join(encoded)
+    return b"".join([
+        _HEADER.pack(MAGIC, len(wt.start), len(encoded), len(text)),
+        wt.start.astype("<f4").tobytes(),
+        wt.end.astype("<f4").tobytes(),
+        wt.word.astype("<u4").tobytes(),
+        wt.speaker.astype("<u4").tobytes(),
+        wt.segment.astype("<u4").tobytes(),
+        offsets.tobytes(),
+        text,
+    ])
+
+
+def unpack(blob: bytes) -> WordTimings:
+    magic, n, n_strings, n_text = _HEADER.unpack_from(blob, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a word timings blob")
+    offset = _HEADER.size
+
+    def take(dtype: str, count: int) -> np.ndarray:
+        nonlocal offset
+        arr = np.frombuffer(blob, dtype=dtype, count=count, offset=offset)
+        offset += arr.nbytes
+        return arr
+
+    start, end = take("<f4", n), take("<f4", n)
+    word, speaker, segment = take("<u4", n), take("<u4", n), take("<u4", n)
+    offsets = take("<u4", n_strings + 1)
+    text = blob[offset:offset + n_text]
+    strings = [text[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(n_strings)]
+    return WordTimings(start, end, word, speaker, segment, strings)
+
+
+def window(wt: WordTimings, start: Optional[float] = None, end: Optional[float] = None) -> List[Dict[str, Any]]:
+    """Words overlapping `[start, end)`, in time order."""
+    lo, hi = 0, len(wt.start)
+    if end is not None:
+        hi = int(np.searchsorted(wt.start, end, side="left"))
+    if start is not None and hi:
+        # ends are not sorted, but their running maximum is
+        lo = int(np.searchsorted(np.maximum.accumulate(wt.end[:hi]), start, side="right"))
+    idx = np.arange(lo, hi)
+    if start is not None:
+        idx = idx[wt.end[lo:hi] > start]
+    return [{
+        "word": wt.strings[wt.word[i]],
+        "start": round(float(wt.start[i]), 3),
+        "end": round(float(wt.end[i]), 3),
+        "speaker_id": wt.strings[wt.speaker[i]],
+        "segment": int(wt.segment[i]),
+    } for i in idx]
+
+
+def encode(wt: WordTimings) -> str:
+    return base64.b64encode(pack(wt)).decode("ascii")
+
+
+def decode_result(result: Dict[str, Any]) -> Optional[bytes]:
+    """Packed blob from a pipeline result, if it carried word timings."""
+    encoded = result.get("word_timings")
+    return base64.b64decode(encoded) if encoded else None
@@ -1,16 +1,25 @@
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Request, Response, status, WebSocket, WebSocketDisconnect
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import Optional
+import asyncio
+import hashlib
+import io
+import json
 import uuid
+import wave
+import zlib
 
 from app.db import get_db
 from app.schemas import AudioIngestRead, AudioIngestCreate
-from app.models.models import AudioFile, Meeting, UserOrganization, User
-from app.core.auth import get_current_user
+from app.models.models import AudioFile, Meeting, Transcript, UserOrganization, User
+from app.core.auth import get_current_user, user_from_token
+from app.core import crypto
 from app.storage import storage
-from app.tasks import enqueue_audio_processing, enqueue_transcription
+from app.tasks import enqueue_audio_processing, enqueue_transcription, enqueue_normalization, enqueue_summarization, enqueue_extraction
 from app.core.config import settings
+from app.ai.dedupe import HASH_CHUNK_SIZE
+from app.ai import ingest
 
 router = APIRouter(prefix="/audio", tags=["audio"])
 
@@ -29,12 +38,22 @@ async def upload_audio(file: UploadFile = File(...), meeting_id: Optional[int] =
                 if not q2.scalars().first():
                     raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of the organization")
 
-        # Read data first so we don't start DB transaction too early or hold it open during slow upload
+        # Read data first so we don't start DB transaction too early or hold it open during slow upload.
+        # Hash while reading so identical re-uploads can reuse existing transcripts.
         print(f"DEBUG: Processing upload for {file.filename} (content_type: {file.content_type})")
-        data = await file.read()
-        print(f"DEBUG: Read {len(data)} bytes from upload")
+        digest = hashlib.sha256()
+        size = 0
+        while True:
+            chunk = await file.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+            size += len(chunk)
+        await file.seek(0)
+        content_sha256 = digest.hexdigest()
+        print(f"DEBUG: Read {size} bytes from upload (sha256 {content_sha256[:12]})")
         
-        if len(data) == 0:
+        if size == 0:
             print(f"ERROR: Received 0-byte file: {file.filename}")
             raise HTTPException(status_code=422, detail="File is empty")
 
@@ -56,22 +75,24 @@ async def upload_audio(file: UploadFile = File(...), meeting_id: Optional[int] =
         # generate s3 key
         key = f"audio/{uuid.uuid4().hex}/{file.filename}"
         
-        # stream upload to storage
-        import io
-        buf = io.BytesIO(data)
+        # stream upload to storage from the spooled upload file
         try:
-            await storage.upload_fileobj(buf, key, content_type=file.content_type)
+            await storage.upload_fileobj(file.file, key, content_type=file.content_type)
         except Exception as se:
             print(f"ERROR: Storage upload failed: {str(se)}")
             raise HTTPException(status_code=500, detail=f"Failed to save file to storage: {str(se)}")
 
-        audio = AudioFile(meeting_id=meeting_id, s3_key=key, content_type=file.content_type, size_bytes=len(data), meta=metadata)
+        audio = AudioFile(meeting_id=meeting_id, s3_key=key, content_type=file.content_type, size_bytes=size, content_sha256=content_sha256, meta=metadata)
         db.add(audio)
         await db.commit()
         await db.refresh(audio)
 
-        # enqueue processing and transcription
-        enqueue_transcription(audio.id)
+        # normalize to the canonical master first; transcription follows from there
+        if settings.AUDIO_NORMALIZE:
+            enqueue_normalization(audio.id)
+        else:
+            enqueue_transcription(audio.id)
+            enqueue_audio_processing(audio.id)
 
         return audio
     except HTTPException:
@@ -85,6 +106,153 @@ async def upload_audio(file: UploadFile = File(...), meeting_id: Optional[int] =
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _pcm16_to_wav(pcm) -> bytes:
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(16000)
+        w.writeframes(pcm)
+    return buf.getvalue()
+
+
+@router.websocket("/live")
+async def live_transcription(websocket: WebSocket, token: str, meeting_id: Optional[int] = None, title: Optional[str] = None, format: str = "pcm16", db: AsyncSession = Depends(get_db)):
+    """Live transcription over a WebSocket.
+
+    Binary frames carry audio: 16 kHz mono s16le PCM (`format=pcm16`) or
+    MediaRecorder chunks (`format=webm` / `format=ogg`). Send the text message
+    `{"type": "stop"}` to finish. The server pushes `{"type": "interim"|"final",
+    "segments": [...]}` while recording and, once the audio and transcript are
+    persisted, `{"type": "done", "audio_id": ..., "transcript_id": ...}`.
+    """
+    import numpy as np
+    from app.ai import transcribe, streaming
+    from app.ai import audio as audio_io
+    from app.ai.dedupe import sha256_bytes
+
+    try:
+        current_user = await user_from_token(token, db)
+    except HTTPException:
+        await websocket.close(code=1008)
+        return
+    if meeting_id:
+        q = await db.execute(select(Meeting).filter_by(id=meeting_id))
+        meeting = q.scalars().first()
+        if not meeting:
+            await websocket.close(code=1008)
+            return
+        if meeting.organization_id:
+            q2 = await db.execute(select(UserOrganization).filter_by(user_id=current_user.id, organization_id=meeting.organization_id))
+            if not q2.scalars().first():
+                await websocket.close(code=1008)
+                return
+    if format not in ("pcm16", "webm", "ogg"):
+        await websocket.close(code=1003)
+        return
+
+    await websocket.accept()
+    device = transcribe.get_device()
+    live = streaming.StreamingTranscriber(device, transcribe.get_compute_type(device))
+    decoder = audio_io.StreamDecoder() if format != "pcm16" else None
+    received = bytearray()  # the recording as sent, kept for upload; the transcriber only holds its window
+    pcm_carry = b""  # odd trailing byte of a PCM message, completed by the next one
+
+    async def push(kind, segments):
+        if segments:
+            await websocket.send_json({"type": kind, "segments": segments})
+
+    try:
+        while True:
+            msg = await websocket.receive()
+            if msg["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect()
+            if msg.get("bytes"):
+                received.extend(msg["bytes"])
+                if decoder:
+                    await asyncio.to_thread(decoder.write, msg["bytes"])
+                    live.feed(decoder.read())
+                else:
+                    pcm = pcm_carry + msg["bytes"]
+                    usable = len(pcm) - len(pcm) % 2
+                    live.feed(np.frombuffer(pcm, np.int16, count=usable // 2).astype(np.float32) / 32768.0)
+                    pcm_carry = pcm[usable:]
+                if live.ready():
+                    final, interim = await asyncio.to_thread(live.process)
+                    await push("final", final)
+                    await push("interim", interim)
+            elif msg.get("text"):
+                try:
+                    command = json.loads(msg["text"])
+                except ValueError:
+                    continue
+                if command.get("type") == "stop":
+                    break
+        connected = True
+    except WebSocketDisconnect:
+        connected = False
+
+    if decoder:
+        live.feed(await asyncio.to_thread(decoder.close))
+    if not received:
+        if connected:
+            await websocket.close()
+        return
+
+    before = len(live.final_segments)
+    segments = await asyncio.to_thread(live.finish)
+    if connected:
+        await push("final", segments[before:])
+
+    # Persist audio + transcript in one step; no batch re-transcription needed
+    try:
+        if decoder:
+            data, content_type, ext = bytes(received), f"audio/{format}", format
+        else:
+            data, content_type, ext = _pcm16_to_wav(memoryview(received)[:len(received) - len(pcm_carry)]), "audio/wav", "wav"
+
+        if not meeting_id:
+            new_meeting = Meeting(
+                title=title if title else "Live recording",
+                organizer_id=current_user.id,
+                ai_transcription=True,
+                ai_recording=True,
+                meeting_type=Meeting.MeetingType.NATIVE
+            )
+            db.add(new_meeting)
+            await db.flush()
+            meeting_id = new_meeting.id
+
+        key = f"audio/{uuid.uuid4().hex}/live_recording.{ext}"
+        await storage.upload_fileobj(io.BytesIO(data), key, content_type=content_type)
+
+        audio = AudioFile(meeting_id=meeting_id, s3_key=key, content_type=content_type, size_bytes=len(data), content_sha256=sha256_bytes(data), processed=True)
+        db.add(audio)
+        await db.flush()
+        segments_json = json.dumps(segments)
+        enc_segments = crypto.encrypt_text(segments_json)
+        tr = Transcript(audio_file_id=audio.id, meeting_id=meeting_id, segments=enc_segments, detected_language=live.language, encrypted=(enc_segments != segments_json), model_tier=settings.LIVE_WHISPER_MODEL)
+        db.add(tr)
+        await db.commit()
+
+        enqueue_summarization(tr.id)
+        enqueue_extraction(tr.id)
+        if settings.AUDIO_NORMALIZE:
+            # the stored WAV is large; keep a compressed master (already transcribed)
+            enqueue_normalization(audio.id, then_transcribe=False)
+        else:
+            enqueue_audio_processing(audio.id)
+        if connected:
+            await websocket.send_json({"type": "done", "audio_id": audio.id, "transcript_id": tr.id, "meeting_id": meeting_id})
+    except Exception as e:
+        await db.rollback()
+        print(f"ERROR: Failed to persist live recording: {str(e)}")
+        if connected:
+            await websocket.send_json({"type": "error", "detail": str(e)})
+    if connected:
+        await websocket.close()
+
+
 @router.get("/{audio_id}", response_model=AudioIngestRead)
 async def get_audio(audio_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
     q = await db.execute(select(AudioFile).filter_by(id=audio_id))
@@ -102,6 +270,42 @@ async def get_audio(audio_id: int, db: AsyncSession = Depends(get_db), current_u
     return a
 
 
+@router.get("/{audio_id}/peaks")
+async def get_audio_peaks(audio_id: int, request: Request, width: Optional[int] = None, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
+    """Precomputed waveform peaks (see `app.ai.peaks` for the binary layout).
+
+    Without `width` every resolution level is returned; with `width` only the
+    coarsest level that still has `width` min/max pairs.
+    """
+    from sqlalchemy.orm import undefer
+    from app.ai import peaks
+
+    q = await db.execute(select(AudioFile).options(undefer(AudioFile.peaks)).filter_by(id=audio_id))
+    a = q.scalars().first()
+    if not a:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Audio not found")
+    if a.meeting_id:
+        q2 = await db.execute(select(Meeting).filter_by(id=a.meeting_id))
+        meeting = q2.scalars().first()
+        if meeting and meeting.organization_id:
+            q3 = await db.execute(select(UserOrganization).filter_by(user_id=current_user.id, organization_id=meeting.organization_id))
+            if not q3.scalars().first():
+                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of the organization")
+    if not a.peaks:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Peaks not computed yet")
+
+    # peaks never change for a given blob, so the client may cache them indefinitely
+    etag = f'"{zlib.crc32(a.peaks):08x}-{width or 0}"'
+    headers = {"Cache-Control": "private, max-age=31536000, immutable", "ETag": etag}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    body = a.peaks
+    if width:
+        p = peaks.unpack_peaks(body)
+        body = peaks.pack_peaks(p, [peaks.level_for_width(p, width)])
+    return Response(content=body, media_type="application/octet-stream", headers=headers)
+
+
 @router.get("/{audio_id}/download")
 async def download_audio(audio_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
     """Stream audio file for playback in browser"""
@@ -123,32 +327,33 @@ async def download_audio(audio_id: int, db: AsyncSession = Depends(get_db), curr
             if not q3.scalars().first():
                 raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of the organization")
     
-    # Download from storage
+    # Download from storage (the master once the original has expired)
+    key, content_type = ingest.playback_source(a)
     try:
         if settings.USE_LOCAL_STORAGE:
             root = os.path.abspath(getattr(settings, "STORAGE_PATH", "storage_data"))
-            full_path = os.path.join(root, a.s3_key)
+            full_path = os.path.join(root, key)
             if not os.path.exists(full_path):
-                print(f"ERROR: Local file not found at {full_path} (key: {a.s3_key})")
-                raise HTTPException(status_code=404, detail=f"File not found on disk: {a.s3_key}")
+                print(f"ERROR: Local file not found at {full_path} (key: {key})")
+                raise HTTPException(status_code=404, detail=f"File not found on disk: {key}")
             
             print(f"DEBUG: Serving local file {full_path} for audio {audio_id}")
             return FileResponse(
                 path=full_path,
-                media_type=a.content_type or "audio/mpeg",
-                filename=a.s3_key.split("/")[-1]
+                media_type=content_type or "audio/mpeg",
+                filename=key.split("/")[-1]
             )
         else:
-            print(f"DEBUG: Attempting to download audio {audio_id} from s3_key: {a.s3_key}")
-            data = await storage.download_to_bytes(a.s3_key)
+            print(f"DEBUG: Attempting to download audio {audio_id} from s3_key: {key}")
+            data = await storage.download_to_bytes(key)
             size = len(data)
             print(f"DEBUG: Downloaded {size} bytes for audio {audio_id}")
             
             return StreamingResponse(
                 io.BytesIO(data),
-                media_type=a.content_type or "audio/mpeg",
+                media_type=content_type or "audio/mpeg",
                 headers={
-                    "Content-Disposition": f'inline; filename="{a.s3_key.split("/")[-1]}"',
+                    "Content-Disposition": f'inline; filename="{key.split("/")[-1]}"',
                     "Content-Length": str(size),
                     "Accept-Ranges": "bytes"
                 }
@@ -180,6 +385,8 @@ async def delete_audio(audio_id: int, db: AsyncSession = Depends(get_db), curren
     # Delete from storage
     try:
         await storage.delete(a.s3_key)
+        if a.master_s3_key:
+            await storage.delete(a.master_s3_key)
     except Exception as e:
         # Log but don't fail if storage deletion fails
         print(f"Warning: Failed to delete from storage: {e}")
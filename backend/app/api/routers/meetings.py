@@ -37,6 +37,7 @@ async def create_meeting(payload: MeetingCreate, db: AsyncSession = Depends(get_
         ai_transcription=bool(payload.ai_transcription),
         ai_translation=bool(payload.ai_translation),
         ai_recording=bool(payload.ai_recording),
+        single_speaker=bool(payload.single_speaker),
     )
     db.add(meeting)
     await db.commit()
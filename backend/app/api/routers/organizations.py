@@ -3,8 +3,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import List
 from app.db import get_db
-from app.schemas import OrganizationCreate, OrganizationRead, MembershipRead, UserRead
-from app.models.models import Organization, UserOrganization, User
+from app.schemas import OrganizationCreate, OrganizationRead, OrganizationUpdate, MembershipRead, UserRead, VoiceprintRead
+from app.models.models import Organization, SpeakerVoiceprint, UserOrganization, User
 from app.core.auth import get_current_user, require_org_role
 
 router = APIRouter(prefix="/orgs", tags=["organizations"])
@@ -36,3 +36,34 @@ async def list_members(org_id: int, db: AsyncSession = Depends(get_db), membersh
     q = await db.execute(select(UserOrganization).filter_by(organization_id=org_id))
     members = q.scalars().all()
     return members
+
+
+@router.patch("/{org_id}", response_model=OrganizationRead)
+async def update_org(org_id: int, payload: OrganizationUpdate, db: AsyncSession = Depends(get_db), membership: UserOrganization = Depends(require_org_role("org_id", "admin"))):
+    q = await db.execute(select(Organization).filter_by(id=org_id))
+    org = q.scalars().first()
+    if not org:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Organization not found")
+    for field, value in payload.model_dump(exclude_unset=True).items():
+        setattr(org, field, value)
+    db.add(org)
+    await db.commit()
+    await db.refresh(org)
+    return org
+
+
+@router.get("/{org_id}/voiceprints", response_model=List[VoiceprintRead])
+async def list_voiceprints(org_id: int, db: AsyncSession = Depends(get_db), membership: UserOrganization = Depends(require_org_role("org_id", "organizer"))):
+    q = await db.execute(select(SpeakerVoiceprint).filter(SpeakerVoiceprint.organization_id == org_id, SpeakerVoiceprint.enrolled_at.isnot(None)).order_by(SpeakerVoiceprint.id))
+    return q.scalars().all()
+
+
+@router.delete("/{org_id}/voiceprints/{voiceprint_id}")
+async def delete_voiceprint(org_id: int, voiceprint_id: int, db: AsyncSession = Depends(get_db), membership: UserOrganization = Depends(require_org_role("org_id", "admin"))):
+    q = await db.execute(select(SpeakerVoiceprint).filter_by(id=voiceprint_id, organization_id=org_id))
+    vp = q.scalars().first()
+    if not vp:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Voiceprint not found")
+    await db.delete(vp)
+    await db.commit()
+    return {"status": "deleted"}
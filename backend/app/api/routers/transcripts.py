@@ -1,12 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import undefer
 from typing import Optional
 
 from app.db import get_db
-from app.schemas import TranscriptRead
-from app.models.models import Transcript, Meeting, UserOrganization, User
+from app.schemas import SpeakerLabel, TranscriptRead
+from app.models.models import SpeakerVoiceprint, Transcript, TranscriptChunk, Meeting, UserOrganization, User
 from app.core.auth import get_current_user
+from app.core import crypto
+from app.ai import word_timings
 
 router = APIRouter(prefix="/transcripts", tags=["transcripts"])
 
@@ -26,8 +29,91 @@ async def get_transcript(transcript_id: int, db: AsyncSession = Depends(get_db),
                 raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of the organization")
     # Deserialize segments into proper structure for schema
     import json
-    segments = json.loads(t.segments) if t.segments else []
-    return TranscriptRead(id=t.id, audio_file_id=t.audio_file_id, meeting_id=t.meeting_id, segments=segments, detected_language=t.detected_language, created_at=t.created_at)
+    if t.status in ("processing", "failed"):
+        # still running: serve the partial segments published so far
+        qc = await db.execute(select(TranscriptChunk).filter_by(transcript_id=t.id).order_by(TranscriptChunk.seq))
+        segments = []
+        for chunk in qc.scalars().all():
+            segments.extend(json.loads(crypto.decrypt_text(chunk.segments)))
+    else:
+        segments = json.loads(crypto.decrypt_text(t.segments)) if t.segments else []
+    return TranscriptRead(id=t.id, audio_file_id=t.audio_file_id, meeting_id=t.meeting_id, segments=segments, detected_language=t.detected_language, status=t.status, progress=t.progress, model_tier=t.model_tier, created_at=t.created_at)
+
+
+@router.get("/{transcript_id}/words")
+async def get_transcript_words(transcript_id: int, start: Optional[float] = None, end: Optional[float] = None, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
+    """Word-level timings overlapping `[start, end)` seconds, for synced playback highlighting."""
+    q = await db.execute(select(Transcript).options(undefer(Transcript.word_timings)).filter_by(id=transcript_id))
+    t = q.scalars().first()
+    if not t:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Transcript not found")
+    if t.meeting_id:
+        q2 = await db.execute(select(Meeting).filter_by(id=t.meeting_id))
+        meeting = q2.scalars().first()
+        if meeting and meeting.organization_id:
+            q3 = await db.execute(select(UserOrganization).filter_by(user_id=current_user.id, organization_id=meeting.organization_id))
+            if not q3.scalars().first():
+                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of the organization")
+    if not t.word_timings:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No word timings for this transcript")
+    blob = crypto.decrypt_bytes(t.word_timings) if t.encrypted else t.word_timings
+    words = word_timings.window(word_timings.unpack(blob), start, end)
+    return {"transcript_id": t.id, "start": start, "end": end, "words": words}
+
+
+@router.post("/{transcript_id}/speakers/{speaker_id}")
+async def label_speaker(transcript_id: int, speaker_id: str, payload: SpeakerLabel, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
+    """Name a diarized speaker on this transcript and enroll their voiceprint for the organization's later meetings."""
+    import json
+    from datetime import datetime, timezone
+    from app.ai import voiceprints
+
+    q = await db.execute(select(Transcript).filter_by(id=transcript_id))
+    t = q.scalars().first()
+    if not t:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Transcript not found")
+    meeting = None
+    if t.meeting_id:
+        q2 = await db.execute(select(Meeting).filter_by(id=t.meeting_id))
+        meeting = q2.scalars().first()
+    # voiceprints belong to an organization; without one there is no membership to check
+    if not meeting or not meeting.organization_id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Speakers can only be named on meetings of an organization")
+    q3 = await db.execute(select(UserOrganization).filter_by(user_id=current_user.id, organization_id=meeting.organization_id))
+    if not q3.scalars().first():
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of the organization")
+    if not (payload.user_id or payload.email or payload.display_name):
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Provide user_id, email or display_name")
+    display_name, email = payload.display_name, payload.email
+    if payload.user_id:
+        qu = await db.execute(
+            select(User)
+            .join(UserOrganization, UserOrganization.user_id == User.id)
+            .filter(User.id == payload.user_id, UserOrganization.organization_id == meeting.organization_id)
+        )
+        u = qu.scalars().first()
+        if not u:
+            # outsiders are indistinguishable from unknown ids
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        display_name, email = display_name or u.display_name or u.email, email or u.email
+
+    segments = json.loads(crypto.decrypt_text(t.segments)) if t.segments else []
+    labelled = voiceprints.label_segments(segments, {speaker_id: {"display_name": display_name or email, "user_id": payload.user_id}})
+    if not labelled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Speaker not found in transcript")
+    segments_json = json.dumps(segments)
+    t.segments = crypto.encrypt_text(segments_json)
+    t.encrypted = (t.segments != segments_json)
+    db.add(t)
+
+    qv = await db.execute(select(SpeakerVoiceprint).filter_by(transcript_id=t.id, speaker_label=speaker_id))
+    vp = qv.scalars().first()
+    if vp:
+        vp.user_id, vp.email, vp.display_name = payload.user_id, email, display_name
+        vp.enrolled_at = datetime.now(timezone.utc)
+        db.add(vp)
+    await db.commit()
+    return {"transcript_id": t.id, "speaker_id": speaker_id, "segments_labelled": labelled, "voiceprint_id": vp.id if vp else None}
 
 
 @router.get("/{transcript_id}/download")
@@ -11,6 +11,11 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
 
 async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)) -> User:
+    return await user_from_token(token, db)
+
+
+async def user_from_token(token: str, db: AsyncSession) -> User:
+    """Resolve an access token to an active user (also used where no Authorization header exists, e.g. WebSockets)."""
     try:
         payload = decode_token(token)
         if payload.get("type") != "access":
@@ -32,10 +32,95 @@ class Settings(BaseSettings):
 
     # AI Configuration
     WHISPER_MODEL: str = "large-v3"
+    # Language-ID pre-pass and English-only routing (empty = always multilingual)
+    LANGUAGE_ID_MODEL: str = "tiny"
+    ENGLISH_WHISPER_MODEL: Optional[str] = "distil-large-v3"
     HF_TOKEN: Optional[str] = None
     USE_GPU: bool = False
     USE_MODAL_AI: bool = False
+    ALIGN_MODEL_CACHE_MB: int = 2048 # LRU budget for resident alignment models
+    # Node-local inference server shared by worker processes, e.g.
+    # "unix:///run/eden/inference.sock" or "http://127.0.0.1:8765"
+    INFERENCE_SERVER_URL: Optional[str] = None
+    INFERENCE_SERVER_TIMEOUT: float = 3600.0
+    INFERENCE_MAX_QUEUE: int = 64
+    INFERENCE_BATCH_SIZE: int = 4
+    INFERENCE_BATCH_WINDOW_MS: int = 50
+    # Chunked ASR for long recordings on CPU (disabled when workers <= 1)
+    TRANSCRIBE_CHUNK_WORKERS: int = 0
+    TRANSCRIBE_CHUNKED_MIN_SECONDS: float = 900.0
+    TRANSCRIBE_CHUNK_SECONDS: float = 300.0
+    TRANSCRIBE_CHUNK_OVERLAP_SECONDS: float = 2.0
+    # Partial transcripts while a job runs. Off: partials come only from the chunked path above (or once, after
+    # the single batched pass). On: medium-length audio is transcribed in sequential chunks of this span, which
+    # is slower than one batched pass.
+    PROGRESSIVE_ASR: bool = False
+    PROGRESSIVE_CHUNK_SECONDS: float = 60.0
+    # Live (WebSocket) transcription
+    LIVE_WHISPER_MODEL: str = "base"
+    LIVE_STEP_SECONDS: float = 2.0
+    LIVE_WINDOW_SECONDS: float = 30.0
+    LIVE_HOLDBACK_SECONDS: float = 3.0
+    LIVE_ASR_REPLICAS: int = 2  # live model copies per process; concurrent sessions share them
+    # Model tier policy (app.ai.policy): queue depths that trigger a smaller
+    # model, and what counts as a short voice note / a long recording
+    TRANSCRIBE_BACKLOG_LOW: int = 4
+    TRANSCRIBE_BACKLOG_HIGH: int = 16
+    TRANSCRIBE_SHORT_SECONDS: float = 120.0
+    TRANSCRIBE_LONG_SECONDS: float = 1800.0
+    # Two-pass transcription: fast draft (no diarization) now, full pass later.
+    # The refined pass re-runs summary/extraction only if more than
+    # TRANSCRIBE_REFINE_MIN_CHANGE of the words changed or speakers appeared.
+    TRANSCRIBE_TWO_PASS: bool = False
+    TRANSCRIBE_DRAFT_TIER: str = "base"
+    TRANSCRIBE_REFINE_MIN_CHANGE: float = 0.05
+    # Ingest normalization: transcode uploads once to a 16 kHz mono master
+    # ("opus" or "flac"); optionally delete the original after N hours
+    AUDIO_NORMALIZE: bool = True
+    AUDIO_MASTER_FORMAT: str = "opus"
+    AUDIO_MASTER_BITRATE: str = "32k"
+    AUDIO_EXPIRE_ORIGINAL_HOURS: Optional[float] = None
+    # Decoded-PCM cache (memory-mapped .npy per content hash); 0 disables
+    PCM_CACHE_DIR: Optional[str] = None  # default: <tmp>/eden-pcm-cache
+    PCM_CACHE_MAX_MB: int = 2048
+    # Waveform peaks quantization (8 or 16 bits)
+    PEAKS_BITS: int = 8
+    # Chunked pre-analysis (peaks, loudness, silence) in process_audio_file
+    AUDIO_ANALYSIS_CHUNK_SECONDS: float = 30.0
+    AUDIO_ANALYSIS_WORKERS: int = 4
+    AUDIO_SILENCE_DBFS: float = -50.0
+    AUDIO_SILENCE_MIN_SECONDS: float = 1.0
+    # Merge adjacent same-speaker segments after diarization (fewer, longer statements downstream)
+    SEGMENT_MERGE_ENABLED: bool = True
+    SEGMENT_MERGE_MAX_GAP: float = 1.0  # seconds of pause that still counts as one statement
+    SEGMENT_MERGE_MAX_SECONDS: float = 30.0
+    SEGMENT_MERGE_MAX_CHARS: int = 500
+    # Speaker voiceprints: auto-label diarized speakers from enrolled voiceprints (cosine similarity)
+    VOICEPRINTS_ENABLED: bool = True
+    VOICEPRINT_MATCH_THRESHOLD: float = 0.7
+    VOICEPRINT_ANN_MIN: int = 20000  # use an HNSW index (if hnswlib is installed) from this many voiceprints
+    VOICEPRINT_UNENROLLED_HOURS: float = 72  # embeddings of speakers nobody names are deleted after this
+    # Reuse summary/extraction as well as the transcript for byte-identical re-uploads
+    DEDUPE_CLONE_DOWNSTREAM: bool = True
     OPENAI_API_KEY: Optional[str] = None # For LLM-based layers
+    OPENAI_BASE_URL: Optional[str] = None  # any OpenAI-compatible endpoint (proxy, local server)
+    LLM_MODEL: str = "gpt-4o"
+    LLM_TIMEOUT_SECONDS: float = 60.0
+    LLM_MAX_RETRIES: int = 3
+    LLM_MAX_CONCURRENCY: int = 8  # in-flight LLM requests per worker process
+    # Cache of LLM responses keyed by (model, system prompt, prompt) hash: none | sqlite | redis.
+    # Values are encrypted with ENCRYPTION_KEY like transcript segments.
+    LLM_CACHE_BACKEND: str = "none"
+    LLM_CACHE_PATH: Optional[str] = None  # required for sqlite
+    LLM_CACHE_REDIS_URL: Optional[str] = None  # required for redis; size it with maxmemory + an LRU policy
+    LLM_CACHE_TTL_SECONDS: float = 7 * 24 * 3600
+    LLM_CACHE_MAX_MB: int = 256  # sqlite only
+    INTENT_BATCH_TOKENS: int = 2000  # statement tokens per intent-classification request
+    INTENT_BATCH_OVERLAP: int = 2  # preceding statements repeated as context in each request
+    # Local intent model (app.ai.intent_model); only statements it is less sure of go to the LLM
+    INTENT_MODEL_PATH: Optional[str] = None  # .npz written by the train_intent_model task; unset disables it
+    INTENT_MODEL_MIN_CONFIDENCE: float = 0.85
+    INTENT_MODEL_MIN_EXAMPLES: int = 500  # LLM-labelled statements needed before training
 
     # Production Configs
     DOMAIN: str = "localhost"
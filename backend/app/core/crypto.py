@@ -37,6 +37,10 @@ def _get_fernet() -> Optional["Fernet"]:
         return None
 
 
+def encryption_enabled() -> bool:
+    return _get_fernet() is not None
+
+
 def encrypt_text(plaintext: str) -> str:
     f = _get_fernet()
     if not f:
@@ -44,6 +48,24 @@ def encrypt_text(plaintext: str) -> str:
     return f.encrypt(plaintext.encode()).decode()
 
 
+def encrypt_bytes(data: bytes) -> bytes:
+    f = _get_fernet()
+    if not f:
+        return data
+    return f.encrypt(data)
+
+
+def decrypt_bytes(data: bytes) -> bytes:
+    f = _get_fernet()
+    if not f:
+        return data
+    try:
+        return f.decrypt(data)
+    except InvalidToken:
+        logger.exception("Invalid token when decrypting")
+        return data
+
+
 def decrypt_text(ciphertext: str) -> str:
     f = _get_fernet()
     if not f:
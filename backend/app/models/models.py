@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Boolean, Text
+from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Boolean, Text, Float, LargeBinary, UniqueConstraint
 from sqlalchemy import Enum as SQLEnum
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from app.db import Base
 from enum import Enum
@@ -40,6 +40,8 @@ class Meeting(Base):
     ai_transcription = Column(Boolean, default=False)
     ai_translation = Column(Boolean, default=False)
     ai_recording = Column(Boolean, default=False)
+    # known single-speaker recording (dictation, lecture): skip diarization
+    single_speaker = Column(Boolean, default=False, server_default=text("false"))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     participants = relationship("Participant", back_populates="meeting", cascade="all, delete-orphan")
     recordings = relationship("Recording", back_populates="meeting", cascade="all, delete-orphan")
@@ -78,6 +80,7 @@ class Organization(Base):
     __tablename__ = "organizations"
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False, unique=True)
+    transcription_quality = Column(String, nullable=True)  # fast|balanced|accurate (None = balanced)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     members = relationship("UserOrganization", back_populates="organization")
 
@@ -115,6 +118,9 @@ class AudioFile(Base):
     s3_key = Column(String, nullable=False, unique=True)
     content_type = Column(String, nullable=True)
     size_bytes = Column(Integer, nullable=True)
+    content_sha256 = Column(String(64), nullable=True, index=True)  # hex digest of the uploaded bytes, for dedupe
+    master_s3_key = Column(String, nullable=True)  # 16 kHz mono master written at ingest (see app.ai.ingest)
+    peaks = deferred(Column(LargeBinary, nullable=True))  # multi-resolution waveform peaks (see app.ai.peaks)
     processed = Column(Boolean, default=False)
     meta = Column("metadata", Text, nullable=True)
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -130,10 +136,42 @@ class Transcript(Base):
     segments = Column(Text, nullable=False)  # JSON array of segments (may be encrypted)
     encrypted = Column(Boolean, default=False)
     detected_language = Column(String, nullable=True)
+    status = Column(String, nullable=False, default="completed", server_default="completed")  # processing|draft|completed|failed
+    progress = Column(Float, nullable=True)  # fraction of audio transcribed while processing
+    model_tier = Column(String, nullable=True)  # ASR tier picked by app.ai.policy
+    word_timings = deferred(Column(LargeBinary, nullable=True))  # packed by app.ai.word_timings (encrypted with segments)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     audio_file = relationship("AudioFile")
     meeting = relationship("Meeting")
+    chunks = relationship("TranscriptChunk", back_populates="transcript", cascade="all, delete-orphan", order_by="TranscriptChunk.seq")
+
+
+class SpeakerVoiceprint(Base):
+    """Speaker embedding of one diarization label; enrolled once someone names it (see app.ai.voiceprints)."""
+    __tablename__ = "speaker_voiceprints"
+    id = Column(Integer, primary_key=True, index=True)
+    organization_id = Column(Integer, ForeignKey("organizations.id"), nullable=False, index=True)
+    transcript_id = Column(Integer, ForeignKey("transcripts.id"), nullable=True, index=True)
+    speaker_label = Column(String, nullable=False)  # SPEAKER_XX within the transcript
+    embedding = Column(LargeBinary, nullable=False)  # L2-normalized float32
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    email = Column(String, nullable=True)
+    display_name = Column(String, nullable=True)
+    enrolled_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class TranscriptChunk(Base):
+    """Append-only partial segments published while a transcription is running."""
+    __tablename__ = "transcript_chunks"
+    id = Column(Integer, primary_key=True, index=True)
+    transcript_id = Column(Integer, ForeignKey("transcripts.id"), nullable=False, index=True)
+    seq = Column(Integer, nullable=False)
+    segments = Column(Text, nullable=False)  # JSON array of partial segments (may be encrypted)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    transcript = relationship("Transcript", back_populates="chunks")
 
 
 class TranslatedTranscript(Base):
@@ -184,6 +222,22 @@ class Extraction(Base):
     meeting = relationship("Meeting")
 
 
+class ExtractionFacts(Base):
+    """Layer 2-5 output of `ai.extract` for a transcript, computed once and read by both summary and extraction tasks."""
+    __tablename__ = "extraction_facts"
+    __table_args__ = (UniqueConstraint("transcript_id", "extractor_version"),)
+    id = Column(Integer, primary_key=True, index=True)
+    transcript_id = Column(Integer, ForeignKey("transcripts.id"), nullable=False, index=True)
+    extractor_version = Column(String, nullable=False)
+    segments_sha256 = Column(String(64), nullable=False)  # facts are stale once the segments change (refinement)
+    facts = Column(Text, nullable=True)  # JSON: statements, intents, result; NULL while being computed
+    encrypted = Column(Boolean, default=False)
+    claimed_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    transcript = relationship("Transcript")
+
+
 class EmailDelivery(Base):
     __tablename__ = "email_deliveries"
     id = Column(Integer, primary_key=True, index=True)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, field_validator, model_validator, ConfigDict
-from typing import List, Optional, Any
+from typing import List, Literal, Optional, Any
 from datetime import datetime
 import json
 
@@ -63,6 +63,7 @@ class MeetingCreate(BaseModel):
     ai_transcription: Optional[bool] = False
     ai_translation: Optional[bool] = False
     ai_recording: Optional[bool] = False
+    single_speaker: Optional[bool] = False
 
     def validate_external(self):
         if self.meeting_type == MeetingType.EXTERNAL and not self.external_link:
@@ -78,6 +79,7 @@ class MeetingUpdate(BaseModel):
     ai_transcription: Optional[bool] = None
     ai_translation: Optional[bool] = None
     ai_recording: Optional[bool] = None
+    single_speaker: Optional[bool] = None
 
 class MeetingRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -93,6 +95,7 @@ class MeetingRead(BaseModel):
     ai_transcription: bool
     ai_translation: bool
     ai_recording: bool
+    single_speaker: bool = False
     participants: List[ParticipantRead] = []
     recordings: List[RecordingRead] = []
     created_at: Optional[datetime]
@@ -151,6 +154,10 @@ class OrganizationRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     id: int
     name: str
+    transcription_quality: Optional[str] = None
+
+class OrganizationUpdate(BaseModel):
+    transcription_quality: Optional[Literal["fast", "balanced", "accurate"]] = None
 
 class MembershipRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -216,6 +223,7 @@ class AudioIngestRead(BaseModel):
     s3_key: str
     content_type: Optional[str]
     size_bytes: Optional[int]
+    master_s3_key: Optional[str] = None
     processed: bool
     processing_status: Optional[str] = "uploaded"
     meta: Optional[dict]
@@ -252,6 +260,9 @@ class TranscriptSegment(BaseModel):
     end_time: float
     original_text: str
     detected_language: Optional[str] = None
+    speaker_name: Optional[str] = None  # from an enrolled voiceprint or a manual label
+    speaker_user_id: Optional[int] = None
+    source_spans: Optional[List[List[float]]] = None  # [start_time, end_time] of each ASR segment merged into this one
 
     @model_validator(mode='before')
     @classmethod
@@ -270,6 +281,9 @@ class TranscriptRead(BaseModel):
     meeting_id: Optional[int]
     segments: List[TranscriptSegment]
     detected_language: Optional[str]
+    status: Optional[str] = "completed"  # processing|draft|completed|failed
+    progress: Optional[float] = None
+    model_tier: Optional[str] = None
     created_at: Optional[datetime]
 
     @field_validator("segments", mode='before')
@@ -284,6 +298,23 @@ class TranscriptRead(BaseModel):
                 return []
         return v
 
+class SpeakerLabel(BaseModel):
+    """Names a diarized speaker; enrolls its voiceprint for future meetings."""
+    user_id: Optional[int] = None
+    email: Optional[EmailStr] = None
+    display_name: Optional[str] = None
+
+class VoiceprintRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: int
+    organization_id: int
+    transcript_id: Optional[int]
+    speaker_label: str
+    user_id: Optional[int]
+    email: Optional[str]
+    display_name: Optional[str]
+    enrolled_at: Optional[datetime]
+
 # --- Translation schemas ---
 class TranslatedSegment(BaseModel):
     speaker_id: str
@@ -38,6 +38,13 @@ class S3Storage:
 
         return await asyncio.to_thread(_download)
 
+    async def open_stream(self, key: str) -> BinaryIO:
+        """Return a readable streaming body for `key` without buffering it."""
+        def _get():
+            return self.client.get_object(Bucket=self.bucket, Key=key)["Body"]
+
+        return await asyncio.to_thread(_get)
+
     async def exists(self, key: str) -> bool:
         def _head():
             try:
@@ -85,6 +92,10 @@ class LocalStorage:
                 return f.read()
         return await asyncio.to_thread(_read)
 
+    async def open_stream(self, key: str) -> BinaryIO:
+        full_path = os.path.join(self.root, key)
+        return await asyncio.to_thread(open, full_path, "rb")
+
     async def exists(self, key: str) -> bool:
         full_path = os.path.join(self.root, key)
         return os.path.exists(full_path)
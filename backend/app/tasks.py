@@ -3,10 +3,13 @@ from celery.utils.log import get_task_logger
 from celery_app import celery_app
 from app.storage import storage
 from app.ai import transcribe
+from app.ai import policy
+from app.ai import refine
+from app.ai import word_timings
 import json
 from app.ai import translate
 from app.ai import summarize
-from app.ai import extract
+from app.ai import facts
 from app.core import crypto
 import logging
 import os
@@ -20,6 +23,10 @@ def debug_log(msg: str):
 
 logger = logging.getLogger(__name__)
 
+# summary/extraction tasks wait up to facts.CLAIM_SECONDS for the other one to finish the shared facts
+FACTS_WAIT_SECONDS = 5
+FACTS_WAIT_RETRIES = facts.CLAIM_SECONDS // FACTS_WAIT_SECONDS
+
 @celery_app.task(bind=True, name="app.tasks.process_recording")
 def process_recording(self, recording_id: int):
     """Entry point for processing a recording: download -> transcribe -> translate -> summarize -> store results -> email participants"""
@@ -96,7 +103,7 @@ def enqueue_listener_join(session_id: int, countdown: int = 0):
 
 @celery_app.task(bind=True, name="app.tasks.process_audio_file", max_retries=3)
 def process_audio_file(self, audio_id: int):
-    """Download audio from S3, chunk/process, and mark processed. Retries on failure."""
+    """Decode the audio (via the PCM cache) and analyse it chunk by chunk: waveform peaks, loudness, silences. Retries on failure."""
     from app.db import SyncSessionLocal
     from app.models.models import AudioFile
     
@@ -108,31 +115,39 @@ def process_audio_file(self, audio_id: int):
         if not a:
             logger.warning("Audio file %s not found", audio_id)
             return
-        if a.processed:
+        if a.peaks is not None:
             logger.info("Audio file %s already processed", audio_id)
             return
         
         try:
             # Download from storage (storage methods need to be sync or wrapped)
             import asyncio
-            data = asyncio.run(storage.download_to_bytes(a.s3_key))
-            
-            # Chunking mock: split into N parts
-            chunk_size = 1024 * 64
-            total = len(data)
-            chunks = [data[i:i+chunk_size] for i in range(0, total, chunk_size)]
-            logger.info("Audio %s split into %d chunks", audio_id, len(chunks))
-            
-            # Mock processing each chunk
-            import time
-            for idx, c in enumerate(chunks):
-                time.sleep(0.01)
-            
-            # Mark processed
-            a.processed = True
+            from app.core.config import settings
+            from app.ai import audio as audio_io
+            from app.ai import analysis, ingest, peaks
+            from app.ai.pcm_cache import PCMCache, cache as pcm_cache
+
+            key, _ = ingest.processing_source(a)
+            audio = pcm_cache.get_or_decode(
+                PCMCache.key_for(a.content_sha256),
+                lambda: audio_io.decode_audio(asyncio.run(storage.download_to_bytes(key))),
+            )
+
+            result = analysis.analyse_audio(
+                audio,
+                audio_io.SAMPLE_RATE,
+                chunk_seconds=settings.AUDIO_ANALYSIS_CHUNK_SECONDS,
+                workers=settings.AUDIO_ANALYSIS_WORKERS,
+                silence_dbfs=settings.AUDIO_SILENCE_DBFS,
+                min_silence_seconds=settings.AUDIO_SILENCE_MIN_SECONDS,
+                peaks_bits=settings.PEAKS_BITS,
+            )
+            a.peaks = peaks.pack_peaks(result.peaks)
+            ingest.update_meta(a, analysis=result.meta)
             db.add(a)
             db.commit()
-            logger.info("Audio file %s marked as processed", audio_id)
+            logger.info("Audio file %s analysed in %d chunks: %d peak levels, %.0f%% silence",
+                        audio_id, result.meta["chunks"], len(result.peaks.levels), result.meta["silence_ratio"] * 100)
             
         except Exception as exc:
             logger.exception("Audio processing failed %s", exc)
@@ -147,15 +162,96 @@ def enqueue_audio_processing(audio_id: int):
     return process_audio_file.delay(audio_id)
 
 
+@celery_app.task(bind=True, name="app.tasks.normalize_audio", max_retries=2)
+def normalize_audio(self, audio_id: int, then_transcribe: bool = True):
+    """Transcode the uploaded original to the canonical 16 kHz mono master, then hand over to transcription."""
+    from app.db import SyncSessionLocal
+    from app.models.models import AudioFile
+    from app.core.config import settings
+    from app.ai import audio as audio_io
+    from app.ai import ingest
+
+    db = SyncSessionLocal()
+    try:
+        a = db.query(AudioFile).filter_by(id=audio_id).first()
+        if not a:
+            logger.warning("Audio file %s not found for normalization", audio_id)
+            return
+        try:
+            import asyncio
+            import io
+
+            if not a.master_s3_key:
+                fmt = settings.AUDIO_MASTER_FORMAT
+                source = asyncio.run(storage.open_stream(a.s3_key))
+                try:
+                    master, info = audio_io.transcode_master(source, fmt=fmt, bitrate=settings.AUDIO_MASTER_BITRATE)
+                finally:
+                    source.close()
+                key = ingest.master_key_for(a.s3_key, fmt)
+                asyncio.run(storage.upload_fileobj(io.BytesIO(master), key, content_type=audio_io.MASTER_FORMATS[fmt][1]))
+                a.master_s3_key = key
+                ingest.update_meta(a, **info, master=ingest.master_meta(fmt, len(master)), original_expired=False)
+                db.add(a)
+                db.commit()
+                logger.info("Audio %s normalized: %d -> %d bytes (%s)", audio_id, a.size_bytes or 0, len(master), fmt)
+
+                hours = settings.AUDIO_EXPIRE_ORIGINAL_HOURS
+                if hours is not None:
+                    enqueue_original_expiry(audio_id, countdown=int(hours * 3600))
+        except Exception as exc:
+            logger.exception("Normalization failed for audio %s", audio_id)
+            db.rollback()
+            if self.request.retries < self.max_retries:
+                raise self.retry(exc=exc, countdown=10)
+            # give up on the master; downstream stages read the original
+        if then_transcribe:
+            enqueue_transcription(audio_id)
+        enqueue_audio_processing(audio_id)
+    finally:
+        db.close()
+
+
+def enqueue_normalization(audio_id: int, then_transcribe: bool = True, countdown: int = 0):
+    return normalize_audio.apply_async(args=(audio_id, then_transcribe), countdown=countdown)
+
+
+@celery_app.task(bind=True, name="app.tasks.expire_original_audio")
+def expire_original_audio(self, audio_id: int):
+    """Delete the uploaded original once a master exists; playback falls back to the master."""
+    from app.db import SyncSessionLocal
+    from app.models.models import AudioFile
+    from app.ai import ingest
+
+    db = SyncSessionLocal()
+    try:
+        a = db.query(AudioFile).filter_by(id=audio_id).first()
+        if not a or not a.master_s3_key or ingest.load_meta(a).get("original_expired"):
+            return
+        import asyncio
+        if asyncio.run(storage.delete(a.s3_key)):
+            ingest.update_meta(a, original_expired=True)
+            db.add(a)
+            db.commit()
+            logger.info("Expired original upload for audio %s (%s)", audio_id, a.s3_key)
+    finally:
+        db.close()
+
+
+def enqueue_original_expiry(audio_id: int, countdown: int = 0):
+    return expire_original_audio.apply_async(args=(audio_id,), countdown=countdown)
+
+
 @celery_app.task(bind=True, name="app.tasks.process_transcription")
 def process_transcription(self, audio_id: int):
     """Download audio bytes, transcribe with WhisperX + pyannote, and persist Transcript record."""
     from app.db import SyncSessionLocal
-    from app.models.models import AudioFile, Transcript, Meeting
+    from app.models.models import AudioFile, TranscriptChunk, Meeting
     
     debug_log(f"START: process_transcription for audio {audio_id}")
     
     db = SyncSessionLocal()
+    tr = None
     try:
         a = db.query(AudioFile).filter_by(id=audio_id).first()
         if not a:
@@ -163,40 +259,63 @@ def process_transcription(self, audio_id: int):
             return
         
         try:
-            # Download audio
-            import asyncio
-            print(f"DEBUG: Downloading audio for transcription: {a.s3_key}")
-            data = asyncio.run(storage.download_to_bytes(a.s3_key))
-            print(f"DEBUG: Downloaded {len(data)} bytes")
+            from app.core.config import settings
+            if a.content_sha256 and _reuse_transcript_by_hash(db, a):
+                return
+
+            data = _open_audio(a)
+            options = _transcription_options(db, a)
+            two_pass = settings.TRANSCRIBE_TWO_PASS
+            if two_pass:
+                # Draft pass: small fixed model, no diarization; refine_transcription does the rest
+                options.update(diarize=False, tier=settings.TRANSCRIBE_DRAFT_TIER)
+
+            # Placeholder transcript that partial segments are published to while ASR runs
+            tr = _start_transcript(db, a)
+            next_seq = len(tr.chunks)
+
+            def publish_partial(partial, progress):
+                nonlocal next_seq
+                if partial:
+                    partial_json = json.dumps(partial)
+                    tr.chunks.append(TranscriptChunk(seq=next_seq, segments=crypto.encrypt_text(partial_json)))
+                    next_seq += 1
+                tr.progress = round(progress, 4)
+                db.add(tr)
+                db.commit()
             
             # Transcribe with WhisperX (internal model handles speaker-aware segments)
-            from app.core.config import settings
-            if settings.USE_MODAL_AI:
-                print(f"DEBUG: Using Modal.com for transcription of audio {audio_id}")
-                import modal
-                f = modal.Function.lookup("eden-ai-worker", "transcribe_audio")
-                result = f.remote(data)
-            else:
-                print(f"DEBUG: Using local worker for transcription of audio {audio_id}")
-                result = transcribe.transcribe_bytes_to_segments(data)
+            def publish_language(language):
+                # known long before ASR finishes; lets translation be scheduled early
+                _record_language(db, a, tr, language)
+
+            result = _run_transcription(data, audio_id, on_segments=publish_partial, on_language=publish_language, **options)
             
             segments = result.get("segments", [])
+            words = word_timings.decode_result(result)
+            if two_pass and not options["single_speaker"]:
+                # speakers are unknown until the refined pass diarizes
+                for seg in segments:
+                    seg["speaker_id"] = refine.DRAFT_SPEAKER_ID
+                words = None
+            _apply_voiceprints(db, a, tr, result, segments)
             segments_json = json.dumps(segments)
             
             # Encrypt segments at rest if configured
-            from app.core import crypto
             enc_segments = crypto.encrypt_text(segments_json)
             detected = result.get("detected_language")
+            _record_language(db, a, tr, detected)
             
             print(f"DEBUG: Saving transcript with {len(segments)} segments")
-            # Save transcript
-            tr = Transcript(
-                audio_file_id=a.id,
-                meeting_id=a.meeting_id,
-                segments=enc_segments,
-                detected_language=detected,
-                encrypted=(enc_segments != segments_json)
-            )
+            # Final transcript replaces the partial chunks
+            tr.segments = enc_segments
+            tr.detected_language = detected
+            tr.model_tier = result.get("model_tier")
+            tr.encrypted = (enc_segments != segments_json)
+            tr.word_timings = crypto.encrypt_bytes(words) if words else None
+            tr.status = "draft" if two_pass else "completed"
+            tr.progress = 1.0
+            tr.chunks.clear()
             db.add(tr)
             
             # Mark audio processed
@@ -212,15 +331,272 @@ def process_transcription(self, audio_id: int):
             enqueue_extraction(tr.id)
             print(f"DEBUG: Enqueued summarization and extraction for transcript {tr.id}")
             debug_log(f"ENQUEUED: Summarization and extraction for transcript {tr.id}")
+            if two_pass:
+                enqueue_refinement(tr.id)
             
         except Exception as exc:
             logger.exception("Transcription failed for %s", audio_id)
             db.rollback()
+            if tr is not None:
+                tr.status = "failed"
+                db.add(tr)
+                db.commit()
             raise self.retry(exc=exc, countdown=10)
     finally:
         db.close()
 
 
+def _open_audio(a):
+    """Audio to hand to the transcriber.
+
+    When decoding locally: the memory-mapped PCM from the node-local cache if
+    this content was decoded here before, else a storage stream for
+    pipe-friendly containers. Otherwise the full encoded bytes.
+    """
+    import asyncio
+    from app.core.config import settings
+    from app.ai import audio as audio_io
+    from app.ai import ingest
+    from app.ai.pcm_cache import PCMCache, cache as pcm_cache
+
+    key, content_type = ingest.processing_source(a)
+    local_decode = not settings.USE_MODAL_AI and not settings.INFERENCE_SERVER_URL
+    if local_decode:
+        cached = pcm_cache.get(PCMCache.key_for(a.content_sha256))
+        if cached is not None:
+            print(f"DEBUG: Using cached PCM for audio {a.id}")
+            return cached
+    if local_decode and audio_io.is_streamable(content_type):
+        # Pipe the storage body straight into the decoder instead of buffering it
+        print(f"DEBUG: Streaming audio for transcription: {key}")
+        return asyncio.run(storage.open_stream(key))
+    # Download audio
+    print(f"DEBUG: Downloading audio for transcription: {key}")
+    data = asyncio.run(storage.download_to_bytes(key))
+    print(f"DEBUG: Downloaded {len(data)} bytes")
+    return data
+
+
+def _transcription_options(db, a):
+    """Per-job pipeline options derived from the meeting, its organization and the queue."""
+    from app.models.models import Meeting
+    from app.ai.pcm_cache import PCMCache
+
+    meeting = db.query(Meeting).filter_by(id=a.meeting_id).first() if a.meeting_id else None
+    single_speaker = bool(meeting and meeting.single_speaker)
+    return {
+        "cache_key": PCMCache.key_for(a.content_sha256),
+        "single_speaker": single_speaker,
+        # Single-speaker meetings skip diarization entirely
+        "diarize": not single_speaker,
+        # Model tier policy inputs: organization preference and current queue depth
+        "quality": meeting.organization.transcription_quality if meeting and meeting.organization else None,
+        "backlog": policy.queue_backlog(),
+    }
+
+
+def _record_language(db, a, tr, language):
+    from app.models.models import Meeting
+
+    if not language:
+        return
+    tr.detected_language = language
+    db.add(tr)
+    meeting = db.query(Meeting).filter_by(id=a.meeting_id).first() if a.meeting_id else None
+    if meeting and meeting.language != language:
+        meeting.language = language
+        db.add(meeting)
+    db.commit()
+
+
+def _apply_voiceprints(db, a, tr, result, segments):
+    """Keep this transcript's speaker embeddings and name the speakers that match enrolled voiceprints."""
+    from app.core.config import settings
+    from app.models.models import Meeting, SpeakerVoiceprint
+    from app.ai import voiceprints
+
+    embeddings = {label: vec for label, vec in (result.get("speaker_embeddings") or {}).items() if vec is not None}
+    if not embeddings or not settings.VOICEPRINTS_ENABLED:
+        return
+    meeting = db.query(Meeting).filter_by(id=a.meeting_id).first() if a.meeting_id else None
+    if not meeting or not meeting.organization_id:
+        return
+    try:
+        index, identity_of = voiceprints.org_index(db, meeting.organization_id)
+        matched = voiceprints.assign(index, embeddings, identity_of, settings.VOICEPRINT_MATCH_THRESHOLD)
+        if matched:
+            people = {vp.id: vp for vp in db.query(SpeakerVoiceprint).filter(SpeakerVoiceprint.id.in_(matched.values()))}
+            names = {label: {"display_name": people[vp_id].display_name or people[vp_id].email, "user_id": people[vp_id].user_id}
+                     for label, vp_id in matched.items()}
+            voiceprints.label_segments(segments, names)
+            logger.info("Transcript %s: matched speakers %s to enrolled voiceprints", tr.id, sorted(matched))
+
+        # a retry or the refine pass replaces earlier, not yet enrolled voiceprints
+        db.query(SpeakerVoiceprint).filter(SpeakerVoiceprint.transcript_id == tr.id,
+                                           SpeakerVoiceprint.enrolled_at.is_(None)).delete(synchronize_session=False)
+        # kept only so a speaker can be named (enrolled) for a while; biometric data of people
+        # nobody names is deleted after VOICEPRINT_UNENROLLED_HOURS
+        for label, vec in embeddings.items():
+            db.add(SpeakerVoiceprint(organization_id=meeting.organization_id, transcript_id=tr.id,
+                                     speaker_label=label, embedding=voiceprints.to_blob(vec)))
+        enqueue_voiceprint_expiry(tr.id, countdown=int(settings.VOICEPRINT_UNENROLLED_HOURS * 3600))
+    except Exception as e:
+        # labelling is a nicety; never fail a transcription over it
+        logger.warning("Voiceprint matching failed for transcript %s: %s", tr.id, e)
+        db.rollback()
+
+
+@celery_app.task(bind=True, name="app.tasks.expire_unenrolled_voiceprints")
+def expire_unenrolled_voiceprints(self, transcript_id: int):
+    """Delete the speaker embeddings of a transcript that nobody enrolled by naming the speaker."""
+    from app.db import SyncSessionLocal
+    from app.models.models import SpeakerVoiceprint
+
+    db = SyncSessionLocal()
+    try:
+        deleted = db.query(SpeakerVoiceprint).filter(SpeakerVoiceprint.transcript_id == transcript_id,
+                                                     SpeakerVoiceprint.enrolled_at.is_(None)).delete(synchronize_session=False)
+        db.commit()
+        if deleted:
+            logger.info("Deleted %s unenrolled voiceprints of transcript %s", deleted, transcript_id)
+    finally:
+        db.close()
+
+
+def enqueue_voiceprint_expiry(transcript_id: int, countdown: int = 0):
+    return expire_unenrolled_voiceprints.apply_async(args=(transcript_id,), countdown=countdown)
+
+
+def _run_transcription(data, audio_id, on_segments=None, on_language=None, diarize=True, quality=None, backlog=0, tier=None,
+                       cache_key=None, **_):
+    from app.core.config import settings
+
+    try:
+        if settings.USE_MODAL_AI:
+            print(f"DEBUG: Using Modal.com for transcription of audio {audio_id}")
+            import modal
+            f = modal.Function.lookup("eden-ai-worker", "transcribe_audio")
+            return f.remote(data, diarize=diarize, quality=quality, backlog=backlog, tier=tier)
+        print(f"DEBUG: Using local worker for transcription of audio {audio_id}")
+        return transcribe.transcribe_bytes_to_segments(data, on_segments=on_segments, diarize=diarize, quality=quality, backlog=backlog, tier=tier,
+                                                       on_language=on_language, cache_key=cache_key)
+    finally:
+        if hasattr(data, "close"):
+            data.close()
+
+
+@celery_app.task(bind=True, name="app.tasks.refine_transcription")
+def refine_transcription(self, transcript_id: int):
+    """Second pass of two-pass transcription: replace a draft with the full-model result."""
+    from app.db import SyncSessionLocal
+    from app.models.models import Transcript
+    from app.core.config import settings
+
+    db = SyncSessionLocal()
+    try:
+        t = db.query(Transcript).filter_by(id=transcript_id).first()
+        if not t or t.status != "draft":
+            logger.info("Transcript %s is not a draft; nothing to refine", transcript_id)
+            return
+        try:
+            a = t.audio_file
+            result = _run_transcription(_open_audio(a), a.id, **_transcription_options(db, a))
+            segments = result.get("segments", [])
+            _apply_voiceprints(db, a, t, result, segments)
+            draft_segments = json.loads(crypto.decrypt_text(t.segments)) if t.segments else []
+            changed = refine.material_change(draft_segments, segments, settings.TRANSCRIBE_REFINE_MIN_CHANGE)
+
+            segments_json = json.dumps(segments)
+            enc_segments = crypto.encrypt_text(segments_json)
+            t.segments = enc_segments
+            t.encrypted = (enc_segments != segments_json)
+            t.detected_language = result.get("detected_language")
+            t.model_tier = result.get("model_tier")
+            words = word_timings.decode_result(result)
+            t.word_timings = crypto.encrypt_bytes(words) if words else None
+            t.status = "completed"
+            db.add(t)
+            db.commit()
+            debug_log(f"SUCCESS: Refined transcript {transcript_id} (material change: {changed})")
+
+            if changed:
+                enqueue_summarization(t.id)
+                enqueue_extraction(t.id)
+            else:
+                # the draft-based summary stands; deliver it now that the transcript is final
+                from app.ai import dedupe
+                ms = db.execute(dedupe.latest_summary_query(t.id)).scalars().first()
+                if ms:
+                    _enqueue_summary_deliveries(db, ms)
+            return t.id
+        except Exception as exc:
+            # the draft stays usable if refinement keeps failing
+            logger.exception("Refinement failed for transcript %s", transcript_id)
+            db.rollback()
+            raise self.retry(exc=exc, countdown=30)
+    finally:
+        db.close()
+
+
+def enqueue_refinement(transcript_id: int, countdown: int = 0):
+    return refine_transcription.apply_async(args=(transcript_id,), countdown=countdown)
+
+
+def _start_transcript(db, a):
+    """Create (or, on retry, reset) the in-progress Transcript row for audio `a`."""
+    from app.models.models import Transcript
+
+    tr = db.query(Transcript).filter(Transcript.audio_file_id == a.id, Transcript.status != "completed").order_by(Transcript.id.desc()).first()
+    if tr:
+        tr.chunks.clear()
+    else:
+        tr = Transcript(audio_file_id=a.id, meeting_id=a.meeting_id, segments="[]")
+        db.add(tr)
+    tr.status = "processing"
+    tr.progress = 0.0
+    db.commit()
+    db.refresh(tr)
+    return tr
+
+
+def _reuse_transcript_by_hash(db, a) -> bool:
+    """Clone an existing transcript of byte-identical audio onto `a`, if there is one."""
+    from app.core.config import settings
+    from app.ai import dedupe
+
+    organization_id = a.meeting.organization_id if a.meeting else None
+    src = db.execute(dedupe.reusable_transcript_query(a.content_sha256, organization_id, a.meeting_id,
+                                                      exclude_audio_id=a.id)).scalars().first()
+    if not src:
+        return False
+
+    logger.info("Audio %s matches audio %s by content hash; reusing transcript %s", a.id, src.audio_file_id, src.id)
+    tr = dedupe.clone_transcript(src, a.id, a.meeting_id)
+    db.add(tr)
+    a.processed = True
+    db.add(a)
+    db.commit()
+    db.refresh(tr)
+
+    summary = extraction = None
+    if settings.DEDUPE_CLONE_DOWNSTREAM:
+        summary = db.execute(dedupe.latest_summary_query(src.id)).scalars().first()
+        extraction = db.execute(dedupe.latest_extraction_query(src.id)).scalars().first()
+        if summary:
+            summary = dedupe.clone_summary(summary, tr)
+            db.add(summary)
+        if extraction:
+            db.add(dedupe.clone_extraction(extraction, tr))
+        db.commit()
+
+    if summary:
+        _enqueue_summary_deliveries(db, summary)
+    else:
+        enqueue_summarization(tr.id)
+    if not extraction:
+        enqueue_extraction(tr.id)
+    return True
+
 
 def enqueue_transcription(audio_id: int, countdown: int = 0):
     return process_transcription.apply_async(args=(audio_id,), countdown=countdown)
@@ -290,7 +666,8 @@ def process_summarization(self, transcript_id: int, length: str = "short", tone:
                     segments = json.loads(t.segments)
             
             debug_log(f"DEBUG: Summarizing {len(segments)} segments for transcript {transcript_id}")
-            result = summarize.summarize_from_segments(segments, length=length, tone=tone)
+            extracted = facts.load_or_compute(db, t.id, segments, _meeting_roster(db, t))["result"]
+            result = summarize.summarize_from_segments(segments, length=length, tone=tone, extraction=extracted)
             exec_text = result.get("executive_summary", "")
             enc_exec = crypto.encrypt_text(exec_text)
             ms = MeetingSummary(transcript_id=t.id, meeting_id=t.meeting_id, executive_summary=enc_exec, key_points=json.dumps(result.get("key_points",[])), decisions=json.dumps(result.get("decisions",[])), risks=json.dumps(result.get("risks",[])), length=length, tone=tone, encrypted=(enc_exec != exec_text))
@@ -299,21 +676,16 @@ def process_summarization(self, transcript_id: int, length: str = "short", tone:
             db.refresh(ms)
             debug_log(f"SUCCESS: process_summarization saved for transcript {transcript_id}")
 
-            # enqueue delivery to registered meeting participants (if any)
-            try:
-                from app.models.models import Participant, User
-                from app.tasks import enqueue_send_summary
-
-                if ms.meeting_id:
-                    participants = db.query(Participant).filter_by(meeting_id=ms.meeting_id).all()
-                    for p in participants:
-                        user = db.query(User).filter_by(email=p.email).first()
-                        if user:
-                            enqueue_send_summary(ms.id, user.id, include_transcript_link=True)
-            except Exception:
-                logger.exception("Failed to enqueue summary deliveries for summary %s", ms.id)
+            # enqueue delivery to registered meeting participants (if any);
+            # summaries of a draft are delivered once refinement settles
+            db.refresh(t)
+            if t.status != "draft":
+                _enqueue_summary_deliveries(db, ms)
 
             return ms.id
+        except facts.FactsPending as exc:
+            debug_log(f"DEBUG: Waiting for extraction facts of transcript {transcript_id}")
+            raise self.retry(exc=exc, countdown=FACTS_WAIT_SECONDS, max_retries=FACTS_WAIT_RETRIES)
         except Exception as exc:
             debug_log(f"FAILURE: process_summarization for transcript {transcript_id}: {str(exc)}")
             logger.exception("Summarization failed for %s", transcript_id)
@@ -322,6 +694,34 @@ def process_summarization(self, transcript_id: int, length: str = "short", tone:
         db.close()
 
 
+def _enqueue_summary_deliveries(db, ms):
+    try:
+        from app.models.models import Participant, User
+
+        if ms.meeting_id:
+            participants = db.query(Participant).filter_by(meeting_id=ms.meeting_id).all()
+            for p in participants:
+                user = db.query(User).filter_by(email=p.email).first()
+                if user:
+                    enqueue_send_summary(ms.id, user.id, include_transcript_link=True)
+    except Exception:
+        logger.exception("Failed to enqueue summary deliveries for summary %s", ms.id)
+
+
+def _meeting_roster(db, t):
+    """People action items of `t` can be assigned to: the meeting's participants and organizer."""
+    from app.models.models import Meeting, Participant
+
+    if not t.meeting_id:
+        return []
+    roster = [{"display_name": p.display_name, "email": p.email}
+              for p in db.query(Participant).filter_by(meeting_id=t.meeting_id).order_by(Participant.id)]
+    meeting = db.query(Meeting).filter_by(id=t.meeting_id).first()
+    if meeting and meeting.organizer:
+        roster.append({"display_name": meeting.organizer.display_name, "email": meeting.organizer.email})
+    return roster
+
+
 def enqueue_summarization(transcript_id: int, length: str = "short", tone: str = "formal", countdown: int = 0):
     return process_summarization.apply_async(args=(transcript_id, length, tone), countdown=countdown)
 
@@ -354,7 +754,7 @@ def process_extraction(self, transcript_id: int):
                     segments = json.loads(t.segments)
             
             debug_log(f"DEBUG: Extracting from {len(segments)} segments for transcript {transcript_id}")
-            result = extract.extract_from_segments(segments)
+            result = facts.load_or_compute(db, t.id, segments, _meeting_roster(db, t))["result"]
             items_json = json.dumps(result.get("items", []))
             conf = result.get("confidence")
             enc_items = crypto.encrypt_text(items_json)
@@ -362,6 +762,13 @@ def process_extraction(self, transcript_id: int):
             db.add(ex)
             db.commit()
             debug_log(f"SUCCESS: process_extraction saved for transcript {transcript_id}")
+            from app.ai import llm
+            stats = llm.cache_stats()
+            if stats:
+                logger.info("LLM response cache: %s", stats)
+        except facts.FactsPending as exc:
+            debug_log(f"DEBUG: Waiting for extraction facts of transcript {transcript_id}")
+            raise self.retry(exc=exc, countdown=FACTS_WAIT_SECONDS, max_retries=FACTS_WAIT_RETRIES)
         except Exception as exc:
             debug_log(f"FAILURE: process_extraction for transcript {transcript_id}: {str(exc)}")
             logger.exception("Extraction failed for %s", transcript_id)
@@ -374,6 +781,44 @@ def enqueue_extraction(transcript_id: int, countdown: int = 0):
     return process_extraction.apply_async(args=(transcript_id,), countdown=countdown)
 
 
+@celery_app.task(bind=True, name="app.tasks.train_intent_model")
+def train_intent_model(self):
+    """Fit the local intent model on LLM-labelled statements from stored extraction facts."""
+    from app.db import SyncSessionLocal
+    from app.models.models import ExtractionFacts
+    from app.core.config import settings
+    from app.ai import extract, intent_model
+
+    if not settings.INTENT_MODEL_PATH:
+        logger.info("INTENT_MODEL_PATH is not set; not training an intent model")
+        return None
+
+    db = SyncSessionLocal()
+    try:
+        def stored_facts():
+            for row in db.query(ExtractionFacts).filter(ExtractionFacts.facts.isnot(None)).yield_per(100):
+                try:
+                    yield json.loads(crypto.decrypt_text(row.facts))
+                except Exception:
+                    logger.warning("Skipping unreadable extraction facts %s", row.id)
+
+        texts, labels = intent_model.training_examples(stored_facts())
+    finally:
+        db.close()
+
+    if len(texts) < settings.INTENT_MODEL_MIN_EXAMPLES:
+        logger.info("Only %s LLM-labelled statements; need %s to train the intent model", len(texts), settings.INTENT_MODEL_MIN_EXAMPLES)
+        return None
+    model = intent_model.train(texts, labels, extract.INTENTS)
+    model.save(settings.INTENT_MODEL_PATH)
+    logger.info("Trained intent model on %s statements -> %s", len(texts), settings.INTENT_MODEL_PATH)
+    return len(texts)
+
+
+def enqueue_intent_model_training(countdown: int = 0):
+    return train_intent_model.apply_async(countdown=countdown)
+
+
 @celery_app.task(bind=True, name="app.tasks.process_send_summary", max_retries=3)
 def process_send_summary(self, summary_id: int, user_id: int, include_transcript_link: bool = False):
     """Send a meeting summary email to a user and persist EmailDelivery status."""
@@ -447,7 +892,7 @@ def process_delete_user(self, user_id: int):
     import asyncio
     from app.db import AsyncSessionLocal
     from sqlalchemy import select
-    from app.models.models import User, Participant, Recording, AudioFile, Transcript, TranslatedTranscript, MeetingSummary, Extraction, ConsentRecord, EmailDelivery
+    from app.models.models import User, Participant, Recording, AudioFile, Transcript, TranslatedTranscript, MeetingSummary, Extraction, ConsentRecord, EmailDelivery, SpeakerVoiceprint
     from app.storage import storage
 
     async def _run():
@@ -480,6 +925,10 @@ def process_delete_user(self, user_id: int):
             cres = await db.execute(select(ConsentRecord).filter_by(user_id=user_id))
             for c in cres.scalars().all():
                 await db.delete(c)
+            # voiceprints are biometric data
+            vres = await db.execute(select(SpeakerVoiceprint).filter((SpeakerVoiceprint.user_id == user_id) | (SpeakerVoiceprint.email == u.email)))
+            for vp in vres.scalars().all():
+                await db.delete(vp)
             # finally delete user
             await db.delete(u)
             await db.commit()
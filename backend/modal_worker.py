@@ -1,6 +1,6 @@
 import modal
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 # Define the Modal image with all AI dependencies
 image = (
@@ -31,10 +31,11 @@ volume = modal.Volume.from_name("eden-models", create_if_missing=True)
     secrets=[modal.Secret.from_name("eden-secrets")],  # HF_TOKEN, OPENAI_API_KEY, DATABASE_URL
     timeout=600,
 )
-def transcribe_audio(audio_bytes: bytes) -> Dict[str, Any]:
+def transcribe_audio(audio_bytes: bytes, diarize: bool = True, quality: Optional[str] = None, backlog: int = 0,
+                     tier: Optional[str] = None) -> Dict[str, Any]:
     """Transcribe audio using WhisperX on a serverless GPU."""
     from app.ai.transcribe import transcribe_bytes_to_segments
-    return transcribe_bytes_to_segments(audio_bytes)
+    return transcribe_bytes_to_segments(audio_bytes, diarize=diarize, quality=quality, backlog=backlog, tier=tier)
 
 @app.function(
     image=image,
@@ -0,0 +1,22 @@
+"""Shared test setup.
+
+Importing any `app` module binds the database engine from `DATABASE_URL`, so
+it is pointed at a throwaway sqlite file here, before any test module is
+collected. Otherwise whichever test module imported `app` first decided which
+database the API tests ran against.
+"""
+import os
+import shutil
+import tempfile
+
+import pytest
+
+_DB_DIR = tempfile.mkdtemp(prefix="eden-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+os.environ.setdefault("API_TOKEN", "")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _test_database():
+    yield
+    shutil.rmtree(_DB_DIR, ignore_errors=True)
@@ -0,0 +1,26 @@
+import numpy as np
+
+from app.ai import analysis, peaks
+
+
+def test_chunked_analysis_matches_whole_file_pass():
+    sr = 16000
+    rng = np.random.default_rng(0)
+    audio = (rng.standard_normal(sr * 10 + 123) * 0.1).astype(np.float32)
+    audio[sr * 2: sr * 4] = 0.0  # two seconds of silence
+
+    result = analysis.analyse_audio(audio, sr, chunk_seconds=0.7, workers=3)
+    whole = peaks.compute_peaks(audio, sr)
+
+    assert result.meta["chunks"] > 10
+    for got, expected in zip(result.peaks.levels, whole.levels):
+        np.testing.assert_array_equal(got.data, expected.data)
+    assert result.meta["silences"] == [[2.0, 4.0]]
+    assert abs(result.meta["rms_dbfs"] - 20 * np.log10(np.sqrt(np.mean(audio.astype(np.float64) ** 2)))) < 0.1
+    assert 0.19 < result.meta["silence_ratio"] < 0.21
+
+
+def test_silent_spans_respects_minimum_length():
+    silent = np.array([1, 1, 0, 1, 1, 1, 0, 1], dtype=bool)
+    assert analysis.silent_spans(silent, 2) == [(0, 2), (3, 6)]
+    assert analysis.silent_spans(silent, 3) == [(3, 6)]
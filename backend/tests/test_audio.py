@@ -0,0 +1,43 @@
+import asyncio
+import io
+import shutil
+import wave
+
+import numpy as np
+import pytest
+
+from app.ai import audio
+from app.storage import LocalStorage
+
+pytestmark = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+
+
+def _wav(seconds, sr=44100, channels=2):
+    t = np.arange(int(seconds * sr)) / sr
+    tone = (np.sin(2 * np.pi * 440 * t) * 12000).astype(np.int16)
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(sr)
+        w.writeframes(np.repeat(tone, channels).tobytes())
+    return buf.getvalue()
+
+
+def test_streamed_decode_matches_file_decode(tmp_path):
+    data = _wav(1.5)
+    store = LocalStorage(str(tmp_path))
+    (tmp_path / "audio").mkdir()
+    (tmp_path / "audio" / "call").write_bytes(data)  # no suffix: the container is probed from the bytes
+
+    stream = asyncio.run(store.open_stream("audio/call"))
+    try:
+        streamed = audio.decode_audio(stream)
+    finally:
+        stream.close()
+    from_file = audio._decode_file(data, audio.SAMPLE_RATE)  # the old temp-file path
+
+    assert streamed.dtype == np.float32
+    assert len(streamed) == len(from_file) == int(1.5 * audio.SAMPLE_RATE)
+    np.testing.assert_array_equal(streamed, from_file)
+    np.testing.assert_array_equal(audio.decode_audio(data), from_file)
@@ -1,21 +1,9 @@
-import os
-
-# Use an isolated sqlite file for tests
-os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./test_auth.db")
-# Disable global API token middleware for tests
-os.environ.setdefault("API_TOKEN", "")
-
+# tests/conftest.py points DATABASE_URL at a throwaway sqlite file and disables API_TOKEN
 from fastapi.testclient import TestClient
 from app.main import app
 
 
 def test_auth_flow():
-    # ensure clean DB
-    try:
-        os.remove("test_auth.db")
-    except Exception:
-        pass
-
     with TestClient(app) as client:
         # register
         r = client.post("/auth/register", json={"email": "alice@test.com", "password": "s3cret", "display_name": "Alice"})
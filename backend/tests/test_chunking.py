@@ -0,0 +1,72 @@
+import numpy as np
+
+from app.ai import chunking
+from app.ai.chunking import SAMPLE_RATE, merge_chunk_segments, plan_chunks, should_chunk
+from app.core.config import settings
+
+
+def _tone(seconds):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (0.5 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def test_short_audio_is_single_chunk():
+    audio = _tone(5)
+    assert plan_chunks(audio, chunk_seconds=10, overlap_seconds=1) == [(0, len(audio), len(audio))]
+
+
+def test_cuts_land_in_silence():
+    silence = np.zeros(2 * SAMPLE_RATE, dtype=np.float32)
+    audio = np.concatenate([_tone(9), silence, _tone(9), silence, _tone(9)])
+    chunks = plan_chunks(audio, chunk_seconds=10, overlap_seconds=1, search_seconds=3)
+
+    assert len(chunks) == 3
+    for _, _, owned_end in chunks[:-1]:
+        assert np.all(audio[owned_end - 100:owned_end + 100] == 0)
+    # contiguous ownership covering the full recording
+    assert chunks[0][0] == 0 and chunks[-1][2] == len(audio)
+    for prev, nxt in zip(chunks, chunks[1:]):
+        assert prev[2] == nxt[0]
+        assert prev[1] > prev[2]  # overlap past the cut
+
+
+def test_merge_rebases_and_dedupes_seam():
+    merged = merge_chunk_segments([
+        (0.0, 10.0, [
+            {"start": 0.0, "end": 4.0, "text": "Hello team."},
+            {"start": 8.0, "end": 10.5, "text": "Next we will review"},
+            {"start": 10.2, "end": 11.0, "text": "the budget"},  # owned by next chunk
+        ]),
+        (10.0, 20.0, [
+            {"start": 0.0, "end": 2.0, "text": "review the budget today."},
+        ]),
+    ])
+
+    assert [s["text"] for s in merged] == ["Hello team.", "Next we will review", "the budget today."]
+    assert merged[2]["start"] == 10.5 and merged[2]["end"] == 12.0
+
+
+def test_chunk_pool_is_cpu_only(monkeypatch):
+    monkeypatch.setattr(settings, "TRANSCRIBE_CHUNK_WORKERS", 4)
+    monkeypatch.setattr(settings, "TRANSCRIBE_CHUNKED_MIN_SECONDS", 1.0)
+    audio = np.zeros(SAMPLE_RATE * 2, dtype=np.float32)
+    assert should_chunk(audio, "cpu")
+    assert not should_chunk(audio, "cuda")
+
+
+def test_daemonic_workers_transcribe_chunks_in_process(monkeypatch):
+    class _Daemon:
+        daemon = True
+
+    monkeypatch.setattr(chunking.multiprocessing, "current_process", lambda: _Daemon())
+    monkeypatch.setattr(settings, "TRANSCRIBE_CHUNK_WORKERS", 4)
+    monkeypatch.setattr(settings, "TRANSCRIBE_CHUNKED_MIN_SECONDS", 1.0)
+    monkeypatch.setattr(chunking, "_pool", None)
+    monkeypatch.setattr(chunking, "_transcribe_chunk", lambda audio, *args: {
+        "segments": [{"start": 0.0, "end": len(audio) / SAMPLE_RATE - 1.0, "text": "chunk"}], "language": "en"})
+    audio = _tone(40)
+    assert not should_chunk(audio, "cpu")
+
+    result = chunking.transcribe_chunked(audio, "small", "cpu", "int8", 4, chunk_seconds=10.0, workers=4)
+    assert len(result["segments"]) > 1 and result["language"] == "en"
+    assert chunking._pool is None  # no process pool was started
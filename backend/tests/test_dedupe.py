@@ -0,0 +1,71 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.ai import dedupe
+from app.db import Base
+from app.models.models import AudioFile, Meeting, Organization, Transcript
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _transcribed(db, key, sha, meeting=None):
+    audio = AudioFile(s3_key=key, content_sha256=sha, meeting_id=meeting.id if meeting else None)
+    db.add(audio)
+    db.flush()
+    tr = Transcript(audio_file_id=audio.id, meeting_id=audio.meeting_id, segments="[]", status="completed")
+    db.add(tr)
+    db.commit()
+    return audio, tr
+
+
+def _reusable(db, sha, organization_id, meeting_id, exclude_audio_id=None):
+    return db.execute(dedupe.reusable_transcript_query(sha, organization_id, meeting_id,
+                                                       exclude_audio_id=exclude_audio_id)).scalars().first()
+
+
+def test_sha256_bytes_matches_hashlib():
+    import hashlib
+    data = bytes(range(256)) * 9000  # spans several hash chunks
+    assert dedupe.sha256_bytes(data) == hashlib.sha256(data).hexdigest()
+
+
+def test_reuse_stays_within_the_organization(db):
+    org_a, org_b = Organization(name="A"), Organization(name="B")
+    db.add_all([org_a, org_b])
+    db.flush()
+    meeting_a, other_a, meeting_b = (Meeting(title="a1", organization_id=org_a.id),
+                                     Meeting(title="a2", organization_id=org_a.id),
+                                     Meeting(title="b", organization_id=org_b.id))
+    db.add_all([meeting_a, other_a, meeting_b])
+    db.commit()
+    sha = "ab" * 32
+    audio_a, tr_a = _transcribed(db, "audio/a.wav", sha, meeting_a)
+
+    assert _reusable(db, sha, org_a.id, other_a.id).id == tr_a.id
+    assert _reusable(db, sha, org_b.id, meeting_b.id) is None  # org B never sees org A's transcript
+    assert _reusable(db, sha, org_a.id, meeting_a.id, exclude_audio_id=audio_a.id) is None
+    assert _reusable(db, "cd" * 32, org_a.id, meeting_a.id) is None
+
+    clone = dedupe.clone_transcript(tr_a, 99, other_a.id)
+    assert (clone.audio_file_id, clone.meeting_id, clone.segments) == (99, other_a.id, tr_a.segments)
+
+
+def test_audio_outside_organizations_only_reuses_its_meeting(db):
+    meeting, other = Meeting(title="m"), Meeting(title="n")
+    db.add_all([meeting, other])
+    db.commit()
+    sha = "ef" * 32
+    _, tr = _transcribed(db, "audio/m.wav", sha, meeting)
+    _transcribed(db, "audio/loose.wav", sha)
+
+    assert _reusable(db, sha, None, meeting.id).id == tr.id
+    assert _reusable(db, sha, None, other.id) is None
+    assert _reusable(db, sha, None, None) is None
@@ -0,0 +1,80 @@
+import sys
+import threading
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import tasks
+from app.ai import transcribe
+from app.ai.policy import ModelChoice
+from app.db import Base
+from app.models import models
+from app.models.models import AudioFile, Meeting
+
+
+@pytest.fixture
+def stages(monkeypatch):
+    """Replace the model stages of transcribe_local; returns what ran and what assign_speakers got."""
+    seen = {"diarized": False, "diarization": "unset"}
+    asr_started, diarization_started = threading.Event(), threading.Event()
+
+    def run_asr(audio, device, **kwargs):
+        asr_started.set()
+        # only returns if diarization runs at the same time
+        seen["overlapped"] = diarization_started.wait(5)
+        return {"segments": [{"start": 0.0, "end": 1.0, "text": "hello"}], "language": "en"}
+
+    def run_diarization(audio, device):
+        diarization_started.set()
+        asr_started.wait(5)
+        seen["diarized"] = True
+        return "diarization"
+
+    def assign_speakers(diarization, aligned, language):
+        seen["diarization"] = diarization
+        return {"segments": aligned["segments"]}
+
+    monkeypatch.setattr(transcribe, "get_device", lambda: "cpu")
+    monkeypatch.setattr(transcribe, "load_audio_bytes", lambda data, cache_key=None: np.zeros(16000, dtype=np.float32))
+    monkeypatch.setattr(transcribe, "detect_language", lambda audio, device: "en")
+    monkeypatch.setattr(transcribe, "prefetch_alignment", lambda language, device: None)
+    monkeypatch.setattr(transcribe, "select_model", lambda audio, device, **kwargs: ModelChoice("small", "small", "int8"))
+    monkeypatch.setattr(transcribe, "run_asr", run_asr)
+    monkeypatch.setattr(transcribe, "run_alignment", lambda segments, language, audio, device: {"segments": segments})
+    monkeypatch.setattr(transcribe, "run_diarization", run_diarization)
+    monkeypatch.setattr(transcribe, "assign_speakers", assign_speakers)
+    return seen
+
+
+def test_diarization_runs_alongside_asr(stages):
+    result = transcribe.transcribe_local(b"audio")
+    assert stages["overlapped"] and stages["diarized"]
+    assert stages["diarization"] == "diarization"  # joined at assign_speakers
+    assert result["model_tier"] == "small"
+
+
+def test_single_speaker_skips_diarization(stages):
+    transcribe.transcribe_local(b"audio", diarize=False)
+    assert not stages["diarized"]
+    assert stages["diarization"] is None
+
+
+def test_single_speaker_meetings_turn_diarization_off(monkeypatch):
+    # test_transcription.py swaps app.models.models for a mock when it is collected
+    monkeypatch.setitem(sys.modules, "app.models.models", models)
+    monkeypatch.setattr(tasks.policy, "queue_backlog", lambda: 0)
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    solo, group = Meeting(title="dictation", single_speaker=True), Meeting(title="standup")
+    db.add_all([solo, group])
+    db.commit()
+
+    def options(meeting):
+        return tasks._transcription_options(db, AudioFile(s3_key=meeting.title, meeting_id=meeting.id))
+
+    assert options(solo)["diarize"] is False
+    assert options(group)["diarize"] is True
+    db.close()
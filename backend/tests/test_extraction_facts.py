@@ -0,0 +1,47 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.ai import extract, facts
+from app.models.models import ExtractionFacts
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    ExtractionFacts.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _segments(text):
+    return [{"segment_id": "s1", "start_time": 0.0, "end_time": 2.0, "speaker_id": "A", "original_text": text}]
+
+
+def test_facts_are_computed_once_per_segments_version(db, monkeypatch):
+    calls = []
+    real = extract.extract_facts
+    monkeypatch.setattr(extract, "extract_facts", lambda segments, roster=None: calls.append(1) or real(segments, roster))
+
+    segments = _segments("John will send the report. We decided to launch.")
+    first = facts.load_or_compute(db, 1, segments)
+    assert facts.load_or_compute(db, 1, segments) == first
+    assert len(calls) == 1
+    assert first["result"] == real(segments)["result"]
+    assert {"statements", "intents", "result"} <= set(first)
+
+    facts.load_or_compute(db, 1, _segments("A refined transcript."))  # refinement invalidates them
+    assert len(calls) == 2
+    assert db.query(ExtractionFacts).count() == 1
+
+
+def test_live_claim_makes_the_other_task_wait(db):
+    db.add(ExtractionFacts(transcript_id=2, extractor_version=extract.EXTRACTOR_VERSION,
+                           segments_sha256=facts.segments_digest(_segments("hi")), claimed_at=datetime.now(timezone.utc)))
+    db.commit()
+    with pytest.raises(facts.FactsPending):
+        facts.load_or_compute(db, 2, _segments("hi"))
+    assert facts.load_or_compute(db, 2, _segments("hello"))["result"]["status"] == "partial"
@@ -0,0 +1,89 @@
+import io
+import queue
+
+import numpy as np
+import pytest
+
+from app.ai import inference_server
+from app.ai.policy import ModelChoice
+
+
+class _Pipeline:
+    """Stage functions of app.ai.transcribe, recording the order they run in."""
+
+    def __init__(self, fail_on=None):
+        self.calls = []
+        self.fail_on = fail_on
+
+    def get_device(self):
+        return "cpu"
+
+    def load_audio_bytes(self, data):
+        if isinstance(data, bytes) and data == self.fail_on:
+            raise ValueError("undecodable")
+        return data if isinstance(data, np.ndarray) else np.frombuffer(data, dtype=np.uint8).astype(np.float32)
+
+    def detect_language(self, audio, device):
+        return "en"
+
+    def select_model(self, audio, device, quality=None, backlog=0, tier=None, language=None):
+        return ModelChoice(tier or "small", tier or "small", "int8")
+
+    def run_asr(self, audio, device, model_name=None, compute_type=None, language=None):
+        self.calls.append(("asr", len(audio)))
+        return {"segments": [{"start": 0.0, "end": 1.0, "text": f"{len(audio)} samples"}], "language": language}
+
+    def run_alignment(self, segments, language, audio, device):
+        self.calls.append(("align", len(audio)))
+        return {"segments": segments}
+
+    def run_diarization(self, audio, device):
+        return None
+
+    def assign_speakers(self, diarization, aligned, language):
+        return {"segments": aligned["segments"], "detected_language": language}
+
+
+def test_full_queue_is_rejected():
+    worker = inference_server.InferenceWorker(max_queue=2, batch_size=4, batch_window_ms=0, pipeline=_Pipeline())
+    worker.submit(b"a")
+    worker.submit(b"b")
+    with pytest.raises(queue.Full):
+        worker.submit(b"c")
+
+
+def test_group_runs_stage_by_stage_and_resolves_each_future():
+    pipeline = _Pipeline(fail_on=b"bad")
+    worker = inference_server.InferenceWorker(max_queue=8, batch_size=8, batch_window_ms=50, pipeline=pipeline)
+    futures = [worker.submit(b"xx"), worker.submit(b"bad"), worker.submit(np.zeros(3, dtype=np.float32), tier="base")]
+    group = worker._next_group()
+    assert len(group) == 3
+    worker._run_stages(group)
+
+    assert futures[0].result(timeout=0)["segments"][0]["text"] == "2 samples"
+    with pytest.raises(ValueError, match="undecodable"):
+        futures[1].result(timeout=0)
+    assert futures[2].result(timeout=0)["model_tier"] == "base"
+    # every job's ASR runs before any alignment
+    assert [stage for stage, _ in pipeline.calls] == ["asr", "asr", "align", "align"]
+
+
+def test_worker_thread_fails_the_group_on_unexpected_errors():
+    pipeline = _Pipeline()
+    pipeline.get_device = lambda: (_ for _ in ()).throw(RuntimeError("no device"))
+    worker = inference_server.InferenceWorker(max_queue=4, batch_size=4, batch_window_ms=0, pipeline=pipeline)
+    worker.start()
+    future = worker.submit(b"xx")
+    with pytest.raises(RuntimeError, match="no device"):
+        future.result(timeout=5)
+
+
+def test_request_body_accepts_bytes_streams_and_arrays():
+    assert inference_server._request_body(b"abc") == (b"abc", None)
+    assert inference_server._request_body(bytearray(b"abc")) == (b"abc", None)
+    assert inference_server._request_body(io.BytesIO(b"abc")) == (b"abc", None)
+    samples = np.arange(4, dtype=np.float64)
+    body, fmt = inference_server._request_body(samples)
+    assert fmt == "f32le" and np.array_equal(np.frombuffer(body, dtype=np.float32), samples)
+    with pytest.raises(TypeError):
+        inference_server._request_body(42)
@@ -0,0 +1,40 @@
+from types import SimpleNamespace
+
+from app.ai.audio import parse_ffmpeg_info
+from app.ai.ingest import load_meta, master_key_for, playback_source, processing_source, update_meta
+
+FFMPEG_LOG = """Input #0, matroska,webm, from 'pipe:0':
+  Duration: N/A, start: 0.000000, bitrate: N/A
+  Stream #0:0(eng): Audio: opus, 48000 Hz, stereo, fltp (default)
+Output #0, ogg, to 'pipe:1':
+  Stream #0:0(eng): Audio: opus, 16000 Hz, mono, s16, 32 kb/s (default)
+size=      40KiB time=00:00:09.50 bitrate=  34.4kbits/s speed= 120x\rsize=      87KiB time=00:00:22.37 bitrate=  31.9kbits/s speed= 188x
+"""
+
+
+def _audio(**kw):
+    return SimpleNamespace(**{"s3_key": "audio/abc/call.webm", "content_type": "audio/webm", "master_s3_key": None, "meta": None, **kw})
+
+
+def test_parse_ffmpeg_info_reports_input_stream_and_output_duration():
+    assert parse_ffmpeg_info(FFMPEG_LOG) == {"codec": "opus", "sample_rate": 48000, "channels": 2, "duration_seconds": 22.37}
+
+
+def test_meta_keeps_client_metadata():
+    a = _audio(meta="not json")
+    update_meta(a, duration_seconds=3.5)
+    assert load_meta(a) == {"client": "not json", "duration_seconds": 3.5}
+
+
+def test_sources_prefer_master_and_fall_back_to_original():
+    a = _audio()
+    assert processing_source(a) == ("audio/abc/call.webm", "audio/webm")
+
+    a.master_s3_key = master_key_for(a.s3_key, "opus")
+    update_meta(a, master={"content_type": "audio/ogg"}, original_expired=False)
+    assert a.master_s3_key == "audio/abc/master.opus"
+    assert processing_source(a) == ("audio/abc/master.opus", "audio/ogg")
+    assert playback_source(a) == ("audio/abc/call.webm", "audio/webm")
+
+    update_meta(a, original_expired=True)
+    assert playback_source(a) == ("audio/abc/master.opus", "audio/ogg")
@@ -0,0 +1,41 @@
+import json
+import re
+
+from app.ai import batching, extract
+from app.ai.extract import NormalizedStatement
+
+
+def test_pack_batches_respects_budget_and_overlap():
+    texts = ["x" * 40] * 10  # 10 + 8 tokens each
+    batches = batching.pack_batches(texts, budget=60, overlap=1)
+    assert [b.items for b in batches] == [[0, 1, 2], [3, 4], [5, 6], [7, 8], [9]]
+    assert [b.context for b in batches] == [[], [2], [4], [6], [8]]
+    assert batching.pack_batches(["y" * 1000], budget=60)[0].items == [0]  # oversized text still goes out
+
+
+class _FakeClient:
+    def __init__(self):
+        self.prompts = []
+
+    def complete_many(self, prompts, system_prompt, default=None):
+        self.prompts.extend(prompts)
+        responses = []
+        for prompt in prompts:
+            to_classify = prompt.split("Statements to classify")[1]
+            ids = re.findall(r'"id": "(s\d+)"', to_classify)
+            # leave the first statement out to exercise the keyword fallback
+            responses.append(json.dumps({"classifications": [{"id": i, "intent": "QUESTION"} for i in ids if i != "s0"]}))
+        return responses
+
+
+def test_classify_intents_batches_and_reassembles(monkeypatch):
+    fake = _FakeClient()
+    monkeypatch.setattr(extract.llm, "get_client", lambda: fake)
+    monkeypatch.setattr(extract.settings, "INTENT_BATCH_TOKENS", 40)
+    statements = [NormalizedStatement(original_segment_id=str(i), normalized_text=f"We agreed on item {i}", confidence=1.0)
+                  for i in range(12)]
+    result = extract.classify_intents(statements)
+    assert len(fake.prompts) > 1
+    assert [c.segment_id for c in result] == [str(i) for i in range(12)]
+    assert result[0].intent == "DECISION"  # keyword fallback
+    assert all(c.intent == "QUESTION" for c in result[1:])
@@ -0,0 +1,92 @@
+import json
+import os
+import re
+
+import numpy as np
+
+from app.ai import extract, intent_model
+from app.ai.extract import NormalizedStatement
+
+_EXAMPLES = {
+    "QUESTION": ["can we ship {} by friday ?", "what is the status of {} ?", "who owns {} ?"],
+    "DECISION": ["we decided to go with {}", "agreed we drop {}", "final call is {} it is"],
+    "OFF_TOPIC": ["how was your weekend with {}", "the coffee here is like {}", "did anyone watch {} last night"],
+}
+_NOUNS = ["billing", "search", "onboarding", "the api", "mobile", "reports", "exports", "alerts"]
+
+
+def _dataset():
+    texts, labels = [], []
+    for label, templates in _EXAMPLES.items():
+        for template in templates:
+            for noun in _NOUNS:
+                texts.append(template.format(noun))
+                labels.append(label)
+    return texts, labels
+
+
+def test_model_learns_and_round_trips(tmp_path):
+    texts, labels = _dataset()
+    model = intent_model.train(texts, labels, extract.INTENTS, epochs=50, n_features=1 << 12)
+    predicted, probs = model.predict(["what is the status of payroll ?", "we decided to go with payroll"])
+    assert predicted == ["QUESTION", "DECISION"]
+    assert (probs > 0.5).all()
+
+    path = str(tmp_path / "intents.npz")
+    model.save(path)
+    loaded = intent_model.IntentModel.load(path)
+    assert loaded.labels == list(extract.INTENTS)
+    assert np.array_equal(loaded.weights, model.weights)
+
+
+def test_training_examples_keep_only_llm_labels():
+    facts = [{
+        "statements": [{"normalized_text": "a"}, {"normalized_text": "b"}, {"normalized_text": "c"}],
+        "intents": [{"intent": "RISK", "source": "llm"}, {"intent": "RISK", "source": "model"},
+                    {"intent": "QUESTION", "confidence": 0.9}],  # written before labels had a source
+    }]
+    assert intent_model.training_examples(facts) == (["a"], ["RISK"])
+
+
+def test_failed_load_is_retried(tmp_path, monkeypatch):
+    from app.core.config import settings
+    path = tmp_path / "intents.npz"
+    path.write_bytes(b"not a model")
+    monkeypatch.setattr(settings, "INTENT_MODEL_PATH", str(path))
+    monkeypatch.setattr(intent_model, "_model", None)
+    monkeypatch.setattr(intent_model, "_model_key", None)
+    assert intent_model.get_model() is None
+    bad_mtime = os.path.getmtime(path)
+
+    texts, labels = _dataset()
+    intent_model.train(texts, labels, extract.INTENTS, epochs=1, n_features=1 << 8).save(str(path))
+    os.utime(path, (bad_mtime, bad_mtime))  # the failed load must not have been remembered
+    assert intent_model.get_model() is not None
+
+
+class _FakeClient:
+    def __init__(self):
+        self.classified = []
+
+    def complete_many(self, prompts, system_prompt, default=None):
+        responses = []
+        for prompt in prompts:
+            ids = re.findall(r'"id": "(s\d+)"', prompt.split("Statements to classify")[1])
+            self.classified.extend(ids)
+            responses.append(json.dumps({"classifications": [{"id": i, "intent": "RISK"} for i in ids]}))
+        return responses
+
+
+def test_only_uncertain_statements_reach_the_llm(tmp_path, monkeypatch):
+    texts, labels = _dataset()
+    path = str(tmp_path / "intents.npz")
+    intent_model.train(texts, labels, extract.INTENTS, epochs=50, n_features=1 << 12).save(path)
+    fake = _FakeClient()
+    monkeypatch.setattr(extract.settings, "INTENT_MODEL_PATH", path)
+    monkeypatch.setattr(extract.llm, "get_client", lambda: fake)
+
+    statements = [NormalizedStatement(original_segment_id=str(i), normalized_text=t, confidence=1.0) for i, t in
+                  enumerate(["who owns search ?", "the vendor contract lapses in march", "agreed we drop alerts"])]
+    result = extract.classify_intents(statements)
+    assert fake.classified == ["s1"]
+    assert [(c.intent, c.source) for c in result] == [("QUESTION", "model"), ("RISK", "llm"), ("DECISION", "model")]
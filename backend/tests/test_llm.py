@@ -0,0 +1,84 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.ai.llm import LLMClient
+
+
+class _Stub(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+    failures_left = 0
+    connections = set()
+
+    def do_POST(self):
+        cls = type(self)
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with cls.lock:
+            cls.connections.add(self.client_address)
+            cls.in_flight += 1
+            cls.peak = max(cls.peak, cls.in_flight)
+            fail = cls.failures_left > 0
+            cls.failures_left -= fail
+        time.sleep(0.1)
+        with cls.lock:
+            cls.in_flight -= 1
+        if fail:
+            payload, code = {"error": {"message": "overloaded"}}, 503
+        else:
+            code = 200
+            payload = {
+                "id": "x", "object": "chat.completion", "created": 0, "model": body["model"],
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": body["messages"][-1]["content"].upper()}}],
+            }
+        data = json.dumps(payload).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _serve():
+    _Stub.in_flight = _Stub.peak = _Stub.failures_left = 0
+    _Stub.connections = set()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Stub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+def test_concurrent_requests_are_bounded_and_pooled():
+    server, url = _serve()
+    try:
+        client = LLMClient("test", base_url=url, max_concurrency=3, max_retries=0)
+        prompts = [f"p{i}" for i in range(9)]
+        assert client.complete_many(prompts) == [p.upper() for p in prompts]
+        assert _Stub.peak == 3
+        assert len(_Stub.connections) <= 3  # keep-alive: connections are reused across requests
+
+        assert asyncio.run(client.acomplete_many(prompts)) == [p.upper() for p in prompts]
+        assert _Stub.peak == 3
+        client.close()
+    finally:
+        server.shutdown()
+
+
+def test_retries_then_falls_back_to_default():
+    server, url = _serve()
+    try:
+        _Stub.failures_left = 1
+        assert LLMClient("test", base_url=url, max_retries=1).complete("hi") == "HI"
+
+        _Stub.failures_left = 10
+        client = LLMClient("test", base_url=url, max_retries=0)
+        assert client.complete_many(["a", "b"], default="{}") == ["{}", "{}"]
+    finally:
+        server.shutdown()
@@ -0,0 +1,62 @@
+import os
+import sqlite3
+import time
+
+from app.ai.llm import LLMClient
+from app.ai.llm_cache import SQLiteLLMCache, fingerprint
+
+
+def test_sqlite_cache_ttl_lru_and_stats(tmp_path):
+    cache = SQLiteLLMCache(str(tmp_path / "llm.sqlite3"), ttl_seconds=3600, max_bytes=250)
+    key = fingerprint("gpt-4o", "system", "prompt")
+    assert key != fingerprint("gpt-4o", "system", "prompt", json_mode=False)
+    assert cache.get(key) is None
+    cache.put(key, "x" * 100)
+    assert cache.get(key) == "x" * 100
+
+    time.sleep(0.01)
+    cache.put("b", "y" * 100)
+    cache.get(key)  # key is now the most recently used
+    time.sleep(0.01)
+    cache.put("c", "z" * 100)  # over budget: "b" goes
+    assert cache.get("b") is None and cache.get(key) is not None and cache.get("c") is not None
+    assert cache.stats() == {"hits": 4, "misses": 2, "hit_rate": 0.6667}
+
+    expired = SQLiteLLMCache(str(tmp_path / "llm.sqlite3"), ttl_seconds=0, max_bytes=250)
+    assert expired.get(key) is None
+
+
+def test_sqlite_cache_encrypts_values(tmp_path, monkeypatch):
+    from cryptography.fernet import Fernet
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "ENCRYPTION_KEY", Fernet.generate_key().decode())
+    path = str(tmp_path / "llm.sqlite3")
+    cache = SQLiteLLMCache(path, ttl_seconds=3600, max_bytes=10_000)
+    cache.put("k", '{"summary": "secret plans"}')
+    assert cache.get("k") == '{"summary": "secret plans"}'
+    assert os.stat(path).st_mode & 0o777 == 0o600
+    stored = sqlite3.connect(path).execute("SELECT value FROM llm_cache").fetchone()[0]
+    assert "secret" not in stored
+
+    monkeypatch.setattr(settings, "ENCRYPTION_KEY", Fernet.generate_key().decode())
+    assert cache.get("k") is None  # unreadable under the new key: a miss, not ciphertext
+
+
+class _Completions:
+    def __init__(self):
+        self.calls = 0
+
+    def create(self, **request):
+        self.calls += 1
+        message = type("M", (), {"content": "{\"ok\": true}"})
+        return type("R", (), {"choices": [type("C", (), {"message": message})]})
+
+
+def test_client_answers_repeated_prompts_from_cache(tmp_path):
+    client = LLMClient("test", cache=SQLiteLLMCache(str(tmp_path / "llm.sqlite3"), 3600, 10 ** 6))
+    completions = _Completions()
+    client._sync = type("S", (), {"chat": type("Chat", (), {"completions": completions})})
+    assert client.complete("same prompt") == client.complete("same prompt") == "{\"ok\": true}"
+    assert completions.calls == 1
+    client.complete("same prompt", system_prompt="other")
+    assert completions.calls == 2
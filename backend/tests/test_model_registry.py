@@ -0,0 +1,33 @@
+from app.ai.registry import ModelRegistry
+
+
+def test_resident_models_are_loaded_once():
+    reg = ModelRegistry(align_budget_bytes=1024)
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return object()
+
+    first = reg.get_or_load("asr", ("large-v3", "cpu", "int8", None), loader)
+    second = reg.get_or_load("asr", ("large-v3", "cpu", "int8", None), loader)
+    assert first is second
+    assert len(loads) == 1
+    stats = reg.stats()["models"]["asr"]
+    assert stats["hits"] == 1 and stats["misses"] == 1
+
+
+def test_align_models_evicted_lru_under_budget():
+    reg = ModelRegistry(align_budget_bytes=100)
+    size = lambda _: 40
+
+    reg.get_or_load_lru(("en", "cpu"), lambda: "en", size)
+    reg.get_or_load_lru(("fr", "cpu"), lambda: "fr", size)
+    # touch "en" so "fr" becomes least recently used
+    reg.get_or_load_lru(("en", "cpu"), lambda: "en-reloaded", size)
+    reg.get_or_load_lru(("de", "cpu"), lambda: "de", size)
+
+    assert reg.get_or_load_lru(("en", "cpu"), lambda: "en-reloaded", size) == "en"
+    assert reg.get_or_load_lru(("fr", "cpu"), lambda: "fr-reloaded", size) == "fr-reloaded"
+    assert reg.stats()["models"]["align"]["evictions"] >= 1
+    assert reg.stats()["align_bytes"] <= 100
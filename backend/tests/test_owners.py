@@ -0,0 +1,39 @@
+from app.ai import extract, owners
+
+ROSTER = [
+    {"display_name": "Priya Shah", "email": "priya.shah@example.com"},
+    {"display_name": None, "email": "tom.okafor@example.com"},
+    {"display_name": "Alex Kim", "email": "alex@example.com"},
+    {"display_name": "Alex Roy", "email": "aroy@example.com"},
+    {"display_name": "Will Turner", "email": "will@example.com"},
+]
+SEGMENTS = [
+    {"speaker_id": "SPEAKER_00", "speaker_name": "Priya Shah"},
+    {"speaker_id": "SPEAKER_01"},
+    {"speaker_id": "UNKNOWN"},
+]
+
+
+def test_resolve_owner_from_roster_and_speakers():
+    index = owners.build_index(ROSTER, SEGMENTS)
+    assert index.resolve("Priya will draft the plan") == "Priya Shah"
+    assert index.resolve("tom okafor needs to review it") == "Tom Okafor"
+    assert index.resolve("Alex Kim is going to call them") == "Alex Kim"
+    assert index.resolve("Alex will call them") is None  # two Alexes
+    assert index.resolve("I'll send the deck", speaker="SPEAKER_00") == "Priya Shah"
+    assert index.resolve("let me check", speaker="SPEAKER_01") == "SPEAKER_01"
+    assert index.resolve("I will check", speaker="UNKNOWN") is None
+    assert index.resolve("We should assign this to Tom") == "Tom Okafor"
+    assert index.resolve("We will ship it") is None  # "will" is not Will Turner
+    assert index.resolve("Will will ship it") == "Will Turner"
+    assert index.resolve("Maria will ship it") == "Maria"  # not on the roster: legacy rule
+
+
+def test_extraction_keeps_actions_owned_by_roster_people():
+    segments = [
+        {"start_time": 0.0, "speaker_id": "SPEAKER_00", "speaker_name": "Priya Shah", "original_text": "I will send the deck"},
+        {"start_time": 3.0, "speaker_id": "SPEAKER_01", "original_text": "tom should update the budget"},
+    ]
+    assert extract.extract_from_segments(segments)["actions"][0]["owner"] == "Priya Shah"
+    actions = extract.extract_from_segments(segments, roster=ROSTER)["actions"]
+    assert [a["owner"] for a in actions] == ["Priya Shah", "Tom Okafor"]
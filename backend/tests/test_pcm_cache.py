@@ -0,0 +1,44 @@
+import os
+
+import numpy as np
+
+from app.ai.pcm_cache import PCMCache
+
+
+def test_decode_once_then_memory_mapped(tmp_path):
+    cache = PCMCache(str(tmp_path), max_bytes=10 * 1024 * 1024)
+    audio = np.linspace(-1, 1, 16000, dtype=np.float32)
+    calls = []
+
+    def decode():
+        calls.append(1)
+        return audio
+
+    first = cache.get_or_decode("abc-16000", decode)
+    second = cache.get_or_decode("abc-16000", decode)
+    assert len(calls) == 1
+    assert isinstance(second, np.memmap)
+    np.testing.assert_array_equal(first, audio)
+    np.testing.assert_array_equal(second, audio)
+    assert cache.stats() == {"hits": 1, "misses": 1}
+
+
+def test_lru_eviction_keeps_recent_entries(tmp_path):
+    one_second = np.zeros(16000, dtype=np.float32)  # 64 KB
+    cache = PCMCache(str(tmp_path), max_bytes=150 * 1024)
+    cache.put("a", one_second)
+    cache.put("b", one_second)
+    os.utime(tmp_path / "a.npy", (1, 1))  # "a" least recently used
+    os.utime(tmp_path / "b.npy", (2, 2))
+    cache.put("c", one_second)
+
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    assert cache.get("c") is not None
+
+
+def test_disabled_cache_passes_through(tmp_path):
+    cache = PCMCache(str(tmp_path), max_bytes=0)
+    audio = np.ones(10, dtype=np.float32)
+    assert cache.put("k", audio) is audio
+    assert cache.get("k") is None
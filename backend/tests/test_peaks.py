@@ -0,0 +1,31 @@
+import numpy as np
+
+from app.ai import peaks
+
+
+def test_roundtrip_and_min_max():
+    audio = np.zeros(256 * 1000 + 100, dtype=np.float32)
+    audio[300] = 0.5
+    audio[600] = -1.0
+    result = peaks.compute_peaks(audio, 16000, bits=16)
+    restored = peaks.unpack_peaks(peaks.pack_peaks(result))
+
+    assert restored.samples == len(audio)
+    assert [l.samples_per_peak for l in restored.levels] == [256, 1024]
+    base = restored.levels[0].data
+    assert len(base) == 1001  # partial tail gets its own pair
+    assert tuple(base[1]) == (0, 16384)
+    assert tuple(base[2]) == (-32767, 0)
+    assert tuple(restored.levels[1].data[0]) == (-32767, 16384)
+
+
+def test_level_for_width_picks_coarsest_sufficient_level():
+    result = peaks.compute_peaks(np.zeros(256 * 4 ** 3 * 600, dtype=np.float32), 16000)
+    counts = [len(l.data) for l in result.levels]
+    assert counts == [38400, 9600, 2400, 600, 150]
+    assert peaks.level_for_width(result, 800) == 2
+    assert peaks.level_for_width(result, 100) == 4
+    assert peaks.level_for_width(result, 10 ** 6) == 0
+
+    single = peaks.unpack_peaks(peaks.pack_peaks(result, [2]))
+    assert len(single.levels) == 1 and len(single.levels[0].data) == 2400
@@ -0,0 +1,39 @@
+from app.ai.policy import choose_model
+from app.core.config import settings
+
+
+def test_idle_queue_keeps_configured_model():
+    choice = choose_model(600, "cuda", backlog=0)
+    assert choice.tier == "large"
+    assert choice.model_name == settings.WHISPER_MODEL
+    assert choice.compute_type == "float16"
+
+
+def test_backlog_steps_down_short_clips_first():
+    busy = settings.TRANSCRIBE_BACKLOG_LOW
+    meeting = choose_model(1200, "cuda", backlog=busy)
+    voice_note = choose_model(20, "cuda", backlog=busy)
+    assert meeting.tier == "medium"
+    assert voice_note.tier == "small"
+
+
+def test_quality_floor_is_respected():
+    deep = settings.TRANSCRIBE_BACKLOG_HIGH
+    assert choose_model(20, "cuda", backlog=deep, quality="accurate").tier == "medium"
+    assert choose_model(20, "cuda", backlog=deep, quality="fast").tier == "tiny"
+    assert choose_model(20, "cuda", backlog=deep).compute_type == "int8_float16"
+
+
+def test_cpu_long_clips_step_down_only_when_busy():
+    long_clip = settings.TRANSCRIBE_LONG_SECONDS
+    assert choose_model(long_clip, "cpu", backlog=0).tier == "large"
+    assert choose_model(long_clip, "cpu", backlog=0, quality="accurate").tier == "large"
+    assert choose_model(long_clip, "cpu", backlog=1).tier == "medium"
+    assert choose_model(long_clip, "cpu", backlog=settings.TRANSCRIBE_BACKLOG_HIGH, quality="accurate").tier == "medium"
+
+
+def test_english_jobs_use_english_only_models(monkeypatch):
+    monkeypatch.setattr(settings, "ENGLISH_WHISPER_MODEL", "distil-large-v3")
+    assert choose_model(600, "cuda", language="en").model_name == "distil-large-v3"
+    assert choose_model(20, "cuda", backlog=settings.TRANSCRIBE_BACKLOG_LOW, language="en").model_name == "small.en"
+    assert choose_model(600, "cuda", language="de").model_name == settings.WHISPER_MODEL
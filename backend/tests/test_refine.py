@@ -0,0 +1,38 @@
+from app.ai.refine import material_change, text_change
+
+
+def _seg(text, speaker="SPEAKER_00"):
+    return {"speaker_id": speaker, "start_time": 0.0, "end_time": 1.0, "original_text": text}
+
+
+def test_punctuation_and_case_are_not_changes():
+    draft = [_seg("Let's ship it on Friday.")]
+    refined = [_seg("let's ship it on friday")]
+    assert text_change(draft, refined) == 0.0
+    assert not material_change(draft, refined, threshold=0.05)
+
+
+def test_word_changes_over_threshold_are_material():
+    draft = [_seg("we will ship the beta on friday")]
+    refined = [_seg("we will skip the beta until monday")]
+    assert material_change(draft, refined, threshold=0.05)
+
+
+def test_diarizing_an_undiarized_draft_is_material():
+    draft = [_seg("I will ship the beta on friday", "UNKNOWN"), _seg("sounds good", "UNKNOWN")]
+    refined = [_seg("I will ship the beta on Friday.", "SPEAKER_00"), _seg("sounds good", "SPEAKER_01")]
+    assert material_change(draft, refined, threshold=0.05)
+
+
+def test_undiarized_refinement_compares_text_only():
+    draft = [_seg("we will ship the beta on friday", "UNKNOWN")]
+    refined = [_seg("We will ship the beta on Friday.", "UNKNOWN")]
+    assert not material_change(draft, refined, threshold=0.05)
+    refined[0]["original_text"] = "we will skip the beta until monday"
+    assert material_change(draft, refined, threshold=0.05)
+
+
+def test_changed_speakers_of_diarized_draft_are_material():
+    draft = [_seg("hello", "SPEAKER_00"), _seg("hi", "SPEAKER_00")]
+    refined = [_seg("hello", "SPEAKER_00"), _seg("hi", "SPEAKER_01")]
+    assert material_change(draft, refined, threshold=0.5)
@@ -0,0 +1,40 @@
+from app.ai.segments import merge_segments
+
+
+def _seg(speaker, start, end, text):
+    return {"speaker_id": speaker, "start_time": start, "end_time": end, "original_text": text}
+
+
+def test_merges_same_speaker_runs_and_keeps_sources():
+    segments = [
+        _seg("SPEAKER_00", 0.0, 1.0, "so"),
+        _seg("SPEAKER_00", 1.2, 2.0, "about the budget"),
+        _seg("SPEAKER_01", 2.1, 3.0, "yes"),
+        _seg("SPEAKER_01", 5.0, 6.0, "after a long pause"),  # gap > 1s
+        _seg("SPEAKER_00", 6.1, 7.0, "ok"),
+    ]
+    merged, group_of = merge_segments(segments, max_gap=1.0)
+    assert [(s["speaker_id"], s["start_time"], s["end_time"], s["original_text"]) for s in merged] == [
+        ("SPEAKER_00", 0.0, 2.0, "so about the budget"),
+        ("SPEAKER_01", 2.1, 3.0, "yes"),
+        ("SPEAKER_01", 5.0, 6.0, "after a long pause"),
+        ("SPEAKER_00", 6.1, 7.0, "ok"),
+    ]
+    assert merged[0]["source_spans"] == [[segments[0]["start_time"], segments[0]["end_time"]],
+                                         [segments[1]["start_time"], segments[1]["end_time"]]]
+    assert [len(s["source_spans"]) for s in merged] == [2, 1, 1, 1]
+    assert group_of.tolist() == [0, 0, 1, 2, 3]
+
+
+def test_respects_duration_and_length_limits():
+    long_run = [_seg("SPEAKER_00", i * 2.0, i * 2.0 + 1.9, "word " * 10) for i in range(40)]
+    merged, group_of = merge_segments(long_run, max_gap=1.0, max_seconds=30.0, max_chars=10 ** 6)
+    assert len(merged) == 3
+    assert all(s["end_time"] - s["start_time"] <= 32.0 for s in merged)
+    assert len(group_of) == 40 and group_of[-1] == 2
+    assert sum(len(s["source_spans"]) for s in merged) == 40
+
+    merged, _ = merge_segments(long_run, max_gap=1.0, max_seconds=10 ** 6, max_chars=200)
+    assert all(len(s["original_text"]) <= 200 + 50 for s in merged)
+    merged, group_of = merge_segments([])
+    assert merged == [] and len(group_of) == 0
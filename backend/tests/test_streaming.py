@@ -0,0 +1,70 @@
+import threading
+import time
+
+import numpy as np
+
+from app.ai import streaming
+from app.ai.audio import SAMPLE_RATE
+
+
+def test_window_overflow_is_finalized_not_dropped(monkeypatch):
+    monkeypatch.setattr(streaming.settings, "LIVE_WINDOW_SECONDS", 10.0)
+    monkeypatch.setattr(streaming.settings, "LIVE_HOLDBACK_SECONDS", 3.0)
+    live = streaming.StreamingTranscriber("cpu", "int8")
+    # one segment spanning whatever audio is passed in
+    monkeypatch.setattr(live, "_transcribe", lambda audio: [{"start": 0.0, "end": len(audio) / SAMPLE_RATE, "text": "words"}])
+
+    live.feed(np.zeros(25 * SAMPLE_RATE, dtype=np.float32))  # a pass fell behind by 15 s
+    final, interim = live.process()
+    assert [(s["start_time"], s["end_time"]) for s in final] == [(0.0, 15.0)]
+    assert [(s["start_time"], s["end_time"]) for s in interim] == [(15.0, 25.0)]
+    covered = [(s["start_time"], s["end_time"]) for s in live.finish()]
+    assert covered == [(0.0, 15.0), (15.0, 25.0)]
+
+
+def test_only_the_uncommitted_window_is_kept(monkeypatch):
+    monkeypatch.setattr(streaming.settings, "LIVE_WINDOW_SECONDS", 10.0)
+    monkeypatch.setattr(streaming.settings, "LIVE_HOLDBACK_SECONDS", 1.0)
+    live = streaming.StreamingTranscriber("cpu", "int8")
+    seen = []
+
+    def transcribe(audio):
+        seen.append(len(audio))
+        # a one-second segment per second of audio
+        return [{"start": float(i), "end": i + 1.0, "text": "w"} for i in range(len(audio) // SAMPLE_RATE)]
+
+    monkeypatch.setattr(live, "_transcribe", transcribe)
+    for _ in range(300):  # ten minutes in two-second steps
+        live.feed(np.zeros(2 * SAMPLE_RATE, dtype=np.float32))
+        live.process()
+    assert max(seen) <= 10 * SAMPLE_RATE
+    assert len(live._audio) <= 12 * SAMPLE_RATE
+    ends = [s["end_time"] for s in live.finish()]
+    assert ends == [float(i) for i in range(1, 601)]  # absolute and contiguous
+
+
+def test_sessions_share_bounded_model_replicas(monkeypatch):
+    monkeypatch.setattr(streaming.settings, "LIVE_ASR_REPLICAS", 2)
+    loaded, busy, peak = [], [0], [0]
+    lock = threading.Lock()
+
+    class _Model:
+        def transcribe(self, audio, **kwargs):
+            with lock:
+                busy[0] += 1
+                peak[0] = max(peak[0], busy[0])
+            time.sleep(0.05)
+            with lock:
+                busy[0] -= 1
+            return {"segments": [], "language": "en"}
+
+    monkeypatch.setattr(streaming, "_replicas", streaming._ReplicaPool())
+    monkeypatch.setattr(streaming, "_load_live_model", lambda device, compute_type: loaded.append(1) or _Model())
+    monkeypatch.setattr(streaming.settings, "LIVE_WHISPER_MODEL", f"test-{time.time()}")
+    threads = [threading.Thread(target=streaming.StreamingTranscriber("cpu", "int8")._transcribe,
+                                args=(np.zeros(SAMPLE_RATE, dtype=np.float32),)) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(loaded) == 2 and peak[0] == 2
@@ -0,0 +1,21 @@
+from app.ai import extract, textnorm
+
+
+def test_normalize_texts_strips_fillers_per_segment():
+    texts = ["um, so uh, we ship", "  like, fine  ", "", "keeps\x00separators apart"]
+    assert textnorm.normalize_texts(texts) == ["so  we ship", "fine", "", "keeps separators apart"]
+
+
+def test_keyword_intents_prefer_risk_then_decision_then_action():
+    texts = ["Bob WILL do it", "we decided, Bob will do it", "Agreed, the risk is Bob will leave", "hello", ""]
+    assert textnorm.keyword_intents(texts) == ["ACTION_ASSIGNMENT", "DECISION", "RISK", "INFORMATION", "INFORMATION"]
+
+
+def test_normalize_statements_builds_lightweight_records():
+    segments = [{"start_time": 1.5, "original_text": "um, Alice will send it"}, {"text": "uh, agreed"}]
+    statements = extract.normalize_statements(segments)
+    assert [(s.original_segment_id, s.normalized_text) for s in statements] == [("1.5", "Alice will send it"), ("0", "agreed")]
+    assert not hasattr(statements[0], "__dict__")
+    result = extract.extract_facts(segments)
+    assert [i["intent"] for i in result["intents"]] == ["ACTION_ASSIGNMENT", "DECISION"]
+    assert result["result"]["actions"][0]["owner"] == "Alice"
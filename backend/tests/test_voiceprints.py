@@ -0,0 +1,41 @@
+import time
+
+import numpy as np
+
+from app.ai import voiceprints
+
+
+def _index(n=30000, dim=256, seed=0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((n, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return voiceprints.VoiceprintIndex(np.arange(1, n + 1), vectors, ann_min=10 ** 9), vectors
+
+
+def test_brute_force_search_finds_nearest_quickly():
+    index, vectors = _index()
+    rng = np.random.default_rng(1)
+    queries = vectors[[10, 20000]] + rng.standard_normal((2, vectors.shape[1])).astype(np.float32) * 0.02
+    started = time.perf_counter()
+    ids, sims = index.search(np.stack([voiceprints.normalize(q) for q in queries]), k=3)
+    assert time.perf_counter() - started < 0.5
+    assert ids[:, 0].tolist() == [11, 20001]
+    assert (sims[:, 0] > 0.9).all() and (np.diff(sims, axis=1) <= 0).all()
+
+
+def test_assign_gives_each_identity_to_one_speaker():
+    base = np.eye(4, dtype=np.float32)
+    index = voiceprints.VoiceprintIndex([1, 2, 3], base[:3])
+    identity_of = {1: "alice", 2: "bob", 3: "alice"}
+    embeddings = {
+        "SPEAKER_00": base[0] * 0.9 + base[3] * 0.1,
+        "SPEAKER_01": base[2] * 0.8 + base[3] * 0.2,  # closest to a second alice voiceprint
+        "SPEAKER_02": base[3],  # nobody enrolled
+    }
+    matched = voiceprints.assign(index, embeddings, identity_of, threshold=0.7)
+    assert matched == {"SPEAKER_00": 1}
+    assert voiceprints.assign(voiceprints.VoiceprintIndex([], []), embeddings, {}, threshold=0.7) == {}
+
+    segments = [{"speaker_id": "SPEAKER_00"}, {"speaker_id": "SPEAKER_02"}]
+    assert voiceprints.label_segments(segments, {"SPEAKER_00": {"display_name": "Alice", "user_id": 7}}) == 1
+    assert segments[0]["speaker_name"] == "Alice" and "speaker_name" not in segments[1]
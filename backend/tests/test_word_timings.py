@@ -0,0 +1,33 @@
+from app.ai import word_timings
+
+
+SEGMENTS = [
+    {"start": 0.0, "end": 2.0, "speaker": "SPEAKER_00", "words": [
+        {"word": "hello", "start": 0.1, "end": 0.5},
+        {"word": "world", "start": 0.6, "end": 1.2, "speaker": "SPEAKER_01"},
+        {"word": "42"},  # alignment could not place it
+    ]},
+    {"start": 2.5, "end": 4.0, "words": [
+        {"word": "hello", "start": 2.5, "end": 3.0},
+        {"word": "again", "start": 3.1, "end": 3.9},
+    ]},
+]
+
+
+def test_pack_roundtrip_interns_strings():
+    wt = word_timings.from_segments(SEGMENTS, "UNKNOWN")
+    restored = word_timings.unpack(word_timings.pack(wt))
+    assert len(restored.start) == 5
+    assert restored.strings.count("hello") == 1
+    words = word_timings.window(restored)
+    assert [w["word"] for w in words] == ["hello", "world", "42", "hello", "again"]
+    assert words[1]["speaker_id"] == "SPEAKER_01"
+    assert words[3]["speaker_id"] == "UNKNOWN" and words[3]["segment"] == 1
+    assert words[2]["start"] == words[2]["end"] == 1.2
+
+
+def test_window_returns_overlapping_words():
+    wt = word_timings.unpack(word_timings.pack(word_timings.from_segments(SEGMENTS, "UNKNOWN")))
+    assert [w["word"] for w in word_timings.window(wt, 0.55, 2.6)] == ["world", "42", "hello"]
+    assert [w["word"] for w in word_timings.window(wt, 3.5, None)] == ["again"]
+    assert word_timings.window(wt, 10.0, 12.0) == []